@@ -0,0 +1,34 @@
+from django.contrib.sites.shortcuts import get_current_site
+
+from allauth.account.adapter import DefaultAccountAdapter
+from allauth.core import context as allauth_context
+
+from accounts.tasks import send_email
+
+
+class CustomAccountAdapter(DefaultAccountAdapter):
+
+    def send_mail(self, template_prefix: str, email: str, context: dict) -> None:
+        """
+        Renders the email during the request, as the templates need it, and
+        queues the SMTP send as a background job.
+        """
+
+        request = allauth_context.request
+        ctx = {
+            'request': request,
+            'email': email,
+            'current_site': get_current_site(request),
+        }
+        ctx.update(context)
+        message = self.render_mail(template_prefix, email, ctx)
+
+        send_email.enqueue(
+            subject=message.subject,
+            body=message.body,
+            from_email=message.from_email,
+            to=message.to,
+            headers=message.extra_headers,
+            content_subtype=message.content_subtype,
+            alternatives=[list(alternative) for alternative in getattr(message, 'alternatives', [])],
+        )
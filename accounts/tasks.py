@@ -0,0 +1,24 @@
+from django.core.mail import EmailMultiAlternatives
+
+from jobs.registry import job
+
+
+@job
+def send_email(
+    subject: str,
+    body: str,
+    from_email: str,
+    to: list[str],
+    headers: dict = None,
+    content_subtype: str = 'plain',
+    alternatives: list[list[str]] = (),
+):
+    """
+    Sends an email rendered by CustomAccountAdapter.
+    """
+
+    message = EmailMultiAlternatives(subject, body, from_email, to, headers=headers)
+    message.content_subtype = content_subtype
+    for content, mimetype in alternatives:
+        message.attach_alternative(content, mimetype)
+    message.send()
@@ -0,0 +1,33 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.urls import reverse
+
+from jobs.models import Job
+from jobs.worker import run_pending_jobs
+
+
+class CustomAccountAdapterTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            first_name = 'Test',
+            last_name = 'User',
+            email = 'testuser@email.com',
+            password = 'testpass123'
+        )
+
+
+    def test_password_reset_email_queued(self):
+        """
+        Asserts account emails are sent by a background job, not the request.
+        """
+
+        response = self.client.post(reverse('account_reset_password'), {'email': self.user.email})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.filter(name='accounts.tasks.send_email').count(), 1)
+
+        run_pending_jobs()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
@@ -0,0 +1,72 @@
+import hashlib
+
+from django.core.cache import cache
+
+from rest_framework.response import Response
+
+from sneakers.catalog import get_catalog_version
+from sneakers.likes import get_liked_version
+
+
+RESPONSE_KEY = 'api:response:{version}:{digest}'
+RESPONSE_TIMEOUT = 60 * 60
+
+# Params holding comma separated lists, where order does not matter.
+LIST_PARAMS = {'fields', 'expand'}
+
+
+def normalize_query_params(query_params) -> str:
+    """
+    Returns the query params in a canonical order, so '?b=1&a=2' and
+    '?a=2&b=1' share a cache entry. Empty values are dropped.
+    """
+
+    items = []
+    for key in sorted(query_params):
+        for value in sorted(query_params.getlist(key)):
+            if key in LIST_PARAMS:
+                value = ','.join(sorted(item.strip() for item in value.split(',') if item.strip()))
+            if value:
+                items.append(f'{key}={value}')
+    return '&'.join(items)
+
+
+class CatalogCacheMixin:
+    """
+    Caches the serialized data of successful responses, keyed on the URL,
+    normalized query params and rendered format, under the catalog version.
+    Every Brand and Sneaker write bumps the version, so edits are never
+    served stale and old entries are left to expire.
+    """
+
+    def get_response_cache_key(self, request) -> str:
+        # A list filtered to the user's likes is theirs alone.
+        if 'liked' in request.query_params:
+            user_key = f'{request.user.pk}:{get_liked_version(request.user)}'
+        else:
+            user_key = ''
+
+        digest = hashlib.md5(':'.join([
+            request.build_absolute_uri(request.path),
+            normalize_query_params(request.query_params),
+            request.accepted_renderer.format,
+            user_key,
+        ]).encode()).hexdigest()
+        return RESPONSE_KEY.format(version=get_catalog_version(), digest=digest)
+
+
+    def get_cached_response(self, request, handler, *args, **kwargs) -> Response:
+        """
+        Returns the cached response data for this request, or calls the
+        `handler` view method and caches its data if it succeeded.
+        """
+
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, RESPONSE_TIMEOUT)
+        return response
@@ -0,0 +1,105 @@
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from sneakers.pagination import paginate_keyset
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Forward-only cursor pagination over the queryset's ordering, so every
+    page is an indexed range scan however deep into the results it is.
+
+    The ordering set by the filter backends is extended with tie-breaking
+    fields in the same direction as its first field, which keeps it unique
+    and lets a single composite index serve it in either direction.
+    """
+
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    tiebreak_fields = ['name', 'id']
+
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page = paginate_keyset(
+            queryset,
+            self.get_ordering(queryset),
+            request.query_params.get(self.cursor_query_param),
+            self.get_page_size(request),
+        )
+        self.next_cursor = page.next_cursor
+        return page.items
+
+
+    def get_ordering(self, queryset) -> list[str]:
+        ordering = list(queryset.query.order_by) or list(self.tiebreak_fields)
+        prefix = '-' if ordering[0].startswith('-') else ''
+        ordered_names = {field.lstrip('-') for field in ordering}
+
+        for field in self.tiebreak_fields:
+            if field not in ordered_names:
+                ordering.append(f'{prefix}{field}')
+
+        return ordering
+
+
+    def get_page_size(self, request) -> int:
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+
+    def get_next_link(self) -> str | None:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Number of results to return per page, up to {self.max_page_size}.',
+                'schema': {'type': 'integer'},
+            },
+        ]
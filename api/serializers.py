@@ -1,15 +1,141 @@
+from django.db.models import Prefetch, QuerySet
+
 from rest_framework import serializers
 
 from sneakers.models import Brand, Sneaker
 
 
-class BrandSerializer(serializers.ModelSerializer):
+def parse_field_list(value: str | None) -> set[str]:
+    """
+    Parses a comma separated query param, e.g. '?fields=id,name'.
+    """
+
+    if not value:
+        return set()
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    A ModelSerializer that reads 'fields' and 'expand' from its context, to
+    serialize a sparse fieldset and nest any of its expandable relations.
+    Only the top level serializer is affected, nested ones are left whole.
+    """
+
+    expandable_fields = {}
+
+
+    def _is_top_level(self) -> bool:
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        if not self._is_top_level():
+            return fields
+
+        requested = self.context.get('fields')
+        expand = self.context.get('expand', set())
+
+        for name, (serializer_class, kwargs) in self.expandable_fields.items():
+            if name in expand and name in fields:
+                fields[name] = serializer_class(read_only=True, **kwargs)
+
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+
+        return fields
+
+
+class BrandSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Brand
-        fields = '__all__'
+        fields = [
+            'id',
+            'created_at',
+            'updated_at',
+            'name',
+            'description',
+            'country',
+            'year_founded',
+        ]
 
 
-class SneakerSerializer(serializers.ModelSerializer):
+class RelatedSneakerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Sneaker
-        fields = '__all__'
\ No newline at end of file
+        fields = [
+            'id',
+            'brand',
+            'name',
+            'designer',
+            'year_released',
+            'primary_image',
+        ]
+
+
+class SneakerSerializer(DynamicFieldsModelSerializer):
+    expandable_fields = {
+        'brand': (BrandSerializer, {}),
+        'related_sneakers': (RelatedSneakerSerializer, {'many': True}),
+    }
+
+    class Meta:
+        model = Sneaker
+        fields = [
+            'id',
+            'created_at',
+            'created_by',
+            'updated_at',
+            'last_updated_by',
+            'brand',
+            'name',
+            'summary',
+            'designer',
+            'year_released',
+            'related_sneakers',
+            'primary_image',
+            'image_variants',
+            'deleted',
+            'deleted_at',
+            'deleted_by',
+        ]
+
+
+    @classmethod
+    def optimize_queryset(
+        cls,
+        queryset: QuerySet,
+        fields: set[str],
+        expand: set[str],
+        required_fields: list[str] = (),
+    ) -> QuerySet:
+        """
+        Loads exactly what will be serialized: the selected columns, a join
+        for an expanded brand and a single prefetch for related sneakers.
+        `required_fields` are always loaded, e.g. those used for ordering.
+        """
+
+        selected = set(cls.Meta.fields) & fields if fields else set(cls.Meta.fields)
+        concrete = {field.name for field in Sneaker._meta.concrete_fields}
+
+        queryset = queryset.only('id', *(selected & concrete), *required_fields)
+
+        if 'brand' in selected and 'brand' in expand:
+            queryset = queryset.select_related('brand')
+
+        if 'related_sneakers' in selected:
+            if 'related_sneakers' in expand:
+                related_fields = RelatedSneakerSerializer.Meta.fields
+            else:
+                related_fields = ['id']
+
+            queryset = queryset.prefetch_related(
+                Prefetch('related_sneakers', queryset=Sneaker.objects.only(*related_fields))
+            )
+
+        return queryset
@@ -1,8 +1,20 @@
+import csv
+import gzip
+import json
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.http import QueryDict
 from django.urls import reverse
+from django.utils import timezone
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from api.cache import normalize_query_params
 from sneakers.models import Brand, Sneaker
 
 
@@ -50,12 +62,40 @@ class BrandAPITests(APITestCase):
         response = self.client.get(url, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        brand_names = [item['name'] for item in response.data]
+        self.assertEqual(len(response.data['results']), 2)
+        brand_names = [item['name'] for item in response.data['results']]
         self.assertIn('Brand A', brand_names)
         self.assertIn('Brand B', brand_names)
 
 
+    def test_list_brands_ordering_pages_across_nulls(self):
+        """
+        Ensure ordering by a nullable field pages through every brand once,
+        with NULLs last in either direction.
+        """
+
+        Brand.objects.filter(pk=self.brand1.pk).update(year_founded=1990)
+        brand3 = Brand.objects.create(name='Brand C', description='Third brand.', year_founded=1980)
+        brand4 = Brand.objects.create(name='Brand D', description='Fourth brand.')
+
+        url = reverse('brands-list')
+        for ordering, expected in (
+            ('year_founded', [brand3.name, self.brand1.name, self.brand2.name, brand4.name]),
+            ('-year_founded', [self.brand1.name, brand3.name, brand4.name, self.brand2.name]),
+        ):
+            with self.subTest(ordering=ordering):
+                names = []
+                response = self.client.get(url, {'ordering': ordering, 'page_size': 1}, format='json')
+                while True:
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    names += [item['name'] for item in response.data['results']]
+                    if not response.data['next']:
+                        break
+                    response = self.client.get(response.data['next'], format='json')
+
+                self.assertEqual(names, expected)
+
+
     def test_retrieve_brand(self):
         """
         Ensure we can retrieve a single brand by its ID.
@@ -79,13 +119,42 @@ class BrandAPITests(APITestCase):
         response = self.client.get(url, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        sneaker_names = [item['name'] for item in response.data]
+        self.assertEqual(len(response.data['results']), 2)
+        sneaker_names = [item['name'] for item in response.data['results']]
         self.assertIn('Sneaker 1A', sneaker_names)
         self.assertIn('Sneaker 2A', sneaker_names)
         self.assertNotIn('Sneaker 3B', sneaker_names)
 
 
+    def test_brand_sneakers_ordering(self):
+        """
+        Ensure the custom 'sneakers' action applies ?ordering= by sneaker
+        fields across pages.
+        """
+
+        url = reverse('brands-sneakers', kwargs={'pk': self.brand1.pk})
+        response = self.client.get(url, {'ordering': '-year_released', 'page_size': 1}, format='json')
+        self.assertEqual([item['name'] for item in response.data['results']], ['Sneaker 2A'])
+
+        response = self.client.get(response.data['next'], format='json')
+        self.assertEqual([item['name'] for item in response.data['results']], ['Sneaker 1A'])
+        self.assertIsNone(response.data['next'])
+
+
+    def test_brand_sneakers_excludes_soft_deleted(self):
+        """
+        Ensure the custom 'sneakers' action omits soft-deleted sneakers.
+        """
+
+        self.sneaker2.soft_delete(None)
+
+        url = reverse('brands-sneakers', kwargs={'pk': self.brand1.pk})
+        response = self.client.get(url, format='json')
+
+        sneaker_names = [item['name'] for item in response.data['results']]
+        self.assertEqual(sneaker_names, ['Sneaker 1A'])
+
+
 class SneakerAPITests(APITestCase):
     """
     Tests for the Sneaker API endpoints.
@@ -120,11 +189,59 @@ class SneakerAPITests(APITestCase):
         response = self.client.get(url, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        sneaker_names = [item['name'] for item in response.data]
+        self.assertEqual(len(response.data['results']), 2)
+        sneaker_names = [item['name'] for item in response.data['results']]
         self.assertIn('Test Sneaker 1', sneaker_names)
 
 
+    def test_list_sneakers_paginates(self):
+        """
+        Ensure the sneaker list is cursor paginated.
+        """
+
+        url = reverse('sneakers-list')
+        response = self.client.get(url, {'page_size': 1}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.data['results']], ['Test Sneaker 1'])
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'], format='json')
+
+        self.assertEqual([item['name'] for item in response.data['results']], ['Test Sneaker 2'])
+        self.assertIsNone(response.data['next'])
+
+
+    def test_list_sneakers_filter(self):
+        """
+        Ensure the sneaker list can be filtered.
+        """
+
+        url = reverse('sneakers-list')
+        response = self.client.get(url, {'year_released': 2025}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.data['results']], ['Test Sneaker 2'])
+
+
+    def test_list_sneakers_ordering(self):
+        """
+        Ensure the sneaker list can be ordered by a whitelisted field, and
+        ignores fields outside the whitelist.
+        """
+
+        url = reverse('sneakers-list')
+
+        response = self.client.get(url, {'ordering': '-year_released', 'page_size': 1}, format='json')
+        self.assertEqual([item['name'] for item in response.data['results']], ['Test Sneaker 2'])
+
+        response = self.client.get(response.data['next'], format='json')
+        self.assertEqual([item['name'] for item in response.data['results']], ['Test Sneaker 1'])
+
+        response = self.client.get(url, {'ordering': '-summary'}, format='json')
+        self.assertEqual([item['name'] for item in response.data['results']], ['Test Sneaker 1', 'Test Sneaker 2'])
+
+
     def test_retrieve_sneaker(self):
         """
         Ensure we can retrieve a single sneaker by its ID.
@@ -135,4 +252,301 @@ class SneakerAPITests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], self.sneaker1.name)
-        self.assertEqual(response.data['brand'], self.brand.pk)
\ No newline at end of file
+        self.assertEqual(response.data['brand'], self.brand.pk)
+
+
+    def test_retrieve_sneaker_conditional_get(self):
+        """
+        Ensure an unchanged sneaker is answered with a 304, and a changed
+        one in full.
+        """
+
+        url = reverse('sneakers-detail', kwargs={'pk': self.sneaker1.pk})
+        etag = self.client.get(url, format='json')['ETag']
+
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(url, {'fields': 'id,name'}, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.sneaker1.name = 'Renamed Sneaker'
+        self.sneaker1.save()
+
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Renamed Sneaker')
+
+
+    def test_list_sneakers_catalog_etag(self):
+        """
+        Ensure lists are validated by the catalog version.
+        """
+
+        url = reverse('sneakers-list')
+        etag = self.client.get(url, format='json')['ETag']
+
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.sneaker2.soft_delete(None)
+
+        response = self.client.get(url, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class SneakerAPIQueryTests(APITestCase):
+    """
+    Tests for the Sneaker API field selection and query counts.
+    """
+
+    def setUp(self):
+        """
+        Set up initial data for the tests.
+        """
+
+        self.brand = Brand.objects.create(
+            name='Test Brand',
+        )
+        self.sneakers = [
+            Sneaker.objects.create(
+                brand=self.brand,
+                name=f'Test Sneaker {i}',
+                year_released=2020,
+            )
+            for i in range(6)
+        ]
+        for sneaker, related in zip(self.sneakers, self.sneakers[1:]):
+            sneaker.related_sneakers.add(related)
+
+
+    def test_sparse_fieldset(self):
+        """
+        Ensure '?fields=' limits the serialized fields.
+        """
+
+        url = reverse('sneakers-list')
+        response = self.client.get(url, {'fields': 'id,name'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name'})
+
+
+    def test_expand(self):
+        """
+        Ensure '?expand=' nests the brand and related sneakers.
+        """
+
+        url = reverse('sneakers-detail', kwargs={'pk': self.sneakers[0].pk})
+        response = self.client.get(url, {'expand': 'brand,related_sneakers'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['brand']['name'], 'Test Brand')
+        self.assertEqual(response.data['related_sneakers'][0]['name'], 'Test Sneaker 1')
+
+
+    def test_constant_query_count(self):
+        """
+        Ensure a page costs the same number of queries whatever its size.
+        """
+
+        url = reverse('sneakers-list')
+        cases = [
+            ({}, 2),
+            ({'expand': 'brand,related_sneakers'}, 2),
+            ({'fields': 'id,name,brand'}, 1),
+        ]
+
+        for params, queries in cases:
+            for page_size in (2, 6):
+                with self.subTest(params=params, page_size=page_size):
+                    with self.assertNumQueries(queries):
+                        response = self.client.get(url, {**params, 'page_size': page_size}, format='json')
+                    self.assertEqual(len(response.data['results']), page_size)
+
+
+
+class APIResponseCacheTests(APITestCase):
+    """
+    Tests for the versioned API response cache.
+    """
+
+    def setUp(self):
+        """
+        Set up initial data for the tests.
+        """
+
+        cache.clear()
+        self.brand = Brand.objects.create(
+            name='Test Brand',
+        )
+        self.sneaker = Sneaker.objects.create(
+            brand=self.brand,
+            name='Test Sneaker',
+            year_released=2024,
+        )
+
+
+    def test_normalize_query_params(self):
+        """
+        Ensure param and list item order do not change the cache key.
+        """
+
+        self.assertEqual(
+            normalize_query_params(QueryDict('fields=name,id&brand=1&expand=')),
+            normalize_query_params(QueryDict('brand=1&fields=id,name')),
+        )
+
+
+    def test_list_cached(self):
+        """
+        Ensure a repeated list request is served without queries.
+        """
+
+        url = reverse('sneakers-list')
+        first = self.client.get(url, {'fields': 'id,name', 'ordering': 'name'}, format='json')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {'ordering': 'name', 'fields': 'name,id'}, format='json')
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+
+    def test_write_invalidates_cache(self):
+        """
+        Ensure saving or soft-deleting a Sneaker, or saving its Brand, is
+        seen by the next request.
+        """
+
+        list_url = reverse('sneakers-list')
+        detail_url = reverse('brands-detail', kwargs={'pk': self.brand.pk})
+        self.client.get(list_url, format='json')
+        self.client.get(detail_url, format='json')
+
+        self.sneaker.name = 'Renamed Sneaker'
+        self.sneaker.save()
+        response = self.client.get(list_url, format='json')
+        self.assertEqual(response.data['results'][0]['name'], 'Renamed Sneaker')
+
+        self.sneaker.soft_delete(None)
+        response = self.client.get(list_url, format='json')
+        self.assertEqual(response.data['results'], [])
+
+        self.brand.name = 'Renamed Brand'
+        self.brand.save()
+        response = self.client.get(detail_url, format='json')
+        self.assertEqual(response.data['name'], 'Renamed Brand')
+
+
+    def test_errors_not_cached(self):
+        """
+        Ensure only successful responses are cached.
+        """
+
+        url = reverse('brands-detail', kwargs={'pk': uuid.uuid4()})
+        response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertGreater(len(context), 0)
+
+
+class ExportAPITests(APITestCase):
+    """
+    Tests for the streaming catalog export.
+    """
+
+    def setUp(self):
+        """
+        Set up initial data for the tests.
+        """
+
+        self.brand = Brand.objects.create(
+            name='Test Brand',
+        )
+        self.sneaker = Sneaker.objects.create(
+            brand=self.brand,
+            name='Test Sneaker',
+            year_released=2024,
+        )
+        self.deleted_sneaker = Sneaker.objects.create(
+            brand=self.brand,
+            name='Deleted Sneaker',
+            year_released=2024,
+        )
+        self.deleted_sneaker.soft_delete(None)
+
+
+    def get_export(self, resource, export_format, **params):
+        url = reverse('export', kwargs={'resource': resource, 'export_format': export_format})
+        return self.client.get(url, params)
+
+
+    def test_export_ndjson(self):
+        """
+        Ensure live sneakers are streamed one JSON object per line.
+        """
+
+        response = self.get_export('sneakers', 'ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [str(self.sneaker.id)])
+        self.assertEqual(rows[0]['brand_id'], str(self.brand.id))
+
+
+    def test_export_csv(self):
+        """
+        Ensure brands are streamed as CSV with a header row.
+        """
+
+        response = self.get_export('brands', 'csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('filename="brands.csv"', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['name'], 'Test Brand')
+        self.assertEqual(rows[0]['country'], '')
+
+
+    def test_export_updated_since(self):
+        """
+        Ensure updated_since excludes older rows, includes soft-deletes
+        flagged as deleted and rejects invalid dates.
+        """
+
+        Sneaker.objects.filter(pk=self.sneaker.pk).update(updated_at=timezone.now() - timedelta(days=10))
+
+        response = self.get_export('sneakers', 'ndjson', updated_since=(timezone.now() - timedelta(days=1)).date().isoformat())
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([(row['id'], row['deleted']) for row in rows], [(str(self.deleted_sneaker.id), True)])
+
+        response = self.get_export('sneakers', 'ndjson', updated_since='yesterday')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_export_gzip(self):
+        """
+        Ensure the export is gzipped when the client accepts it.
+        """
+
+        url = reverse('export', kwargs={'resource': 'sneakers', 'export_format': 'csv'})
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Test Sneaker', gzip.decompress(b''.join(response.streaming_content)))
+
+
+    def test_export_unknown(self):
+        """
+        Ensure an unknown resource or format is a 404.
+        """
+
+        self.assertEqual(self.get_export('users', 'csv').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get_export('sneakers', 'xml').status_code, status.HTTP_404_NOT_FOUND)
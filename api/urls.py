@@ -1,9 +1,11 @@
 from django.urls import path
+from django.views.decorators.gzip import gzip_page
 
 from rest_framework.routers import SimpleRouter
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
 from api import views
+from core.query_budget import query_budget
 
 
 router = SimpleRouter()
@@ -11,12 +13,14 @@ router.register('brands', views.BrandViewSet, basename='brands')
 router.register('sneakers', views.SneakerViewSet, basename='sneakers')
 
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path('export/<str:resource>.<str:export_format>', gzip_page(views.ExportView.as_view()), name='export'),
+]
 
 spectacular_patterns = [
-    path('schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    path('schema/', query_budget(2)(SpectacularAPIView.as_view()), name='schema'),
+    path('schema/swagger-ui/', query_budget(2)(SpectacularSwaggerView.as_view(url_name='schema')), name='swagger-ui'),
+    path('schema/redoc/', query_budget(2)(SpectacularRedocView.as_view(url_name='schema')), name='redoc'),
 ]
 
 urlpatterns += spectacular_patterns
\ No newline at end of file
@@ -1,30 +1,197 @@
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.views import APIView
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 
+from core.query_budget import query_budget
 from sneakers.models import Brand, Sneaker
-from api.serializers import BrandSerializer, SneakerSerializer
+from sneakers.filters import SneakerFilter
+from sneakers.export import FORMATS, RESOURCES, parse_updated_since, stream_export
+from sneakers.conditional import (
+    brand_etag,
+    brand_last_modified,
+    catalog_etag,
+    sneaker_etag,
+    sneaker_last_modified,
+)
+from api.cache import CatalogCacheMixin
+from api.serializers import BrandSerializer, SneakerSerializer, parse_field_list
+
+
+FIELDS_PARAMETER = OpenApiParameter(
+    'fields',
+    str,
+    description='Comma separated list of fields to include, e.g. id,name,brand.',
+)
+EXPAND_PARAMETER = OpenApiParameter(
+    'expand',
+    str,
+    description='Comma separated list of relations to nest: brand, related_sneakers.',
+)
+UPDATED_SINCE_PARAMETER = OpenApiParameter(
+    'updated_since',
+    str,
+    description='Only export rows updated at or after this ISO date or datetime.',
+)
+
+
+class FieldSelectionMixin:
+    """
+    Passes the '?fields=' and '?expand=' query params to the serializer.
+    """
 
+    def get_field_selection(self) -> tuple[set[str], set[str]]:
+        params = self.request.query_params if self.request else {}
+        return (
+            parse_field_list(params.get('fields')),
+            parse_field_list(params.get('expand')),
+        )
 
-class BrandViewSet(viewsets.ModelViewSet):
-    queryset = Brand.objects.all().order_by('name')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['expand'] = self.get_field_selection()
+        return context
+
+
+@extend_schema_view(
+    list=extend_schema(parameters=[FIELDS_PARAMETER]),
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER]),
+)
+@query_budget({'list': 3, 'retrieve': 4, 'sneakers': 5})
+class BrandViewSet(CatalogCacheMixin, FieldSelectionMixin, viewsets.ModelViewSet):
+    queryset = Brand.objects.all()
     serializer_class = BrandSerializer
     http_method_names = ['get', 'head']
+    filterset_fields = ['country', 'year_founded']
+    ordering_fields = ['name', 'year_founded', 'updated_at']
+
 
+    @method_decorator(condition(etag_func=catalog_etag))
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().list, *args, **kwargs)
 
+
+    @method_decorator(condition(etag_func=brand_etag, last_modified_func=brand_last_modified))
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().retrieve, *args, **kwargs)
+
+
+    @extend_schema(
+        parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER],
+        responses=SneakerSerializer(many=True),
+    )
     @action(detail=True, methods=['get'])
+    @method_decorator(condition(etag_func=catalog_etag))
     def sneakers(self, request, pk=None):
         """
-        Returns all Sneakers associated with specified Brand.
+        Returns a page of Sneakers associated with specified Brand.
         """
 
+        return self.get_cached_response(request, self.get_brand_sneakers)
+
+
+    def get_brand_sneakers(self, request):
         brand = self.get_object()
-        sneakers = Sneaker.objects.filter(brand=brand)
-        serializer = SneakerSerializer(sneakers, many=True, context={'request': request})
-        return Response(serializer.data)    
+        sneaker_filter = SneakerFilter(
+            request.query_params,
+            queryset=Sneaker.objects.filter(brand=brand),
+            request=request,
+        )
+        # Ordered like the sneakers list, by its fields rather than the brand's.
+        ordered = OrderingFilter().filter_queryset(request, sneaker_filter.qs, SneakerViewSet)
+        fields, expand = self.get_field_selection()
+        queryset = SneakerSerializer.optimize_queryset(
+            ordered,
+            fields,
+            expand,
+            required_fields=SneakerViewSet.ordering_fields,
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = SneakerSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
 
 
-class SneakerViewSet(viewsets.ModelViewSet):
-    queryset = Sneaker.objects.all().order_by('name')
+@extend_schema_view(
+    list=extend_schema(parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER]),
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER]),
+)
+@query_budget({'list': 5, 'retrieve': 5})
+class SneakerViewSet(CatalogCacheMixin, FieldSelectionMixin, viewsets.ModelViewSet):
+    queryset = Sneaker.objects.all()
     serializer_class = SneakerSerializer
-    http_method_names = ['get', 'head']
\ No newline at end of file
+    http_method_names = ['get', 'head']
+    filterset_class = SneakerFilter
+    ordering_fields = ['name', 'year_released', 'updated_at']
+
+
+    @method_decorator(condition(etag_func=catalog_etag))
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().list, *args, **kwargs)
+
+
+    @method_decorator(condition(etag_func=sneaker_etag, last_modified_func=sneaker_last_modified))
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(request, super().retrieve, *args, **kwargs)
+
+
+    def get_queryset(self):
+        fields, expand = self.get_field_selection()
+        return SneakerSerializer.optimize_queryset(
+            super().get_queryset(),
+            fields,
+            expand,
+            required_fields=self.ordering_fields,
+        )
+
+
+class FirstRendererNegotiation(BaseContentNegotiation):
+    """
+    Skips Accept header negotiation, for views that stream their own
+    content type and only use renderers for errors.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+@query_budget(3)
+class ExportView(APIView):
+    """
+    Streams every live Brand or Sneaker as NDJSON or CSV, e.g.
+    /api/export/sneakers.ndjson?updated_since=2025-01-01
+    """
+
+    content_negotiation_class = FirstRendererNegotiation
+
+
+    @extend_schema(parameters=[UPDATED_SINCE_PARAMETER], responses={200: OpenApiTypes.STR})
+    def get(self, request, resource, export_format):
+        if resource not in RESOURCES or export_format not in FORMATS:
+            raise NotFound(f"Exports are {', '.join(RESOURCES)} as {', '.join(FORMATS)}.")
+
+        updated_since = request.query_params.get('updated_since')
+        if updated_since:
+            try:
+                updated_since = parse_updated_since(updated_since)
+            except ValueError as e:
+                raise ValidationError({'updated_since': str(e)})
+
+        response = StreamingHttpResponse(
+            stream_export(resource, export_format, updated_since or None),
+            content_type=FORMATS[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{resource}.{export_format}"'
+        return response
@@ -0,0 +1,154 @@
+import math
+import statistics
+import time
+import tracemalloc
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from sneakers.models import Brand, Sneaker
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """
+    Nearest-rank percentile, e.g. percentile(samples, 95).
+    """
+
+    ordered = sorted(samples)
+    rank = max(math.ceil(len(ordered) * p / 100), 1)
+    return ordered[rank - 1]
+
+
+class QueryTimer:
+    """
+    A database execute wrapper counting queries and their total time.
+    CaptureQueriesContext only records times to the millisecond.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+def build_cases(brand: Brand, sneaker: Sneaker) -> list[tuple[str, str]]:
+    """
+    The (name, url) pairs to benchmark, using a seeded brand and sneaker.
+    """
+
+    query_url = reverse('query')
+    designer = sneaker.designer or ''
+    search = sneaker.name.split()[0]
+    sneakers_url = reverse('sneakers-list')
+
+    return [
+        ('home', reverse('home')),
+        ('query', query_url),
+        ('query_brand', f'{query_url}?brand={brand.id}'),
+        ('query_designer', f'{query_url}?{urlencode({"designer": designer})}'),
+        ('query_search', f'{query_url}?{urlencode({"search": search})}'),
+        ('detail', reverse('detail', kwargs={'pk': sneaker.id})),
+        ('api_brands', reverse('brands-list')),
+        ('api_brand_sneakers', reverse('brands-sneakers', kwargs={'pk': brand.id})),
+        ('api_sneakers', sneakers_url),
+        ('api_sneakers_expand', f'{sneakers_url}?expand=brand,related_sneakers'),
+        ('api_sneakers_sparse', f'{sneakers_url}?fields=id,name'),
+        ('api_sneakers_ordered', f'{sneakers_url}?ordering=-year_released'),
+        ('api_sneaker', reverse('sneakers-detail', kwargs={'pk': sneaker.id})),
+    ]
+
+
+def measure(client: Client, url: str, repeats: int, warmup: int = 2, cold: bool = False) -> dict:
+    """
+    Requests a URL `repeats` times and summarises latency, queries and SQL
+    time, plus the peak memory of one extra traced request. With `cold`
+    the cache is cleared before every request.
+    """
+
+    for _ in range(warmup):
+        client.get(url)
+
+    latencies = []
+    query_counts = []
+    sql_times = []
+
+    for _ in range(repeats):
+        if cold:
+            cache.clear()
+
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} returned {response.status_code}')
+
+        query_counts.append(timer.count)
+        sql_times.append(timer.seconds * 1000)
+
+    if cold:
+        cache.clear()
+    tracemalloc.start()
+    try:
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'url': url,
+        'repeats': repeats,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.mean(latencies), 3),
+        'queries': max(query_counts),
+        'sql_ms': round(statistics.median(sql_times), 3),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(cases: list[tuple[str, str]], repeats: int, warmup: int = 2, cold: bool = False) -> dict:
+    """
+    Measures each case through the test client. The debug toolbar and API
+    throttling are switched off, as they would dominate the timings.
+    """
+
+    client = Client(SERVER_NAME='localhost')
+    results = {}
+
+    with (
+        override_settings(DEBUG_TOOLBAR_CONFIG={'SHOW_TOOLBAR_CALLBACK': lambda request: False}),
+        mock.patch('rest_framework.throttling.SimpleRateThrottle.allow_request', return_value=True),
+    ):
+        for name, url in cases:
+            results[name] = measure(client, url, repeats, warmup, cold)
+
+    return results
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """
+    Returns the p50 change, as a ratio, of each case found in both runs.
+    Below 1 is faster than the baseline.
+    """
+
+    return {
+        name: round(result['p50_ms'] / baseline[name]['p50_ms'], 3)
+        for name, result in results.items()
+        if name in baseline and baseline[name]['p50_ms']
+    }
@@ -0,0 +1,41 @@
+from django.test import TestCase, SimpleTestCase
+
+from benchmarks.runner import build_cases, percentile, run_benchmarks
+from sneakers.synthetic import generate_catalog
+
+
+class PercentileTests(SimpleTestCase):
+
+    def test_percentile(self):
+        """
+        Asserts nearest-rank percentiles.
+        """
+
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+
+class RunBenchmarksTests(TestCase):
+
+    def test_run_benchmarks(self):
+        """
+        Asserts each case is measured against a synthetic catalog.
+        """
+
+        brands, sneakers = generate_catalog(brands=5, sneakers=50, related=2, seed=1)
+        cases = [case for case in build_cases(brands[0], sneakers[0]) if case[0] in ('home', 'detail', 'api_sneakers')]
+
+        results = run_benchmarks(cases, repeats=3, warmup=1)
+
+        self.assertEqual(set(results), {'home', 'detail', 'api_sneakers'})
+        for result in results.values():
+            self.assertEqual(result['repeats'], 3)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertGreater(result['peak_memory_kb'], 0)
+
+        # The warm home page is served from the cached snapshot.
+        self.assertEqual(results['home']['queries'], 0)
+        self.assertGreater(results['detail']['queries'], 0)
@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third Party
     'allauth',
@@ -48,11 +49,14 @@ INSTALLED_APPS = [
     # Local
     'accounts.apps.AccountsConfig',
     'core.apps.CoreConfig',
+    'jobs.apps.JobsConfig',
     'sneakers.apps.SneakersConfig',
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,6 +69,20 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 
+# What to do when a view makes more queries than its @query_budget:
+# 'raise', 'log' or 'off'. See core/query_budget.py.
+QUERY_BUDGET_MODE = env.str('QUERY_BUDGET_MODE', default='raise' if DEBUG else 'log')
+
+# Adds request timings as a Server-Timing header. See core/instrumentation.py.
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', default=True)
+
+# Where each worker process writes its metrics for /metrics to sum. Clear it
+# on deploy, files from stopped workers are still counted. See core/metrics.py.
+METRICS_DIR = env.str('METRICS_DIR', default=None)
+
+# Addresses allowed to read /metrics without logging in as staff.
+INTERNAL_IPS = env.list('INTERNAL_IPS', default=[])
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -100,6 +118,42 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# Catalog versions, cached responses and fragments must be shared by every
+# web process and the worker, or a write in one is never seen by the
+# others. A local memory cache is only used in development, when CACHE_URL
+# is unset, e.g. CACHE_URL=redis://redis:6379/0.
+if DEBUG:
+    CACHES = {'default': env.dj_cache_url('CACHE_URL', default='locmem://')}
+else:
+    CACHES = {'default': env.dj_cache_url('CACHE_URL')}
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+
+# The 'general' logger writes a line per request and query budget overruns
+# to the console. Set LOG_LEVEL=WARNING to keep only the overruns.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'general': {
+            'handlers': ['console'],
+            'level': env.str('LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -171,6 +225,7 @@ ACCOUNT_LOGOUT_ON_PASSWORD_CHANGE = False
 ACCOUNT_LOGOUT_REDIRECT_URL = '/accounts/login/'
 ACCOUNT_SESSION_REMEMBER = True
 ACCOUNT_SIGNUP_REDIRECT_URL = '/'
+ACCOUNT_ADAPTER = 'accounts.adapter.CustomAccountAdapter'
 LOGIN_REDIRECT_URL = '/'
 SOCIALACCOUNT_AUTO_SIGNUP = False
 
@@ -201,6 +256,11 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetCursorPagination',
+    'DEFAULT_FILTER_BACKENDS': [
+        'django_filters.rest_framework.DjangoFilterBackend',
+        'rest_framework.filters.OrderingFilter',
+    ],
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
         'rest_framework.throttling.UserRateThrottle'
@@ -17,6 +17,7 @@ urlpatterns = [
     path('accounts/', include('accounts.urls')),
     path('', include('sneakers.urls')),
     path('api/', include('api.urls')),
+    path('', include('core.urls')),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Each worker builds its search suggestion index as it starts.
+from sneakers.suggest import warm_suggestion_index  # noqa: E402
+warm_suggestion_index()
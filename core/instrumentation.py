@@ -0,0 +1,198 @@
+import contextvars
+import logging
+import time
+from dataclasses import dataclass, asdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import connection
+from django.template.base import Template
+
+from core import metrics
+
+
+logger = logging.getLogger('general')
+
+_current_stats = contextvars.ContextVar('request_stats', default=None)
+_MISSING = object()
+_installed = False
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """
+    Timings collected while handling one request.
+    """
+
+    db_queries: int = 0
+    db_ms: float = 0.0
+    template_ms: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    total_ms: float = 0.0
+    _template_depth: int = 0
+
+
+    def as_dict(self) -> dict:
+        stats = asdict(self)
+        del stats['_template_depth']
+        return stats
+
+
+    def server_timing(self) -> str:
+        """
+        Formats the stats as a Server-Timing header value.
+        """
+
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.db_queries} queries"',
+            f'tpl;dur={self.template_ms:.1f}',
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+
+def get_current_stats() -> RequestStats | None:
+    return _current_stats.get()
+
+
+class DatabaseTimer:
+    """
+    A database execute wrapper adding each query's time to the stats.
+    """
+
+    def __init__(self, stats: RequestStats):
+        self.stats = stats
+
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.db_ms += (time.perf_counter() - start) * 1000
+            self.stats.db_queries += 1
+
+
+def _instrument_templates():
+    """
+    Times Template.render. Only the outermost render is timed, so includes
+    are not counted twice.
+    """
+
+    render = Template.render
+
+    def timed_render(self, context):
+        stats = _current_stats.get()
+        if stats is None or stats._template_depth:
+            return render(self, context)
+
+        stats._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            stats.template_ms += (time.perf_counter() - start) * 1000
+            stats._template_depth -= 1
+
+    Template.render = timed_render
+
+
+def _instrument_cache(cache_class):
+    """
+    Counts hits and misses of a cache backend's get and get_many. The base
+    get_many calls get for each key, so it is only wrapped when the backend
+    implements its own, or its keys would be counted twice.
+    """
+
+    get = cache_class.get
+    get_many = cache_class.get_many
+
+    def counted_get(self, key, default=None, version=None):
+        value = get(self, key, _MISSING, version)
+        stats = _current_stats.get()
+        if value is _MISSING:
+            if stats is not None:
+                stats.cache_misses += 1
+            return default
+        if stats is not None:
+            stats.cache_hits += 1
+        return value
+
+    def counted_get_many(self, keys, version=None):
+        keys = list(keys)
+        values = get_many(self, keys, version)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.cache_hits += len(values)
+            stats.cache_misses += len(keys) - len(values)
+        return values
+
+    cache_class.get = counted_get
+    if get_many is not BaseCache.get_many:
+        cache_class.get_many = counted_get_many
+
+
+def install():
+    """
+    Instruments template rendering and the configured cache backends.
+    Called once from CoreConfig.ready.
+    """
+
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    _instrument_templates()
+    for cache_class in {type(caches[alias]) for alias in settings.CACHES}:
+        _instrument_cache(cache_class)
+
+
+class InstrumentationMiddleware:
+    """
+    Records query count and time, template render time, cache hits and
+    misses and total time for each request. Adds them to the route's
+    metrics, as a Server-Timing header if SERVER_TIMING_HEADER is set, and
+    logs them on the 'general' logger at INFO.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+
+    def __call__(self, request):
+        stats = RequestStats()
+        request.stats = stats
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        try:
+            with connection.execute_wrapper(DatabaseTimer(stats)):
+                response = self.get_response(request)
+        finally:
+            stats.total_ms = (time.perf_counter() - start) * 1000
+            _current_stats.reset(token)
+
+        match = request.resolver_match
+        route = match.view_name if match else ''
+        metrics.record_request(route, request.method, response.status_code, stats)
+
+        if getattr(settings, 'SERVER_TIMING_HEADER', True):
+            response['Server-Timing'] = stats.server_timing()
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"request method={request.method} route={route} status={response.status_code} "
+                f"total_ms={stats.total_ms:.1f} db_queries={stats.db_queries} db_ms={stats.db_ms:.1f} "
+                f"template_ms={stats.template_ms:.1f} cache_hits={stats.cache_hits} cache_misses={stats.cache_misses}",
+                extra={'request_stats': {
+                    'method': request.method,
+                    'route': route,
+                    'status': response.status_code,
+                    **stats.as_dict(),
+                }},
+            )
+
+        return response
@@ -0,0 +1,206 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+GAUGE = 'gauge'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name: (type, help, buckets)
+METRICS = {
+    'sneakerpedia_requests_total': (COUNTER, 'Requests by route, method and status.', None),
+    'sneakerpedia_request_duration_seconds': (HISTOGRAM, 'Request latency by route.', LATENCY_BUCKETS),
+    'sneakerpedia_request_db_queries': (HISTOGRAM, 'Database queries per request by route.', QUERY_BUCKETS),
+    'sneakerpedia_cache_hits_total': (COUNTER, 'Cache hits by route.', None),
+    'sneakerpedia_cache_misses_total': (COUNTER, 'Cache misses by route.', None),
+}
+CACHE_HIT_RATIO = 'sneakerpedia_cache_hit_ratio'
+
+FLUSH_INTERVAL = 1.0  # seconds
+
+
+def get_metrics_dir() -> str:
+    return getattr(settings, 'METRICS_DIR', None) or os.path.join(tempfile.gettempdir(), 'sneakerpedia-metrics')
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms for this process. Each process writes its
+    values to its own file in METRICS_DIR, at most once per FLUSH_INTERVAL,
+    and collect() sums the files of every process.
+
+    Values are keyed by metric name and a tuple of sorted label pairs.
+    Histograms hold a count per bucket, plus +Inf, then the sum.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.values = {}
+        self.last_flush = 0.0
+
+
+    def _check_pid(self):
+        # A forked worker starts from its parent's values, which the parent
+        # has already reported.
+        if os.getpid() != self.pid:
+            self.reset()
+
+
+    def inc(self, name: str, labels: dict, value: float = 1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self._check_pid()
+            self.values[key] = self.values.get(key, 0) + value
+
+
+    def observe(self, name: str, labels: dict, value: float):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self._check_pid()
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(buckets) + 2)
+            counts[bisect_left(buckets, value)] += 1
+            counts[-1] += value
+
+
+    def snapshot(self) -> list:
+        with self.lock:
+            self._check_pid()
+            return [
+                [name, list(labels), value]
+                for (name, labels), value in self.values.items()
+            ]
+
+
+    def flush(self, force: bool = False):
+        """
+        Writes this process's values to its file, atomically.
+        """
+
+        now = time.monotonic()
+        if not force and now - self.last_flush < FLUSH_INTERVAL:
+            return
+        self.last_flush = now
+
+        directory = get_metrics_dir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{self.pid}.json')
+
+        with tempfile.NamedTemporaryFile('w', dir=directory, delete=False, suffix='.tmp') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(f.name, path)
+
+
+    def collect(self) -> dict:
+        """
+        Sums the values of every process's file, including this one.
+        """
+
+        self.flush(force=True)
+        directory = get_metrics_dir()
+        totals = {}
+
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            for name, labels, value in entries:
+                if name not in METRICS:
+                    continue
+                key = (name, tuple(tuple(label) for label in labels))
+                if isinstance(value, list):
+                    current = totals.setdefault(key, [0] * len(value))
+                    totals[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    totals[key] = totals.get(key, 0) + value
+
+        return totals
+
+
+registry = MetricsRegistry()
+
+
+def record_request(route: str, method: str, status: int, stats):
+    """
+    Records a request's instrumentation stats, see core/instrumentation.py.
+    """
+
+    route = route or 'unmatched'
+    registry.inc('sneakerpedia_requests_total', {'route': route, 'method': method, 'status': str(status)})
+    registry.observe('sneakerpedia_request_duration_seconds', {'route': route, 'method': method}, stats.total_ms / 1000)
+    registry.observe('sneakerpedia_request_db_queries', {'route': route}, stats.db_queries)
+    if stats.cache_hits:
+        registry.inc('sneakerpedia_cache_hits_total', {'route': route}, stats.cache_hits)
+    if stats.cache_misses:
+        registry.inc('sneakerpedia_cache_misses_total', {'route': route}, stats.cache_misses)
+    registry.flush()
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(totals: dict) -> str:
+    """
+    Formats collected values in the Prometheus text exposition format.
+    """
+
+    lines = []
+
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (key_name, labels), value in totals.items() if key_name == name)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+
+        for labels, value in series:
+            if metric_type == HISTOGRAM:
+                cumulative = 0
+                for bound, count in zip([*buckets, '+Inf'], value[:-1]):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels, (("le", bound),))} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(value[-1])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+            else:
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+
+    hits = {labels: value for (name, labels), value in totals.items() if name == 'sneakerpedia_cache_hits_total'}
+    misses = {labels: value for (name, labels), value in totals.items() if name == 'sneakerpedia_cache_misses_total'}
+    lines.append(f'# HELP {CACHE_HIT_RATIO} Share of cache lookups that hit, by route.')
+    lines.append(f'# TYPE {CACHE_HIT_RATIO} {GAUGE}')
+    for labels in sorted(hits.keys() | misses.keys()):
+        hit, miss = hits.get(labels, 0), misses.get(labels, 0)
+        lines.append(f'{CACHE_HIT_RATIO}{_format_labels(labels)} {_format_value(round(hit / (hit + miss), 4))}')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,96 @@
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger('general')
+
+# QUERY_BUDGET_MODE values.
+RAISE = 'raise'
+LOG = 'log'
+OFF = 'off'
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(max_queries: int | dict[str, int]):
+    """
+    Declares the most queries a view may make, including session and user
+    lookups, and on full pages the nav's two permission lookups for its
+    Manage link. Decorates function views and class based views. A viewset
+    may give a dict of budgets by action, e.g. {'list': 4, 'retrieve': 3}.
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+def get_query_budget(view_func, method: str = 'GET') -> int | None:
+    """
+    Returns the budget declared on a resolved view, or None.
+    """
+
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        budget = getattr(view_class, 'query_budget', None)
+
+    if isinstance(budget, dict):
+        action = getattr(view_func, 'actions', {}).get(method.lower())
+        budget = budget.get(action)
+
+    return budget
+
+
+class QueryCounter:
+    """
+    A database execute wrapper that counts queries.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the queries made while handling a request and compares them to
+    the view's budget. Depending on QUERY_BUDGET_MODE an overrun raises
+    QueryBudgetExceeded, is logged as a warning, or is not checked.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+
+    def __call__(self, request):
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', LOG)
+        if mode == OFF:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and counter.count > budget:
+            message = f"{request.method} {request.path} made {counter.count} queries, over its budget of {budget}."
+            if mode == RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
@@ -0,0 +1,54 @@
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, resolve
+
+from core.query_budget import get_query_budget
+
+
+def get_url_patterns(urlpatterns: list) -> list[URLPattern]:
+    """
+    Flattens a urlconf's patterns, following any includes.
+    """
+
+    patterns = []
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLResolver):
+            patterns.extend(get_url_patterns(pattern.url_patterns))
+        else:
+            patterns.append(pattern)
+    return patterns
+
+
+class QueryBudgetTestMixin:
+    """
+    Adds assertWithinQueryBudget to a TestCase.
+    """
+
+    def assertWithinQueryBudget(self, url: str, client=None, method: str = 'GET'):
+        """
+        Requests a URL and asserts its view declares a query budget and
+        stays within it. Returns the response.
+        """
+
+        client = client or self.client
+        match = resolve(urlsplit(url).path)
+        budget = get_query_budget(match.func, method)
+        self.assertIsNotNone(budget, f'{match.view_name} has no query budget, see core/query_budget.py.')
+
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method.lower())(url)
+            if response.streaming:
+                # A streaming view queries as its content is read.
+                b''.join(response.streaming_content)
+
+        self.assertLess(response.status_code, 400, url)
+
+        queries = '\n'.join(query['sql'] for query in context.captured_queries)
+        self.assertLessEqual(
+            len(context),
+            budget,
+            f'{url} made {len(context)} queries, over its budget of {budget}:\n{queries}',
+        )
+        return response
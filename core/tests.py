@@ -1,3 +1,313 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, RequestFactory, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import reverse
+
+from api import urls as api_urls
+from core import metrics
+from core.instrumentation import RequestStats, _current_stats
+from core.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, get_query_budget, query_budget
+from core.testing import QueryBudgetTestMixin, get_url_patterns
+from sneakers import urls as sneakers_urls
+from sneakers.models import Sneaker
+from sneakers.synthetic import generate_catalog
+
+
+# Extra querystrings checked for a URL name, beyond the bare URL.
+URL_QUERYSTRINGS = {
+    'query': ['brand={brand}', 'year_released=2000'],
+    'brands-sneakers': ['expand=brand,related_sneakers', 'ordering=-year_released'],
+    'sneakers-list': ['expand=brand,related_sneakers', 'brand={brand}', 'ordering=-year_released'],
+    'sneakers-detail': ['expand=brand,related_sneakers'],
+    'export': ['updated_since=2000-01-01'],
+    'suggest': ['q=a'],
+    'manage_sneakers': ['sort=-updated_at', 'brand={brand}&sort=-year_released', 'status=all'],
+}
+
+# URL names whose pk is a Brand, the rest are Sneakers.
+BRAND_URLS = {'brands-detail', 'brands-sneakers'}
+
+# Other URL kwargs by URL name.
+URL_KWARGS = {
+    'export': {'resource': 'sneakers', 'export_format': 'csv'},
+}
+
+# URL names only accepting another method than GET.
+URL_METHODS = {'like': 'POST', 'comment': 'POST'}
+
+
+class QueryBudgetTests(TestCase):
+
+    def get_response(self, view, method='GET'):
+        request = getattr(RequestFactory(), method.lower())('/')
+        middleware = QueryBudgetMiddleware(lambda request: view(request))
+        middleware.process_view(request, view, (), {})
+
+        def get_response(request):
+            Sneaker.objects.count()
+            Sneaker.objects.count()
+            return HttpResponse()
+
+        middleware.get_response = get_response
+        return middleware(request)
+
+
+    def test_get_query_budget(self):
+        """
+        Asserts budgets are read from function views and per action from
+        viewsets.
+        """
+
+        @query_budget(3)
+        def view(request):
+            pass
+
+        def viewset_view(request):
+            pass
+
+        viewset_view.cls = type('ViewSet', (), {'query_budget': {'list': 4, 'retrieve': 2}})
+        viewset_view.actions = {'get': 'retrieve'}
+
+        self.assertEqual(get_query_budget(view), 3)
+        self.assertEqual(get_query_budget(viewset_view, 'GET'), 2)
+        self.assertIsNone(get_query_budget(lambda request: None))
+
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_over_budget_raises(self):
+        """
+        Asserts an overrun raises in 'raise' mode, and not within budget.
+        """
+
+        with self.assertRaises(QueryBudgetExceeded):
+            self.get_response(query_budget(1)(lambda request: None))
+
+        self.assertEqual(self.get_response(query_budget(2)(lambda request: None)).status_code, 200)
+
+
+    @override_settings(QUERY_BUDGET_MODE='log')
+    def test_over_budget_logs(self):
+        """
+        Asserts an overrun is logged in 'log' mode.
+        """
+
+        with self.assertLogs('general', 'WARNING') as logs:
+            response = self.get_response(query_budget(1)(lambda request: None))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('over its budget of 1', logs.output[0])
+
+
+class URLQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """
+    Requests every URL in sneakers.urls and api.urls against a large
+    catalog, anonymously and as a superuser, and checks each stays within
+    its query budget.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        brands, sneakers = generate_catalog(brands=50, sneakers=2000, related=3, seed=1)
+        cls.brand = brands[0]
+        cls.sneaker = next(sneaker for sneaker in sneakers if sneaker.brand_id == cls.brand.id)
+
+        cls.superuser = get_user_model().objects.create_superuser(
+            first_name = 'Admin',
+            last_name = 'User',
+            email = 'adminuser@email.com',
+            password = 'testpass123'
+        )
+
+
+    def get_urls(self, pattern) -> list[str]:
+        kwargs = dict(URL_KWARGS.get(pattern.name, {}))
+        if 'pk' in pattern.pattern.regex.groupindex:
+            kwargs['pk'] = self.brand.pk if pattern.name in BRAND_URLS else self.sneaker.pk
+
+        url = reverse(pattern.name, kwargs=kwargs)
+        return [url] + [
+            f'{url}?{querystring.format(brand=self.brand.pk)}'
+            for querystring in URL_QUERYSTRINGS.get(pattern.name, [])
+        ]
+
+
+    def test_urls_within_query_budget(self):
+        """
+        Asserts every URL declares a query budget and stays within it.
+        """
+
+        patterns = get_url_patterns(sneakers_urls.urlpatterns) + get_url_patterns(api_urls.urlpatterns)
+
+        for logged_in in (False, True):
+            if logged_in:
+                self.client.force_login(self.superuser)
+
+            for pattern in patterns:
+                for url in self.get_urls(pattern):
+                    with self.subTest(url=url, logged_in=logged_in):
+                        self.assertWithinQueryBudget(url, method=URL_METHODS.get(pattern.name, 'GET'))
+
+
+class InstrumentationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_catalog(brands=5, sneakers=50, related=2, seed=1)
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def test_server_timing_header(self):
+        """
+        Asserts queries, template time and cache hits and misses are
+        reported in the Server-Timing header.
+        """
+
+        response = self.client.get(reverse('home'))
+        header = response['Server-Timing']
+
+        self.assertIn('db;dur=', header)
+        self.assertIn('tpl;dur=', header)
+        self.assertIn('total;dur=', header)
+        self.assertEqual(response.wsgi_request.stats.db_queries, 1)
+        self.assertGreater(response.wsgi_request.stats.cache_misses, 0)
+
+        response = self.client.get(reverse('home'))
+        stats = response.wsgi_request.stats
+        self.assertEqual(stats.db_queries, 0)
+        self.assertEqual(stats.cache_misses, 0)
+        self.assertGreater(stats.cache_hits, 0)
+        self.assertIn(f'"{stats.cache_hits} hits, 0 misses"', response['Server-Timing'])
+
+
+    def test_cache_get_many_counted_once(self):
+        """
+        Asserts each key read by get_many is counted once, including on
+        backends whose get_many calls get for each key.
+        """
+
+        cache.set('present', 1)
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        try:
+            cache.get_many(['present', 'missing'])
+        finally:
+            _current_stats.reset(token)
+
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (1, 1))
+
+
+    def test_request_logged(self):
+        """
+        Asserts each request is logged with its route and timings.
+        """
+
+        with self.assertLogs('general', 'INFO') as logs:
+            self.client.get(reverse('query'))
+
+        record = logs.records[-1]
+        self.assertIn('route=query status=200', record.getMessage())
+        self.assertEqual(record.request_stats['route'], 'query')
+        self.assertGreater(record.request_stats['db_queries'], 0)
+
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_server_timing_header_disabled(self):
+        """
+        Asserts the header can be turned off.
+        """
+
+        response = self.client.get(reverse('home'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        self.metrics_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.metrics_dir.cleanup)
+        self.enterContext(override_settings(METRICS_DIR=self.metrics_dir.name))
+
+        self.staff_user = get_user_model().objects.create_user(
+            first_name = 'Staff',
+            last_name = 'User',
+            email = 'staffuser@email.com',
+            password = 'testpass123',
+            is_staff = True,
+        )
+
+
+    @override_settings(INTERNAL_IPS=[])
+    def test_metrics_requires_staff(self):
+        """
+        Asserts anonymous users are refused, and staff can read metrics.
+        """
+
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+
+    @override_settings(INTERNAL_IPS=['127.0.0.1'])
+    def test_metrics_allowed_for_internal_ips(self):
+        """
+        Asserts INTERNAL_IPS can read metrics without logging in.
+        """
+
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+
+    def test_route_metrics(self):
+        """
+        Asserts requests are counted and timed by route name.
+        """
+
+        self.client.get(reverse('home'))
+        self.client.get(reverse('home'))
+        self.client.force_login(self.staff_user)
+        body = self.client.get(reverse('metrics')).content.decode()
+
+        self.assertIn('# TYPE sneakerpedia_request_duration_seconds histogram', body)
+        self.assertRegex(body, r'sneakerpedia_requests_total\{method="GET",route="home",status="200"\} \d+')
+        self.assertRegex(body, r'sneakerpedia_request_duration_seconds_bucket\{method="GET",route="home",le="\+Inf"\} \d+')
+        self.assertRegex(body, r'sneakerpedia_request_db_queries_count\{route="home"\} \d+')
+        self.assertRegex(body, r'sneakerpedia_cache_hit_ratio\{route="home"\} [\d.]+')
+
+
+    def test_metrics_summed_across_processes(self):
+        """
+        Asserts values written by other worker processes are added in.
+        """
+
+        totals = metrics.registry.collect()
+        key = ('sneakerpedia_requests_total', (('method', 'GET'), ('route', 'other'), ('status', '200')))
+        histogram_key = ('sneakerpedia_request_db_queries', (('route', 'other'),))
+        buckets = [0] * (len(metrics.QUERY_BUCKETS) + 2)
+        buckets[1], buckets[-1] = 2, 2
+
+        with open(os.path.join(self.metrics_dir.name, '999999.json'), 'w') as f:
+            json.dump([
+                [key[0], key[1], 3],
+                [histogram_key[0], histogram_key[1], buckets],
+            ], f)
+        with open(os.path.join(self.metrics_dir.name, '999998.json'), 'w') as f:
+            json.dump([[key[0], key[1], 4]], f)
+
+        totals = metrics.registry.collect()
+        self.assertEqual(totals[key], 7)
+        self.assertEqual(totals[histogram_key], buckets)
+
+        body = metrics.render_prometheus(totals)
+        self.assertIn('sneakerpedia_requests_total{method="GET",route="other",status="200"} 7', body)
+        self.assertIn('sneakerpedia_request_db_queries_bucket{route="other",le="1"} 2', body)
+        self.assertIn('sneakerpedia_request_db_queries_count{route="other"} 2', body)
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from core import views
+
+
+urlpatterns = [
+    path('metrics', views.metrics_view, name='metrics'),
+]
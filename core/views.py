@@ -1,3 +1,23 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse
+from django.core.exceptions import PermissionDenied
 
-# Create your views here.
+from core import metrics
+from core.query_budget import query_budget
+
+
+@query_budget(2)
+def metrics_view(request):
+    """
+    Serves request metrics from every worker process in the Prometheus
+    text format. Only available to staff and INTERNAL_IPS.
+    """
+
+    internal_ips = getattr(settings, 'INTERNAL_IPS', [])
+    if not (request.META.get('REMOTE_ADDR') in internal_ips or request.user.is_staff):
+        raise PermissionDenied
+
+    return HttpResponse(
+        metrics.render_prometheus(metrics.registry.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'wait_ms', 'duration_ms')
+    list_filter = ('status', 'name')
+    readonly_fields = ('started_at', 'finished_at', 'wait_ms', 'duration_ms', 'last_error')
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,51 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker, requeue_stale_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Runs background jobs from the jobs table.'
+
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Number of jobs to run at once, each on its own thread and database connection.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait before checking again when the queue is empty.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run every due job, then exit.',
+        )
+
+
+    def handle(self, *args, **options):
+        requeue_stale_jobs()
+
+        if options['once']:
+            count = run_pending_jobs()
+            self.stdout.write(self.style.SUCCESS(f'Ran {count} jobs.'))
+            return
+
+        worker = Worker(concurrency=options['concurrency'], poll_interval=options['poll_interval'])
+        signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+
+        self.stdout.write(f"Worker started with concurrency {options['concurrency']}.")
+        worker.run()
+
+        stats = worker.stats
+        total = stats['succeeded'] + stats['failed']
+        mean = stats['duration_ms'] / total if total else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker stopped: {stats['succeeded']} succeeded, {stats['failed']} failed, mean {mean:.1f}ms."
+        ))
@@ -0,0 +1,66 @@
+from datetime import timedelta
+from typing import Callable
+
+from django.utils import timezone
+
+from jobs.models import Job
+
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+_registry: dict[str, Callable] = {}
+
+
+def job(func: Callable = None, *, name: str = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+    """
+    Registers a function as a background job and adds an `enqueue` method
+    to it. Arguments must be JSON serializable, e.g. ids rather than
+    model instances.
+
+    @job
+    def send_email(to): ...
+
+    send_email.enqueue(to='someone@example.com')
+    """
+
+    def decorator(func: Callable) -> Callable:
+        job_name = name or f'{func.__module__}.{func.__name__}'
+        _registry[job_name] = func
+
+        def enqueue_job(delay: timedelta = None, **kwargs) -> Job:
+            return enqueue(job_name, kwargs, delay=delay, max_attempts=max_attempts)
+
+        func.job_name = job_name
+        func.enqueue = enqueue_job
+        return func
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_job_function(name: str) -> Callable | None:
+    return _registry.get(name)
+
+
+def enqueue(
+    name: str,
+    payload: dict = None,
+    delay: timedelta = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> Job:
+    """
+    Inserts a job row. Inside a transaction the job is only visible to
+    workers once it commits, so it never runs against unsaved data.
+    """
+
+    run_after = timezone.now()
+    if delay:
+        run_after += delay
+
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        max_attempts=max_attempts,
+        run_after=run_after,
+    )
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import job, enqueue
+from jobs.worker import claim_job, run_job, run_pending_jobs, requeue_stale_jobs
+
+
+calls = []
+
+
+@job(name='tests.record_call')
+def record_call(value):
+    calls.append(value)
+
+
+@job(name='tests.always_fail', max_attempts=2)
+def always_fail():
+    raise ValueError('Failed on purpose.')
+
+
+class WorkerTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+
+    def test_enqueue_and_run(self):
+        """
+        Asserts an enqueued job runs once with its payload and records its
+        timings.
+        """
+
+        queued = record_call.enqueue(value=1)
+        self.assertEqual(queued.status, Job.Status.QUEUED)
+
+        self.assertEqual(run_pending_jobs(), 1)
+        self.assertEqual(calls, [1])
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.SUCCEEDED)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIsNotNone(queued.duration_ms)
+        self.assertIsNotNone(queued.wait_ms)
+        self.assertEqual(run_pending_jobs(), 0)
+
+
+    def test_delayed_job_not_claimed(self):
+        """
+        Asserts a job is not claimed before its run_after time.
+        """
+
+        record_call.enqueue(delay=timedelta(minutes=5), value=1)
+        self.assertIsNone(claim_job())
+
+
+    def test_failed_job_retried_with_backoff(self):
+        """
+        Asserts a failing job is requeued for later, then marked failed once
+        it runs out of attempts.
+        """
+
+        queued = always_fail.enqueue()
+
+        run_job(claim_job())
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.QUEUED)
+        self.assertGreater(queued.run_after, timezone.now())
+        self.assertIn('Failed on purpose.', queued.last_error)
+
+        Job.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        run_job(claim_job())
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.FAILED)
+        self.assertEqual(queued.attempts, 2)
+
+
+    def test_unknown_job_fails(self):
+        """
+        Asserts a job with no registered function fails without retrying.
+        """
+
+        queued = enqueue('tests.missing')
+        run_pending_jobs()
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.FAILED)
+        self.assertEqual(queued.attempts, 1)
+
+
+    def test_stale_job_requeued(self):
+        """
+        Asserts a job left running by a dead worker is returned to the queue.
+        """
+
+        queued = record_call.enqueue(value=1)
+        claim_job()
+        Job.objects.filter(pk=queued.pk).update(started_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(requeue_stale_jobs(), 1)
+        self.assertEqual(run_pending_jobs(), 1)
+        self.assertEqual(calls, [1])
+
+
+    def test_run_worker_once(self):
+        """
+        Asserts 'run_worker --once' runs the due jobs and exits.
+        """
+
+        record_call.enqueue(value=1)
+        record_call.enqueue(value=2)
+
+        out = StringIO()
+        call_command('run_worker', '--once', stdout=out)
+
+        self.assertEqual(sorted(calls), [1, 2])
+        self.assertIn('Ran 2 jobs.', out.getvalue())
@@ -0,0 +1,197 @@
+import logging
+import random
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import get_job_function
+
+
+logger = logging.getLogger('general')
+
+BACKOFF_BASE = 10  # seconds
+BACKOFF_MAX = 3600  # seconds
+STALE_AFTER = timedelta(minutes=30)
+KEEP_SUCCEEDED = timedelta(days=7)
+
+
+def get_backoff(attempts: int) -> timedelta:
+    """
+    Exponential backoff with jitter: ~10s, 20s, 40s... capped at an hour.
+    """
+
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.9, 1.1))
+
+
+def claim_job() -> Job | None:
+    """
+    Claims the next due job. SKIP LOCKED lets concurrent workers each take
+    a different row instead of queueing on the same one.
+    """
+
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_after__lte=timezone.now())
+            .order_by('run_after')
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = Job.Status.RUNNING
+        job.attempts += 1
+        job.started_at = timezone.now()
+        job.finished_at = None
+        job.wait_ms = (job.started_at - job.run_after).total_seconds() * 1000
+        job.save(update_fields=['status', 'attempts', 'started_at', 'finished_at', 'wait_ms', 'updated_at'])
+
+    return job
+
+
+def run_job(job: Job) -> bool:
+    """
+    Runs a claimed job and records the outcome. Failures are retried with
+    backoff until max_attempts, unknown job names fail straight away.
+    Returns whether the job succeeded.
+    """
+
+    func = get_job_function(job.name)
+    start = time.perf_counter()
+
+    try:
+        if func is None:
+            raise LookupError(f'No job registered as {job.name}')
+        func(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        succeeded = False
+    else:
+        job.last_error = ''
+        succeeded = True
+
+    job.duration_ms = (time.perf_counter() - start) * 1000
+    job.finished_at = timezone.now()
+
+    if succeeded:
+        job.status = Job.Status.SUCCEEDED
+        logger.info(f"Job {job.name} {job.id} succeeded in {job.duration_ms:.1f}ms, waited {job.wait_ms:.1f}ms")
+    elif func is not None and job.attempts < job.max_attempts:
+        job.status = Job.Status.QUEUED
+        job.run_after = job.finished_at + get_backoff(job.attempts)
+        logger.warning(f"Job {job.name} {job.id} failed attempt {job.attempts}, retrying at {job.run_after}")
+    else:
+        job.status = Job.Status.FAILED
+        logger.error(f"Job {job.name} {job.id} failed after {job.attempts} attempts:\n{job.last_error}")
+
+    job.save(update_fields=['status', 'run_after', 'last_error', 'duration_ms', 'finished_at', 'updated_at'])
+    return succeeded
+
+
+def requeue_stale_jobs(stale_after: timedelta = STALE_AFTER) -> int:
+    """
+    Returns jobs left running by a worker that died back to the queue.
+    """
+
+    return Job.objects.filter(
+        status=Job.Status.RUNNING,
+        started_at__lt=timezone.now() - stale_after,
+    ).update(status=Job.Status.QUEUED, run_after=timezone.now())
+
+
+def delete_old_jobs(keep: timedelta = KEEP_SUCCEEDED) -> int:
+    """
+    Deletes succeeded jobs older than `keep`. Failed jobs are kept for review.
+    """
+
+    deleted, _ = Job.objects.filter(
+        status=Job.Status.SUCCEEDED,
+        finished_at__lt=timezone.now() - keep,
+    ).delete()
+    return deleted
+
+
+def run_pending_jobs() -> int:
+    """
+    Runs due jobs in the current thread until none are left. Used by
+    `run_worker --once` and tests.
+    """
+
+    count = 0
+    while (job := claim_job()) is not None:
+        run_job(job)
+        count += 1
+    return count
+
+
+class Worker:
+    """
+    Polls for jobs on `concurrency` threads until stopped. Each thread has
+    its own database connection.
+    """
+
+    def __init__(self, concurrency: int = 1, poll_interval: float = 1.0, housekeeping_interval: float = 60.0):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.housekeeping_interval = housekeeping_interval
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.stats = {'succeeded': 0, 'failed': 0, 'duration_ms': 0.0}
+
+
+    def record(self, job: Job, succeeded: bool):
+        with self.lock:
+            self.stats['succeeded' if succeeded else 'failed'] += 1
+            self.stats['duration_ms'] += job.duration_ms
+
+
+    def loop(self):
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                job = claim_job()
+                if job is None:
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+                self.record(job, run_job(job))
+        finally:
+            connection.close()
+
+
+    def housekeeping(self):
+        try:
+            while not self.stop_event.wait(self.housekeeping_interval):
+                close_old_connections()
+                requeued = requeue_stale_jobs()
+                deleted = delete_old_jobs()
+                if requeued or deleted:
+                    logger.info(f"Requeued {requeued} stale jobs, deleted {deleted} old jobs")
+        finally:
+            connection.close()
+
+
+    def run(self):
+        threads = [threading.Thread(target=self.loop, name=f'job-worker-{i}') for i in range(self.concurrency)]
+        threads.append(threading.Thread(target=self.housekeeping, name='job-housekeeping'))
+
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+
+    def stop(self):
+        self.stop_event.set()
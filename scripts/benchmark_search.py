@@ -0,0 +1,82 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from sneakers.models import Sneaker
+from sneakers.search import search_sneakers
+from sneakers.synthetic import generate_catalog
+
+
+DEFAULT_ROWS = 100_000
+DEFAULT_REPEATS = 20
+PAGE_SIZE = 48
+TERMS = ['air max', 'zoom', 'hatfield', 'apex', 'glid', 'retro low 42']
+
+
+def icontains_search(queryset, value):
+    """
+    The original SneakerFilter search, kept as the benchmark baseline.
+    """
+
+    return queryset.filter(
+        Q(name__icontains=value) |
+        Q(designer__icontains=value) |
+        Q(brand__name__icontains=value)
+    ).distinct().order_by('name')
+
+
+def time_search(search, value, repeats):
+    """
+    Times a results page plus the total count, as query_view needs both.
+    """
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        queryset = search(Sneaker.objects.all(), value)
+        list(queryset[:PAGE_SIZE])
+        queryset.count()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(*args):
+    """
+    This script is executed by running:
+    'python manage.py runscript benchmark_search --script-args rows=100000 repeats=20'
+    It builds a synthetic catalog inside a transaction that is rolled back,
+    and compares the icontains filter with the full-text search engine.
+    """
+    if not settings.DEBUG:
+        print("Benchmarking is only allowed in DEBUG mode.")
+        return
+
+    options = dict(arg.split('=', 1) for arg in args)
+    rows = int(options.get('rows', DEFAULT_ROWS))
+    repeats = int(options.get('repeats', DEFAULT_REPEATS))
+
+    with transaction.atomic():
+        print(f"Generating {rows} synthetic sneakers...")
+        generate_catalog(brands=max(rows // 500, 10), sneakers=rows, related=0)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE sneakers_brand')
+            cursor.execute('ANALYZE sneakers_sneaker')
+
+        print(f"\n{'term':<16}{'icontains p50':>16}{'p95':>10}{'search p50':>14}{'p95':>10}{'speedup':>10}")
+        for term in TERMS:
+            old_p50, old_p95 = time_search(icontains_search, term, repeats)
+            new_p50, new_p95 = time_search(search_sneakers, term, repeats)
+            print(
+                f"{term:<16}{old_p50:>14.2f}ms{old_p95:>8.2f}ms"
+                f"{new_p50:>12.2f}ms{new_p95:>8.2f}ms{old_p50 / new_p50:>9.1f}x"
+            )
+
+        transaction.set_rollback(True)
+
+    print("\nSynthetic data rolled back.")
@@ -0,0 +1,103 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from benchmarks.runner import build_cases, compare, run_benchmarks
+from sneakers.catalog import bump_catalog_version
+from sneakers.synthetic import generate_catalog
+
+
+DEFAULTS = {
+    'brands': 200,
+    'sneakers': 20_000,
+    'related': 3,
+    'repeats': 50,
+    'warmup': 3,
+    'seed': 0,
+}
+RESULTS_DIR = os.path.join(settings.BASE_DIR, 'benchmarks', 'results')
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(*args):
+    """
+    This script is executed by running:
+    'python manage.py runscript benchmark_views --script-args brands=200 sneakers=20000 repeats=50'
+    Optional args: related=, warmup=, seed=, cold=1 (clear the cache before
+    each request), out=path.json and baseline=path.json to compare against
+    an earlier run. The synthetic catalog is rolled back afterwards.
+    """
+    if not settings.DEBUG:
+        print("Benchmarking is only allowed in DEBUG mode.")
+        return
+
+    options = dict(arg.split('=', 1) for arg in args)
+    params = {key: int(options.get(key, default)) for key, default in DEFAULTS.items()}
+    cold = options.get('cold') == '1'
+
+    with transaction.atomic():
+        print(f"Generating {params['brands']} brands and {params['sneakers']} sneakers...")
+        brands, sneakers = generate_catalog(
+            brands=params['brands'],
+            sneakers=params['sneakers'],
+            related=params['related'],
+            seed=params['seed'],
+        )
+        bump_catalog_version()
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE sneakers_brand')
+                cursor.execute('ANALYZE sneakers_sneaker')
+                cursor.execute('ANALYZE sneakers_sneaker_related_sneakers')
+
+        cases = build_cases(brands[0], sneakers[0])
+        results = run_benchmarks(cases, params['repeats'], params['warmup'], cold)
+
+        transaction.set_rollback(True)
+
+    bump_catalog_version()
+
+    baseline = {}
+    if 'baseline' in options:
+        with open(options['baseline']) as f:
+            baseline = json.load(f)['results']
+    ratios = compare(results, baseline)
+
+    print(f"\n{'case':<24}{'p50':>10}{'p95':>10}{'p99':>10}{'queries':>9}{'sql':>10}{'peak':>10}{'vs base':>9}")
+    for name, result in results.items():
+        ratio = f"{ratios[name]:.2f}x" if name in ratios else ''
+        print(
+            f"{name:<24}{result['p50_ms']:>8.2f}ms{result['p95_ms']:>8.2f}ms{result['p99_ms']:>8.2f}ms"
+            f"{result['queries']:>9}{result['sql_ms']:>8.2f}ms{result['peak_memory_kb']:>8.0f}kB{ratio:>9}"
+        )
+
+    now = datetime.now(timezone.utc)
+    out = options.get('out') or os.path.join(RESULTS_DIR, f"{now.strftime('%Y%m%dT%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+
+    with open(out, 'w') as f:
+        json.dump({
+            'created_at': now.isoformat(),
+            'commit': get_commit(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'params': {**params, 'cold': cold},
+            'results': results,
+        }, f, indent=2)
+
+    print(f"\nResults written to {out}")
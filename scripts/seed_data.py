@@ -1,25 +1,83 @@
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from django.core.files import File
 from django.conf import settings
+from django.db import connection, transaction
 
-# --- Import your models ---
 from sneakers.models import Brand, Sneaker
+from sneakers.catalog import bump_catalog_version
+from sneakers.images import render_variants
 
-def run():
+
+BATCH_SIZE = 1000
+IMAGE_WORKERS = 8
+
+
+def copy_image(image_path: Path, sneaker_name: str) -> tuple[str, list[dict]]:
+    """
+    Saves a seed image to storage under the usual upload path and renders
+    its variants. Returns the stored name and the variant metadata.
+    """
+
+    sneaker = Sneaker(name=sneaker_name)
+    with open(image_path, "rb") as img_f:
+        sneaker.primary_image.save(image_path.name, File(img_f), save=False)
+
+    return sneaker.primary_image.name, render_variants(sneaker.primary_image, sneaker.primary_image.storage)
+
+
+def copy_images(sneaker_data: list[dict], image_dir_path: Path) -> dict[str, tuple[str, list[dict]]]:
+    """
+    Copies each distinct seed image once, in parallel. Scaled copies of a
+    sneaker share the stored file.
+    """
+
+    images = {}
+    for sneaker_item in sneaker_data:
+        image_filename = sneaker_item.get("primary_image")
+        if not image_filename or image_filename in images:
+            continue
+
+        image_path = image_dir_path / image_filename
+        if image_path.exists():
+            images[image_filename] = (image_path, sneaker_item["name"])
+        else:
+            print(f"Image not found: {image_path}")
+
+    with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as executor:
+        futures = {
+            filename: executor.submit(copy_image, image_path, name)
+            for filename, (image_path, name) in images.items()
+        }
+        return {filename: future.result() for filename, future in futures.items()}
+
+
+def scaled_name(name: str, copy: int) -> str:
+    return name if copy == 0 else f"{name} {copy + 1}"
+
+
+def run(*args):
     """
     This script is executed by running: 'python manage.py runscript seed_data'
     It replaces all database data with test data for development.
+    Optional args: 'scale=10' multiplies the fixture data into numbered
+    copies, for load testing, and 'noinput=1' skips the confirmation.
     """
     if not settings.DEBUG:
         print("Seeding is only allowed in DEBUG mode.")
         return
 
-    confirm = input('Replace all existing data with test data? This cannot be undone. (y/n): ')
-    if confirm.lower() != 'y':
-        print("Seeding cancelled.")
-        return
+    options = dict(arg.split("=", 1) for arg in args)
+    scale = int(options.get("scale", 1))
+
+    if options.get("noinput") != "1":
+        confirm = input('Replace all existing data with test data? This cannot be undone. (y/n): ')
+        if confirm.lower() != 'y':
+            print("Seeding cancelled.")
+            return
 
     # Setup Paths
     script_dir = Path(__file__).parent
@@ -31,71 +89,93 @@ def run():
         print("Ensure brands.json and sneakers.json exist in the scripts directory.")
         return
 
-    # Clear existing objects
-    print("Deleting existing data...")
-    Sneaker.objects.all().delete()
-    Brand.objects.all().delete()
-
-    # Load and create brand data
-    print("Creating brands...")
     with open(brand_data_path, "r", encoding="utf-8") as f:
         brand_data = json.load(f)
-        for brand_item in brand_data:
-            Brand.objects.create(**brand_item)
-    print(f"{Brand.objects.count()} brands created.")
-
-    # Load sneaker data
     with open(sneaker_data_path, "r", encoding="utf-8") as f:
         sneaker_data = json.load(f)
 
-    # Create Sneaker Objects
-    print("Creating sneakers...")
-    sneaker_objects_map = {}
-    for sneaker_item in sneaker_data:
-        try:
-            brand_name = sneaker_item.pop("brand_name")
-            brand_instance = Brand.objects.get(name=brand_name)
-        except Brand.DoesNotExist:
-            print(f"Brand '{brand_name}' not found. Skipping sneaker '{sneaker_item['name']}'.")
-            continue
-        except KeyError:
-            print(f"'brand_name' missing for sneaker '{sneaker_item['name']}'. Skipping.")
-            continue
-
-        related_names = sneaker_item.pop("related_sneakers", [])
-        image_filename = sneaker_item.pop("primary_image", None)
-
-        new_sneaker = Sneaker.objects.create(brand=brand_instance, **sneaker_item)
-
-        if image_filename:
-            image_path = image_dir_path / image_filename
-
-            print(f"\nProcessing sneaker: {new_sneaker.name}")
-            print(f"  > Looking for image: {image_filename}")
-            print(f"  > Expecting it at full path: {image_path.resolve()}")
-
-            if image_path.exists():
-                with open(image_path, "rb") as img_f:
-                    new_sneaker.primary_image.save(image_filename, File(img_f), save=True)
-            else:
-                print(f"Image not found: {image_path}")
-
-        sneaker_objects_map[new_sneaker.name] = {
-            "instance": new_sneaker,
-            "related_names": related_names
-        }
-    print(f"{Sneaker.objects.count()} sneakers created.")
-
-    # Add Many-to-Many relationships
-    print("Adding relationships...")
-    for name, data in sneaker_objects_map.items():
-        sneaker_instance = data["instance"]
-        related_names = data["related_names"]
-        if not related_names:
-            continue
-        
-        related_instances = [sneaker_objects_map[r_name]["instance"] for r_name in related_names if r_name in sneaker_objects_map]
-        sneaker_instance.related_sneakers.set(related_instances)
-    print("Relationships added.")
-
-    print("\nDatabase seeded successfully.")
\ No newline at end of file
+    start = time.perf_counter()
+
+    print("Copying images...")
+    images = copy_images(sneaker_data, image_dir_path)
+    print(f"{len(images)} images copied.")
+
+    with transaction.atomic():
+        # Clear existing objects with one TRUNCATE, rather than loading every
+        # row and sending post_delete for each. CASCADE also empties the
+        # likes, comments and recommendations that reference the sneakers.
+        print("Deleting existing data...")
+        tables = [
+            Sneaker.related_sneakers.through._meta.db_table,
+            Sneaker._meta.db_table,
+            Brand._meta.db_table,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {', '.join(connection.ops.quote_name(table) for table in tables)} CASCADE")
+
+        # Create brands, mapped by (copy, fixture name)
+        print("Creating brands...")
+        brand_keys = []
+        brand_objects = []
+        for copy in range(scale):
+            for brand_item in brand_data:
+                brand_keys.append((copy, brand_item["name"]))
+                brand_objects.append(Brand(**{**brand_item, "name": scaled_name(brand_item["name"], copy)}))
+
+        Brand.objects.bulk_create(brand_objects, batch_size=BATCH_SIZE)
+        brand_map = dict(zip(brand_keys, brand_objects))
+        print(f"{len(brand_objects)} brands created.")
+
+        # Create sneakers, mapped by (copy, fixture name)
+        print("Creating sneakers...")
+        sneaker_keys = []
+        sneaker_objects = []
+        related_names = {}
+        for copy in range(scale):
+            for sneaker_item in sneaker_data:
+                item = dict(sneaker_item)
+                brand_name = item.pop("brand_name", None)
+                brand_instance = brand_map.get((copy, brand_name))
+                if brand_instance is None:
+                    print(f"Brand '{brand_name}' not found. Skipping sneaker '{item['name']}'.")
+                    continue
+
+                key = (copy, item["name"])
+                related_names[key] = item.pop("related_sneakers", [])
+                image_name, image_variants = images.get(item.pop("primary_image", None), ("", []))
+
+                sneaker_keys.append(key)
+                sneaker_objects.append(Sneaker(
+                    **{**item, "name": scaled_name(item["name"], copy)},
+                    brand=brand_instance,
+                    primary_image=image_name,
+                    image_variants=image_variants,
+                ))
+
+        Sneaker.objects.bulk_create(sneaker_objects, batch_size=BATCH_SIZE)
+        sneaker_map = dict(zip(sneaker_keys, sneaker_objects))
+        print(f"{len(sneaker_objects)} sneakers created.")
+
+        # Add Many-to-Many relationships, within the same copy. The relation
+        # is symmetrical, so each link is stored in both directions.
+        print("Adding relationships...")
+        Through = Sneaker.related_sneakers.through
+        links = set()
+        for (copy, name), names in related_names.items():
+            sneaker_instance = sneaker_map[(copy, name)]
+            for r_name in names:
+                related_instance = sneaker_map.get((copy, r_name))
+                if related_instance is not None and related_instance.pk != sneaker_instance.pk:
+                    links.add((sneaker_instance.pk, related_instance.pk))
+                    links.add((related_instance.pk, sneaker_instance.pk))
+
+        Through.objects.bulk_create(
+            [Through(from_sneaker_id=a, to_sneaker_id=b) for a, b in links],
+            batch_size=BATCH_SIZE,
+        )
+        print(f"{len(links) // 2} relationships added.")
+
+    # TRUNCATE and bulk_create send no signals, so invalidate the catalog here.
+    bump_catalog_version()
+
+    print(f"\nDatabase seeded successfully in {time.perf_counter() - start:.1f}s.")
@@ -1,7 +1,41 @@
 from django.contrib import admin
 
-from sneakers.models import Brand, Sneaker
+from sneakers.models import Brand, Comment, Like, Sneaker, SneakerRecommendation
+
+
+class SneakerAdmin(admin.ModelAdmin):
+    list_display = ('name', 'brand', 'year_released', 'like_count', 'comment_count', 'deleted')
+    list_filter = ('deleted',)
+
+
+    def get_queryset(self, request):
+        """
+        Includes soft-deleted sneakers, so they can be reviewed and restored.
+        """
+
+        return Sneaker.all_with_deleted.select_related('brand')
+
+
+class SneakerRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('sneaker', 'rank', 'recommended', 'score', 'curated')
+    list_select_related = ('sneaker', 'recommended')
+    raw_id_fields = ('sneaker', 'recommended')
+
+
+class LikeAdmin(admin.ModelAdmin):
+    list_display = ('user', 'sneaker', 'created_at')
+    list_select_related = ('user', 'sneaker')
+    raw_id_fields = ('user', 'sneaker')
+
+
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('sneaker', 'user', 'created_at')
+    list_select_related = ('sneaker', 'user')
+    raw_id_fields = ('sneaker', 'user')
 
 
 admin.site.register(Brand)
-admin.site.register(Sneaker)
\ No newline at end of file
+admin.site.register(Sneaker, SneakerAdmin)
+admin.site.register(SneakerRecommendation, SneakerRecommendationAdmin)
+admin.site.register(Like, LikeAdmin)
+admin.site.register(Comment, CommentAdmin)
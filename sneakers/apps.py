@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SneakersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sneakers'
+
+    def ready(self):
+        from sneakers import signals  # noqa: F401
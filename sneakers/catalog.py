@@ -0,0 +1,165 @@
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from sneakers.models import Sneaker
+from sneakers.images import JPEG, WEBP, build_srcset
+
+
+CATALOG_VERSION_KEY = 'catalog:version'
+SNAPSHOT_KEY = 'catalog:snapshot:{version}'
+SNAPSHOT_TIMEOUT = 60 * 60
+BRAND_VERSION_KEY = 'catalog:brand:{brand_id}:version'
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+@dataclass(frozen=True, slots=True)
+class SneakerCard:
+    """
+    The subset of a Sneaker needed to render a catalog card.
+    """
+
+    id: str
+    name: str
+    image_url: str
+    image_srcset: str
+    image_webp_srcset: str
+
+    @property
+    def pk(self) -> str:
+        return self.id
+
+
+@dataclass(frozen=True, slots=True)
+class BrandCard:
+    """
+    A brand and its live sneakers, ordered by name.
+    """
+
+    id: str
+    name: str
+    sneakers: tuple[SneakerCard, ...]
+
+    def __str__(self):
+        return self.name
+
+
+def get_catalog_version() -> int:
+    """
+    Returns the current catalog version, seeding it if it is not cached.
+    The seed is time based so a lost key never resurrects an old snapshot.
+    """
+
+    version = cache.get(CATALOG_VERSION_KEY)
+
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+
+    return version
+
+
+def bump_catalog_version() -> int:
+    """
+    Atomically increments the catalog version, orphaning every cache entry
+    keyed on the previous version.
+    """
+
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        return get_catalog_version()
+
+
+def get_brand_versions(brand_ids: list[str]) -> dict[str, int]:
+    """
+    Returns the content version of each brand in one cache round trip,
+    seeding any that are missing.
+    """
+
+    keys = {BRAND_VERSION_KEY.format(brand_id=brand_id): brand_id for brand_id in brand_ids}
+    cached = cache.get_many(keys)
+
+    missing = {key: time.time_ns() for key in keys if key not in cached}
+    if missing:
+        for key, version in missing.items():
+            cache.add(key, version, timeout=None)
+        cached.update(cache.get_many(missing))
+
+    return {brand_id: cached[key] for key, brand_id in keys.items()}
+
+
+def bump_brand_version(brand_id) -> None:
+    """
+    Atomically increments a brand's content version, orphaning its cached
+    grid fragment without touching any other brand.
+    """
+
+    key = BRAND_VERSION_KEY.format(brand_id=brand_id)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def build_catalog_snapshot() -> tuple[BrandCard, ...]:
+    """
+    Builds the home page catalog in a single query. Only live sneakers are
+    included, so brands whose sneakers are all soft-deleted are omitted.
+
+    Rows are read in (brand, name, id) order, matching an index, and the
+    handful of brands are then sorted by name in Python.
+    """
+
+    storage = Sneaker._meta.get_field('primary_image').storage
+
+    rows = Sneaker.objects.filter(
+        brand__isnull=False,
+    ).order_by(
+        'brand_id', 'name', 'id',
+    ).values_list(
+        'id', 'name', 'primary_image', 'image_variants', 'brand_id', 'brand__name',
+    )
+
+    brands = []
+    current_id, current_name, current_sneakers = None, None, []
+
+    for sneaker_id, name, image, variants, brand_id, brand_name in rows:
+        if brand_id != current_id:
+            if current_sneakers:
+                brands.append(BrandCard(str(current_id), current_name, tuple(current_sneakers)))
+            current_id, current_name, current_sneakers = brand_id, brand_name, []
+
+        current_sneakers.append(
+            SneakerCard(
+                id=str(sneaker_id),
+                name=name,
+                image_url=storage.url(image) if image else '',
+                image_srcset=build_srcset(variants, JPEG, storage),
+                image_webp_srcset=build_srcset(variants, WEBP, storage),
+            )
+        )
+
+    if current_sneakers:
+        brands.append(BrandCard(str(current_id), current_name, tuple(current_sneakers)))
+
+    brands.sort(key=lambda brand: (brand.name, brand.id))
+    return tuple(brands)
+
+
+def get_catalog_snapshot() -> tuple[BrandCard, ...]:
+    """
+    Returns the catalog snapshot for the current version, building and
+    caching it on a miss.
+    """
+
+    key = SNAPSHOT_KEY.format(version=get_catalog_version())
+    snapshot = cache.get(key)
+
+    if snapshot is None:
+        snapshot = build_catalog_snapshot()
+        cache.set(key, snapshot, timeout=SNAPSHOT_TIMEOUT)
+
+    return snapshot
@@ -0,0 +1,65 @@
+import time
+
+from django.core.cache import cache
+
+from sneakers.models import Comment
+from sneakers.pagination import KeysetPage, paginate_keyset
+
+
+COMMENT_VERSION_KEY = 'comments:sneaker:{sneaker_id}:version'
+COMMENT_PAGE_SIZE = 20
+# Newest first, matching the (sneaker, created_at, id) index.
+COMMENT_ORDERING = ['-created_at', '-id']
+
+
+def get_comment_version(sneaker_id) -> int:
+    """
+    Returns the version of a sneaker's comments, seeding it if it is not
+    cached. The seed is time based so a lost key never resurrects an old
+    fragment.
+    """
+
+    key = COMMENT_VERSION_KEY.format(sneaker_id=sneaker_id)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_comment_version(sneaker_id) -> None:
+    """
+    Atomically increments a sneaker's comment version, orphaning its cached
+    comment fragment without touching any other sneaker's.
+    """
+
+    key = COMMENT_VERSION_KEY.format(sneaker_id=sneaker_id)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def get_comment_page(sneaker_id, cursor: str | None = None) -> KeysetPage:
+    """
+    Returns the page of a sneaker's comments following the cursor, with
+    each author's name, in one query.
+    """
+
+    queryset = Comment.objects.filter(
+        sneaker_id=sneaker_id,
+    ).select_related(
+        'user',
+    ).only(
+        'id',
+        'created_at',
+        'body',
+        'sneaker_id',
+        'user__first_name',
+        'user__last_name',
+    )
+
+    return paginate_keyset(queryset, COMMENT_ORDERING, cursor, COMMENT_PAGE_SIZE)
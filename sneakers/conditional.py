@@ -0,0 +1,111 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from sneakers.models import Brand, Sneaker
+from sneakers.catalog import get_catalog_version
+from sneakers.comments import get_comment_version
+from sneakers.likes import get_liked_version
+
+
+# Likes change like_count without touching updated_at.
+SNEAKER_VALIDATORS = ('updated_at', 'brand__updated_at', 'like_count')
+
+
+def make_etag(*parts) -> str:
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _get_updated_at(request, model, pk, fields: tuple[str, ...]) -> tuple | None:
+    """
+    Fetches the `updated_at` columns that validate an object, once per
+    request, as the ETag and Last-Modified functions both need them.
+    Returns None for a missing object, so the view can raise its 404.
+    """
+
+    cache = request.__dict__.setdefault('_updated_at', {})
+    key = (model, pk)
+
+    if key not in cache:
+        try:
+            cache[key] = model.objects.filter(pk=pk).values_list(*fields).first()
+        except ValidationError:
+            cache[key] = None
+
+    return cache[key]
+
+
+def _get_user_key(request):
+    # Pages render the signed in user's nav, and the browsable API the
+    # format negotiated from Accept, so both are part of the ETag.
+    user = getattr(request, 'user', None)
+    return getattr(user, 'pk', None), request.META.get('HTTP_ACCEPT', '')
+
+
+def sneaker_etag(request, pk, *args, **kwargs) -> str | None:
+    """
+    Validates a Sneaker page or object from its own and its brand's
+    updated_at and its like count, loaded with one primary key lookup. An
+    expanded list of related sneakers also depends on the catalog version.
+    """
+
+    updated_at = _get_updated_at(request, Sneaker, pk, SNEAKER_VALIDATORS)
+    if updated_at is None:
+        return None
+
+    expand = request.GET.get('expand', '')
+    catalog_version = get_catalog_version() if 'related_sneakers' in expand else ''
+
+    return make_etag(*updated_at, *_get_user_key(request), request.GET.urlencode(), catalog_version)
+
+
+def sneaker_page_etag(request, pk, *args, **kwargs) -> str | None:
+    """
+    Validates a Sneaker page, which also shows recommended sneakers, the
+    latest comments and which sneakers the user likes, so it depends on the
+    catalog, comment and liked set versions too. Its forms embed a CSRF
+    token, which is rotated on login, so the page also depends on the CSRF
+    cookie.
+    """
+
+    etag = sneaker_etag(request, pk)
+    if etag is None:
+        return None
+    return make_etag(
+        etag,
+        get_catalog_version(),
+        get_comment_version(pk),
+        get_liked_version(request.user),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+    )
+
+
+def sneaker_last_modified(request, pk, *args, **kwargs):
+    updated_at = _get_updated_at(request, Sneaker, pk, SNEAKER_VALIDATORS)
+    if updated_at is None:
+        return None
+    return max(value for value in updated_at[:2] if value is not None)
+
+
+def brand_etag(request, pk, *args, **kwargs) -> str | None:
+    updated_at = _get_updated_at(request, Brand, pk, ('updated_at',))
+    if updated_at is None:
+        return None
+    return make_etag(*updated_at, *_get_user_key(request), request.GET.urlencode())
+
+
+def brand_last_modified(request, pk, *args, **kwargs):
+    updated_at = _get_updated_at(request, Brand, pk, ('updated_at',))
+    return updated_at[0] if updated_at else None
+
+
+def catalog_etag(request, *args, **kwargs) -> str:
+    """
+    Validates a list from the catalog version, which every Brand and
+    Sneaker write bumps, so it costs a cache read and no queries. A list
+    filtered to the user's likes also depends on their liked set.
+    """
+
+    liked_version = get_liked_version(request.user) if 'liked' in request.GET else ''
+    return make_etag(get_catalog_version(), request.path, request.GET.urlencode(), *_get_user_key(request), liked_version)
@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from sneakers.catalog import bump_brand_version, bump_catalog_version
+from sneakers.models import Brand
+
+
+DASHBOARD_PAGE_SIZE = 100
+
+# sort: keyset ordering. Each ends with name and id, matching an index.
+SORTS = {
+    'name': ['name', 'id'],
+    '-name': ['-name', '-id'],
+    'year_released': ['year_released', 'name', 'id'],
+    '-year_released': ['-year_released', '-name', '-id'],
+    'updated_at': ['updated_at', 'name', 'id'],
+    '-updated_at': ['-updated_at', '-name', '-id'],
+}
+DEFAULT_SORT = 'name'
+
+# The columns the dashboard table shows.
+DASHBOARD_FIELDS = ('id', 'name', 'designer', 'year_released', 'updated_at', 'deleted', 'brand__name')
+
+DELETE = 'delete'
+RESTORE = 'restore'
+REASSIGN = 'reassign'
+ACTIONS = (
+    (DELETE, 'Delete'),
+    (RESTORE, 'Restore'),
+    (REASSIGN, 'Move to brand'),
+)
+
+
+def get_dashboard_queryset(queryset: QuerySet) -> QuerySet:
+    return queryset.select_related('brand').only(*DASHBOARD_FIELDS)
+
+
+def bulk_update_sneakers(queryset: QuerySet, action: str, user, brand: Brand | None = None) -> int:
+    """
+    Applies a bulk action to the sneakers in a queryset with a single
+    UPDATE, however many there are, and returns the number changed.
+    Sneakers the action would not change are left alone, so their
+    updated_at still validates cached responses.
+
+    update() bypasses save() and its signals, so the brands the sneakers
+    belonged to are read first, and they and the catalog are invalidated
+    here. Raises IntegrityError if a restored or moved sneaker would share
+    its brand and name with a live one.
+    """
+
+    now = timezone.now()
+
+    if action == DELETE:
+        queryset = queryset.filter(deleted=False)
+        values = {'deleted': True, 'deleted_at': now, 'deleted_by': user}
+    elif action == RESTORE:
+        queryset = queryset.filter(deleted=True)
+        values = {'deleted': False, 'deleted_at': None, 'deleted_by': None}
+    elif action == REASSIGN:
+        queryset = queryset.exclude(brand=brand)
+        values = {'brand': brand, 'last_updated_by': user}
+    else:
+        raise ValueError(f'Unknown action: {action}')
+
+    with transaction.atomic():
+        brand_ids = set(queryset.order_by().values_list('brand_id', flat=True).distinct())
+        updated = queryset.order_by().update(updated_at=now, **values)
+
+    if updated:
+        bump_catalog_version()
+        if brand is not None:
+            brand_ids.add(brand.pk)
+        for brand_id in brand_ids - {None}:
+            bump_brand_version(brand_id)
+
+    return updated
@@ -0,0 +1,176 @@
+import hashlib
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, QuerySet
+
+from sneakers.catalog import FRAGMENT_TIMEOUT, get_catalog_version
+from sneakers.likes import get_liked_version
+
+
+FACETS_KEY = 'catalog:facets:{version}:{digest}'
+# Values shown per facet, the most common first.
+FACET_LIMIT = 10
+
+# name: (label, column, label column)
+FACETS = {
+    'brand': ('Brand', 'brand_id', 'brand__name'),
+    'designer': ('Designer', 'designer', 'designer'),
+    'year_released': ('Year', 'year_released', 'year_released'),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FacetValue:
+    """
+    A filter value, the number of results it would give and the
+    querystring that applies it.
+    """
+
+    value: str
+    label: str
+    count: int
+    querystring: str
+
+
+@dataclass(frozen=True, slots=True)
+class Facet:
+    name: str
+    label: str
+    values: tuple[FacetValue, ...]
+
+
+def normalize_filters(cleaned_data: dict) -> str:
+    """
+    Returns the active filters in a canonical order, so equivalent
+    querystrings share a cache entry.
+    """
+
+    items = []
+    for name, value in sorted(cleaned_data.items()):
+        if value in (None, '', [], {}, ()):
+            continue
+        items.append(f'{name}={getattr(value, "pk", value)}')
+    return '&'.join(items)
+
+
+def _grouping_sets_counts(queryset: QuerySet) -> dict[str, list]:
+    """
+    Counts every facet in one scan of the filtered rows with GROUPING SETS.
+    """
+
+    columns = []
+    for _, column, label_column in FACETS.values():
+        columns += [column] if column == label_column else [column, label_column]
+
+    subquery = queryset.order_by().values(*columns).query
+    sql, params = subquery.sql_with_params()
+    aliases = {column: f'c{i}' for i, column in enumerate(columns)}
+    selected = ', '.join(f'facets.{alias}' for alias in aliases.values())
+    sets = ', '.join(
+        f'(facets.{aliases[column]}, facets.{aliases[label_column]})'
+        for _, column, label_column in FACETS.values()
+    )
+    grouping = ', '.join(f'facets.{aliases[column]}' for _, column, _ in FACETS.values())
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {selected}, GROUPING({grouping}), COUNT(*) "
+            f"FROM ({sql}) AS facets ({', '.join(aliases.values())}) "
+            f"GROUP BY GROUPING SETS ({sets})",
+            params,
+        )
+        rows = cursor.fetchall()
+
+    # GROUPING() sets a bit for each column not in the row's set, the first
+    # column being the highest bit.
+    counts = {name: [] for name in FACETS}
+    for row in rows:
+        grouping_bits, count = row[-2], row[-1]
+        values = dict(zip(columns, row))
+        for i, (name, (_, column, label_column)) in enumerate(FACETS.items()):
+            if not grouping_bits & (1 << (len(FACETS) - 1 - i)):
+                counts[name].append((values[column], values[label_column], count))
+    return counts
+
+
+def _grouped_counts(queryset: QuerySet) -> dict[str, list]:
+    """
+    Counts every facet from one query grouped on all the facet columns,
+    rolled up in Python, for databases without GROUPING SETS.
+    """
+
+    columns = list(dict.fromkeys(
+        column for _, column, label_column in FACETS.values() for column in (column, label_column)
+    ))
+    rows = queryset.order_by().values_list(*columns).annotate(count=Count('id'))
+
+    totals = {name: {} for name in FACETS}
+    for row in rows:
+        values = dict(zip(columns, row))
+        for name, (_, column, label_column) in FACETS.items():
+            key = (values[column], values[label_column])
+            totals[name][key] = totals[name].get(key, 0) + row[-1]
+
+    return {
+        name: [(value, label, count) for (value, label), count in values.items()]
+        for name, values in totals.items()
+    }
+
+
+def count_facets(queryset: QuerySet) -> dict[str, list]:
+    """
+    Returns each facet's (value, label, count) rows for the filtered
+    queryset, most common first.
+    """
+
+    if connection.vendor == 'postgresql':
+        counts = _grouping_sets_counts(queryset)
+    else:
+        counts = _grouped_counts(queryset)
+
+    return {
+        name: sorted(
+            [row for row in rows if row[0] is not None],
+            key=lambda row: (-row[2], str(row[1])),
+        )[:FACET_LIMIT]
+        for name, rows in counts.items()
+    }
+
+
+def get_facets(sneaker_filter, querystring_params) -> tuple[Facet, ...]:
+    """
+    Returns the facets of a bound SneakerFilter, with each value's count
+    for the current filters and the querystring that adds it. Counts are
+    cached per normalized filter combination under the catalog version,
+    so any catalog write invalidates them. Without filters that is a count
+    of the whole live catalog, a snapshot read once per catalog version.
+    """
+
+    if not sneaker_filter.is_valid():
+        return ()
+
+    filters = normalize_filters(sneaker_filter.form.cleaned_data)
+    if sneaker_filter.form.cleaned_data.get('liked'):
+        # Filtered to the user's likes, so the counts are theirs alone.
+        user = getattr(sneaker_filter.request, 'user', None)
+        filters += f'&user={getattr(user, "pk", None)}:{get_liked_version(user)}'
+    digest = hashlib.md5(filters.encode()).hexdigest()
+    key = FACETS_KEY.format(version=get_catalog_version(), digest=digest)
+
+    counts = cache.get(key)
+    if counts is None:
+        counts = count_facets(sneaker_filter.qs)
+        cache.set(key, counts, FRAGMENT_TIMEOUT)
+
+    facets = []
+    for name, (label, _, _) in FACETS.items():
+        values = []
+        for value, value_label, count in counts[name]:
+            params = querystring_params.copy()
+            params[name] = value
+            values.append(FacetValue(str(value), str(value_label), count, params.urlencode()))
+        facets.append(Facet(name, label, tuple(values)))
+
+    return tuple(facets)
@@ -1,13 +1,13 @@
 import django_filters
 
-from django.db.models import Q
-
 from sneakers.models import Sneaker
+from sneakers.search import search_sneakers
 
 
 class SneakerFilter(django_filters.FilterSet):
 
     search = django_filters.CharFilter(method='custom_search_filter', label='search')
+    liked = django_filters.BooleanFilter(method='liked_filter', label='liked')
 
     class Meta:
         model = Sneaker
@@ -19,8 +19,54 @@ class SneakerFilter(django_filters.FilterSet):
 
 
     def custom_search_filter(self, queryset, name, value):
-        return queryset.filter(
-            Q(name__icontains=value) |
-            Q(designer__icontains=value) |
-            Q(brand__name__icontains=value)
-        ).distinct()
\ No newline at end of file
+        return search_sneakers(queryset, value)
+
+
+    def liked_filter(self, queryset, name, value):
+        """
+        Filters to the requesting user's likes, joined on the unique
+        (user, sneaker) index. Anonymous users have no likes.
+        """
+
+        if not value:
+            return queryset
+
+        user = getattr(self.request, 'user', None)
+        if not getattr(user, 'is_authenticated', False):
+            return queryset.none()
+        return queryset.filter(likes__user=user)
+
+
+class DashboardFilter(django_filters.FilterSet):
+    """
+    Filters the management dashboard, which lists soft-deleted sneakers
+    too. Live sneakers are shown unless another status is chosen.
+    """
+
+    name = django_filters.CharFilter(lookup_expr='icontains', label='name')
+    status = django_filters.ChoiceFilter(
+        choices=(('deleted', 'Deleted'), ('all', 'All')),
+        empty_label='Live',
+        method='status_filter',
+        label='status',
+    )
+
+    class Meta:
+        model = Sneaker
+        fields = [
+            'brand',
+            'designer',
+            'year_released',
+        ]
+
+
+    def filter_queryset(self, queryset):
+        if not self.form.cleaned_data.get('status'):
+            queryset = queryset.filter(deleted=False)
+        return super().filter_queryset(queryset)
+
+
+    def status_filter(self, queryset, name, value):
+        if value == 'deleted':
+            return queryset.filter(deleted=True)
+        return queryset
@@ -1,9 +1,29 @@
 from django import forms
 
-from sneakers.models import Sneaker
+from sneakers.dashboard import ACTIONS, REASSIGN
+from sneakers.models import Brand, Comment, Sneaker
 
 
-class CreateSneakerForm(forms.ModelForm):
+class SneakerForm(forms.ModelForm):
+    """
+    Checks the live (brand, name) constraint, which model validation skips
+    as brand is not a field on these forms.
+    """
+
+    def clean_name(self):
+        name = self.cleaned_data['name']
+        brand_id = self.instance.brand_id
+
+        if brand_id is not None and Sneaker.objects.filter(
+            brand_id=brand_id,
+            name=name,
+        ).exclude(pk=self.instance.pk).exists():
+            raise forms.ValidationError('A sneaker of this brand already has this name.')
+
+        return name
+
+
+class CreateSneakerForm(SneakerForm):
     class Meta:
         model = Sneaker
         fields = (
@@ -16,7 +36,7 @@ class CreateSneakerForm(forms.ModelForm):
         )
 
 
-class UpdateSneakerForm(forms.ModelForm):
+class UpdateSneakerForm(SneakerForm):
     class Meta:
         model = Sneaker
         fields = (
@@ -29,10 +49,60 @@ class UpdateSneakerForm(forms.ModelForm):
         )
 
 
+class CommentForm(forms.ModelForm):
+    class Meta:
+        model = Comment
+        fields = (
+            'body',
+        )
+        widgets = {
+            'body': forms.Textarea(attrs={'rows': 3, 'placeholder': 'Add a comment'}),
+        }
+        labels = {
+            'body': 'Comment',
+        }
+
+
 class DeleteSneakerForm(forms.Form):
     """
     An empty form used on the delete confirmation page.
     No fields but can hold non-field errors that occur
     during the soft-delete process.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class UUIDListField(forms.Field):
+    """
+    A list of UUIDs, from checkboxes or hidden inputs sharing a name.
+    """
+
+    widget = forms.MultipleHiddenInput
+
+
+    def to_python(self, value) -> list:
+        uuid_field = forms.UUIDField()
+        return [uuid_field.clean(item) for item in value or []]
+
+
+class BulkSneakerForm(forms.Form):
+    """
+    A bulk action on the sneakers ticked in the dashboard, or on every
+    sneaker matching its filters.
+    """
+
+    action = forms.ChoiceField(choices=ACTIONS)
+    ids = UUIDListField(required=False)
+    select_all = forms.BooleanField(required=False, label='All matching sneakers')
+    brand = forms.ModelChoiceField(queryset=Brand.objects.order_by('name').only('id', 'name'), required=False)
+
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        if not cleaned_data.get('select_all') and not cleaned_data.get('ids'):
+            raise forms.ValidationError('Select at least one sneaker.')
+        if cleaned_data.get('action') == REASSIGN and not cleaned_data.get('brand'):
+            self.add_error('brand', 'Choose the brand to move the sneakers to.')
+
+        return cleaned_data
@@ -0,0 +1,100 @@
+import io
+import os
+import logging
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from django.core.files.base import ContentFile
+
+
+logger = logging.getLogger('general')
+
+VARIANT_WIDTHS = (320, 640, 1024)
+WEBP = 'webp'
+JPEG = 'jpeg'
+QUALITY = 80
+
+
+def variant_path(name: str, width: int, extension: str) -> str:
+    """
+    Derives a variant's path from the original's, keeping it beside it.
+    Example: sneakers/2025/07/14/air-jordan-1-a1b2c3d4-640w.webp
+    """
+
+    base = os.path.splitext(name)[0]
+    return f'{base}-{width}w.{extension}'
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """
+    Converts an image to RGB for JPEG, placing any transparency on white.
+    """
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_variants(image_file, storage) -> list[dict]:
+    """
+    Writes WebP and JPEG copies of an image at each variant width narrower
+    than the original, and returns their metadata. The original is never
+    upscaled. Returns an empty list if the file is not a readable image.
+    """
+
+    try:
+        image_file.open('rb')
+        with Image.open(image_file) as original:
+            original = ImageOps.exif_transpose(original)
+            original.load()
+    except (OSError, UnidentifiedImageError, ValueError) as e:
+        logger.warning(f"Could not read image {image_file.name}: {e}")
+        return []
+    finally:
+        image_file.close()
+
+    variants = []
+
+    for width in VARIANT_WIDTHS:
+        if width >= original.width:
+            break
+
+        height = round(original.height * width / original.width)
+        resized = original.resize((width, height), Image.Resampling.LANCZOS)
+
+        encodings = (
+            (WEBP, 'WEBP', resized if resized.mode in ('RGB', 'RGBA') else resized.convert('RGBA')),
+            (JPEG, 'JPEG', _flatten(resized)),
+        )
+
+        for extension, pillow_format, converted in encodings:
+            buffer = io.BytesIO()
+            converted.save(buffer, pillow_format, quality=QUALITY, optimize=True)
+
+            name = storage.save(
+                variant_path(image_file.name, width, extension),
+                ContentFile(buffer.getvalue()),
+            )
+            variants.append({
+                'name': name,
+                'format': extension,
+                'width': width,
+                'height': height,
+            })
+
+    return variants
+
+
+def build_srcset(variants: list[dict], extension: str, storage) -> str:
+    """
+    Builds an img/source srcset attribute from variant metadata.
+    """
+
+    return ', '.join(
+        f"{storage.url(variant['name'])} {variant['width']}w"
+        for variant in variants
+        if variant['format'] == extension
+    )
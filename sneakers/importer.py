@@ -0,0 +1,265 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+from django.db import connection, transaction
+
+from sneakers.catalog import bump_brand_version, bump_catalog_version
+from sneakers.export import NDJSON
+from sneakers.models import Brand, Sneaker
+from sneakers.validators import validate_filetype
+
+
+BATCH_SIZE = 5000
+# Separates related sneaker names in a CSV cell.
+RELATED_SEPARATOR = '|'
+
+# resource: (model, imported columns)
+RESOURCES = {
+    'brands': (Brand, ['name', 'description', 'country', 'year_founded']),
+    'sneakers': (Sneaker, ['brand', 'name', 'summary', 'designer', 'year_released', 'primary_image', 'related_sneakers']),
+}
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+
+def read_rows(f, import_format: str):
+    """
+    Yields (line number, row dict) pairs from NDJSON or CSV text. In CSV,
+    related sneaker names are separated by RELATED_SEPARATOR.
+    """
+
+    if import_format == NDJSON:
+        for line_number, line in enumerate(f, start=1):
+            if line.strip():
+                yield line_number, json.loads(line)
+        return
+
+    # The header is line 1.
+    for line_number, row in enumerate(csv.DictReader(f), start=2):
+        related = row.get('related_sneakers')
+        if related is not None:
+            row['related_sneakers'] = [name.strip() for name in related.split(RELATED_SEPARATOR) if name.strip()]
+        yield line_number, {key: value if value != '' else None for key, value in row.items()}
+
+
+def clean_row(resource: str, row: dict) -> dict:
+    """
+    Validates a row with its model fields' own rules, e.g. year bounds and
+    the image filetype, and returns the cleaned values. Raises
+    ValidationError with the errors by column.
+    """
+
+    model, columns = RESOURCES[resource]
+    cleaned = {}
+    errors = {}
+
+    for column in columns:
+        value = row.get(column)
+        try:
+            if column == 'brand':
+                if not value:
+                    raise ValidationError('A brand name is required.')
+            elif column == 'related_sneakers':
+                if value is not None and not isinstance(value, list):
+                    raise ValidationError('Must be a list of sneaker names.')
+            elif column == 'primary_image':
+                # A path in storage, so the file itself is not read here.
+                if value:
+                    validate_filetype(File(None, name=value))
+            else:
+                model_field = model._meta.get_field(column)
+                if value is None and not model_field.null and model_field.empty_strings_allowed:
+                    value = ''
+                value = model_field.clean(value, None)
+        except ValidationError as e:
+            errors[column] = e.messages
+        cleaned[column] = value
+
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+
+def _staging_columns(resource: str) -> str:
+    if resource == 'brands':
+        return 'line integer, name text, description text, country text, year_founded integer'
+    return (
+        'line integer, brand text, name text, summary text, designer text, '
+        'year_released integer, primary_image text, related_sneakers text[]'
+    )
+
+
+def _copy_rows(cursor, resource: str, rows, result: ImportResult, batch_size: int):
+    """
+    Validates rows a batch at a time and COPYs the valid ones into the
+    staging table, so only one batch is held in memory.
+    """
+
+    columns = ['line', *RESOURCES[resource][1]]
+
+    with cursor.copy(f"COPY import_{resource} ({', '.join(columns)}) FROM STDIN") as copy:
+        while batch := list(islice(rows, batch_size)):
+            for line_number, row in batch:
+                result.rows += 1
+                try:
+                    cleaned = clean_row(resource, row)
+                except ValidationError as e:
+                    result.errors.append((line_number, '; '.join(
+                        f'{column}: {" ".join(messages)}' for column, messages in e.message_dict.items()
+                    )))
+                    continue
+                copy.write_row([line_number, *cleaned.values()])
+
+
+def _upsert_brands(cursor) -> list[tuple]:
+    """
+    Inserts new brands and updates changed ones, matched by name. The last
+    row wins if a name appears twice. Unchanged brands are left alone, so
+    their updated_at still validates cached responses.
+    """
+
+    cursor.execute(f"""
+        INSERT INTO {Brand._meta.db_table} (id, created_at, updated_at, name, description, country, year_founded)
+        SELECT DISTINCT ON (name) gen_random_uuid(), now(), now(), name, description, country, year_founded
+        FROM import_brands
+        ORDER BY name, line DESC
+        ON CONFLICT (name) DO UPDATE SET
+            description = EXCLUDED.description,
+            country = EXCLUDED.country,
+            year_founded = EXCLUDED.year_founded,
+            updated_at = now()
+        WHERE ({Brand._meta.db_table}.description, {Brand._meta.db_table}.country, {Brand._meta.db_table}.year_founded)
+            IS DISTINCT FROM (EXCLUDED.description, EXCLUDED.country, EXCLUDED.year_founded)
+        RETURNING id, xmax = 0
+    """)
+    return cursor.fetchall()
+
+
+def _upsert_sneakers(cursor, result: ImportResult) -> list[tuple]:
+    """
+    Inserts new live sneakers and updates changed ones, matched by brand
+    and name. Rows naming an unknown brand are reported as errors. A new
+    image clears the variants, for generate_image_variants to render.
+    """
+
+    table = Sneaker._meta.db_table
+    brand_table = Brand._meta.db_table
+
+    cursor.execute(f"""
+        SELECT line, brand FROM import_sneakers s
+        WHERE NOT EXISTS (SELECT 1 FROM {brand_table} b WHERE b.name = s.brand)
+        ORDER BY line
+    """)
+    result.errors.extend((line, f"brand: '{brand}' does not exist.") for line, brand in cursor.fetchall())
+
+    cursor.execute(f"""
+        INSERT INTO {table} (
+            id, created_at, updated_at, brand_id, name, summary, designer,
+            year_released, primary_image, image_variants, deleted
+        )
+        SELECT DISTINCT ON (b.id, s.name)
+            gen_random_uuid(), now(), now(), b.id, s.name, s.summary, s.designer,
+            s.year_released, s.primary_image, '[]'::jsonb, false
+        FROM import_sneakers s
+        JOIN {brand_table} b ON b.name = s.brand
+        ORDER BY b.id, s.name, s.line DESC
+        ON CONFLICT (brand_id, name) WHERE NOT deleted DO UPDATE SET
+            summary = EXCLUDED.summary,
+            designer = EXCLUDED.designer,
+            year_released = EXCLUDED.year_released,
+            primary_image = EXCLUDED.primary_image,
+            image_variants = CASE
+                WHEN {table}.primary_image IS DISTINCT FROM EXCLUDED.primary_image THEN '[]'::jsonb
+                ELSE {table}.image_variants
+            END,
+            updated_at = now()
+        WHERE ({table}.summary, {table}.designer, {table}.year_released, {table}.primary_image)
+            IS DISTINCT FROM (EXCLUDED.summary, EXCLUDED.designer, EXCLUDED.year_released, EXCLUDED.primary_image)
+        RETURNING brand_id, xmax = 0
+    """)
+    return cursor.fetchall()
+
+
+def _link_related_sneakers(cursor):
+    """
+    Replaces the related sneakers of every row that lists them, resolving
+    names in one statement. A name shared across brands resolves to the
+    sneaker of the same brand. Links are stored in both directions, as
+    the relation is symmetrical.
+    """
+
+    table = Sneaker._meta.db_table
+    through_table = Sneaker.related_sneakers.through._meta.db_table
+
+    cursor.execute(f"""
+        CREATE TEMP TABLE import_related ON COMMIT DROP AS
+        SELECT DISTINCT ON (src.id, related.name) src.id AS from_id, target.id AS to_id
+        FROM import_sneakers s
+        JOIN {Brand._meta.db_table} b ON b.name = s.brand
+        JOIN {table} src ON src.brand_id = b.id AND src.name = s.name AND NOT src.deleted
+        CROSS JOIN LATERAL unnest(s.related_sneakers) AS related(name)
+        JOIN {table} target ON target.name = related.name AND NOT target.deleted AND target.id <> src.id
+        WHERE s.related_sneakers IS NOT NULL
+        ORDER BY src.id, related.name, target.brand_id = src.brand_id DESC
+    """)
+    cursor.execute(f"""
+        DELETE FROM {through_table} existing
+        USING (
+            SELECT src.id FROM import_sneakers s
+            JOIN {Brand._meta.db_table} b ON b.name = s.brand
+            JOIN {table} src ON src.brand_id = b.id AND src.name = s.name AND NOT src.deleted
+            WHERE s.related_sneakers IS NOT NULL
+        ) replaced
+        WHERE existing.from_sneaker_id = replaced.id OR existing.to_sneaker_id = replaced.id
+    """)
+    cursor.execute(f"""
+        INSERT INTO {through_table} (from_sneaker_id, to_sneaker_id)
+        SELECT from_id, to_id FROM import_related
+        UNION
+        SELECT to_id, from_id FROM import_related
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def import_catalog(resource: str, rows, batch_size: int = BATCH_SIZE) -> ImportResult:
+    """
+    Loads (line number, row) pairs from read_rows into the catalog. Valid
+    rows are COPYed into a temporary staging table, then upserted into the
+    real table in the same transaction, so a failed import changes nothing.
+    Invalid rows are skipped and returned as errors. Requires PostgreSQL.
+    """
+
+    result = ImportResult()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TEMP TABLE import_{resource} ({_staging_columns(resource)}) ON COMMIT DROP')
+        _copy_rows(cursor, resource, iter(rows), result, batch_size)
+        cursor.execute(f'ANALYZE import_{resource}')
+
+        # Each returned row is a (brand id, inserted) pair.
+        if resource == 'brands':
+            returned = _upsert_brands(cursor)
+        else:
+            returned = _upsert_sneakers(cursor, result)
+            _link_related_sneakers(cursor)
+
+    result.inserted = sum(1 for _, inserted in returned if inserted)
+    result.updated = len(returned) - result.inserted
+    result.errors.sort()
+
+    # The upsert bypasses save() and its signals, so invalidate here.
+    bump_catalog_version()
+    for brand_id in {brand_id for brand_id, _ in returned}:
+        bump_brand_version(brand_id)
+
+    return result
@@ -0,0 +1,63 @@
+import time
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from sneakers.catalog import FRAGMENT_TIMEOUT
+from sneakers.models import Like
+
+
+LIKED_KEY = 'likes:user:{user_id}'
+
+
+def _get_liked(user) -> tuple[int, frozenset[str]]:
+    """
+    Returns a version and the ids of the sneakers a user likes, from the
+    cache, loading them with one query on a miss. Memoized on the user for
+    the rest of the request. The version changes whenever the set does.
+    """
+
+    if not getattr(user, 'is_authenticated', False):
+        return 0, frozenset()
+
+    if '_liked' not in user.__dict__:
+        key = LIKED_KEY.format(user_id=user.pk)
+        liked = cache.get(key)
+        if liked is None:
+            ids = Like.objects.filter(user=user).values_list('sneaker_id', flat=True)
+            liked = (time.time_ns(), frozenset(str(sneaker_id) for sneaker_id in ids))
+            cache.set(key, liked, FRAGMENT_TIMEOUT)
+        user.__dict__['_liked'] = liked
+
+    return user.__dict__['_liked']
+
+
+def get_liked_ids(user) -> frozenset[str]:
+    return _get_liked(user)[1]
+
+
+def get_liked_version(user) -> int:
+    return _get_liked(user)[0]
+
+
+def invalidate_liked(user_id):
+    cache.delete(LIKED_KEY.format(user_id=user_id))
+
+
+def toggle_like(user, sneaker) -> bool:
+    """
+    Likes a Sneaker, or removes the like if there is one. Returns whether
+    the user now likes it.
+    """
+
+    deleted, _ = Like.objects.filter(user=user, sneaker=sneaker).delete()
+    if deleted:
+        return False
+
+    try:
+        with transaction.atomic():
+            Like.objects.create(user=user, sneaker=sneaker)
+    except IntegrityError:
+        # Liked by a concurrent request.
+        pass
+    return True
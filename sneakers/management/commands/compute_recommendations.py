@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sneakers.recommendations import TOP_K, rebuild_recommendations
+from sneakers.tasks import recompute_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the recommended sneakers shown on each detail page.'
+
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K, help='Recommendations kept per sneaker.')
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue the recomputation for the job worker instead of running it here.',
+        )
+
+
+    def handle(self, *args, **options):
+        if options['enqueue']:
+            recompute_recommendations.enqueue(top_k=options['top_k'])
+            self.stdout.write(self.style.SUCCESS('Queued recommendations recomputation.'))
+            return
+
+        start = time.perf_counter()
+        written = rebuild_recommendations(options['top_k'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} recommendations in {time.perf_counter() - start:.1f}s.'
+        ))
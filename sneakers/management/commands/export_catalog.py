@@ -0,0 +1,55 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sneakers.export import FORMATS, RESOURCES, parse_updated_since, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Streams live brands or sneakers as NDJSON or CSV, to a file or stdout.'
+
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resource', choices=RESOURCES, default='sneakers')
+        parser.add_argument('--format', choices=FORMATS, default='ndjson', dest='export_format')
+        parser.add_argument(
+            '--updated-since',
+            help='Only export rows updated at or after this ISO date or datetime.',
+        )
+        parser.add_argument('--output', help='File to write to, stdout by default.')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output.')
+
+
+    def handle(self, *args, **options):
+        updated_since = None
+        if options['updated_since']:
+            try:
+                updated_since = parse_updated_since(options['updated_since'])
+            except ValueError as e:
+                raise CommandError(e)
+
+        lines = stream_export(options['resource'], options['export_format'], updated_since)
+
+        if options['output']:
+            open_output = gzip.open if options['gzip'] else open
+            f = open_output(options['output'], 'wt', encoding='utf-8', newline='')
+        elif options['gzip']:
+            f = gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8', newline='')
+        else:
+            f = None
+
+        count = 0
+        try:
+            for line in lines:
+                if f is None:
+                    self.stdout.write(line, ending='')
+                else:
+                    f.write(line)
+                count += 1
+        finally:
+            if f is not None:
+                f.close()
+
+        if options['output']:
+            self.stderr.write(f"Exported {count} lines to {options['output']}.")
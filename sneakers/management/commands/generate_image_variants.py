@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from sneakers.models import Sneaker
+from sneakers.tasks import refresh_image_variants
+
+
+class Command(BaseCommand):
+    help = 'Generates resized image variants for sneakers that are missing them.'
+
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenerate variants for every sneaker, not just those missing them.',
+        )
+
+
+    def handle(self, *args, **options):
+        sneakers = Sneaker.all_with_deleted.exclude(primary_image='').exclude(primary_image__isnull=True)
+        if not options['all']:
+            sneakers = sneakers.filter(image_variants=[])
+
+        count = 0
+        for sneaker in sneakers.iterator():
+            if refresh_image_variants(sneaker):
+                count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {count} sneakers.'))
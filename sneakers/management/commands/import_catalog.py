@@ -0,0 +1,60 @@
+import gzip
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from sneakers.export import FORMATS
+from sneakers.importer import BATCH_SIZE, RESOURCES, import_catalog, read_rows
+
+
+# Errors listed individually, the rest are only counted.
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = 'Upserts brands or sneakers from NDJSON or CSV, via COPY into a staging table. Requires PostgreSQL.'
+
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="File to read, '-' for stdin. Files ending in .gz are decompressed.")
+        parser.add_argument('--resource', choices=RESOURCES, default='sneakers')
+        parser.add_argument('--format', choices=FORMATS, default='ndjson', dest='import_format')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('import_catalog requires PostgreSQL.')
+
+        path = options['input']
+        if path == '-':
+            f = sys.stdin
+        elif path.endswith('.gz'):
+            f = gzip.open(path, 'rt', encoding='utf-8', newline='')
+        else:
+            f = open(path, encoding='utf-8', newline='')
+
+        start = time.perf_counter()
+        try:
+            rows = read_rows(f, options['import_format'])
+            result = import_catalog(options['resource'], rows, batch_size=options['batch_size'])
+        except ValueError as e:
+            # Malformed JSON or CSV, the transaction has been rolled back.
+            raise CommandError(f'Could not read {path}: {e}')
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+        for line_number, message in result.errors[:MAX_REPORTED_ERRORS]:
+            self.stderr.write(f'Line {line_number}: {message}')
+        if len(result.errors) > MAX_REPORTED_ERRORS:
+            self.stderr.write(f'... and {len(result.errors) - MAX_REPORTED_ERRORS} more errors.')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {result.rows} rows in {time.perf_counter() - start:.1f}s: {result.inserted} inserted, "
+            f"{result.updated} updated, {len(result.errors)} skipped."
+        ))
+        if options['resource'] == 'sneakers' and result.inserted + result.updated:
+            self.stdout.write('Run generate_image_variants to render variants of new images.')
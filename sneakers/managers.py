@@ -0,0 +1,12 @@
+from django.db import models
+
+
+class LiveSneakerManager(models.Manager):
+    """
+    Default Sneaker manager, serving only rows that are not soft-deleted.
+    Every query it builds carries 'deleted = false', which matches the
+    partial indexes on Sneaker.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted=False)
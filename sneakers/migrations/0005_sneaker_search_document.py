@@ -0,0 +1,81 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:53
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+SEARCH_TRIGGERS_SQL = """
+CREATE FUNCTION sneakers_sneaker_search_update() RETURNS trigger AS $$
+DECLARE
+    brand_name text;
+BEGIN
+    SELECT name INTO brand_name FROM sneakers_brand WHERE id = NEW.brand_id;
+    NEW.search_document :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(brand_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.designer, '')), 'C');
+    NEW.search_text := lower(concat_ws(' ', NEW.name, NEW.designer, brand_name));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER sneakers_sneaker_search_trigger
+    BEFORE INSERT OR UPDATE OF name, designer, brand_id ON sneakers_sneaker
+    FOR EACH ROW EXECUTE FUNCTION sneakers_sneaker_search_update();
+
+CREATE FUNCTION sneakers_brand_search_update() RETURNS trigger AS $$
+BEGIN
+    IF NEW.name IS DISTINCT FROM OLD.name THEN
+        UPDATE sneakers_sneaker SET brand_id = brand_id WHERE brand_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER sneakers_brand_search_trigger
+    AFTER UPDATE OF name ON sneakers_brand
+    FOR EACH ROW EXECUTE FUNCTION sneakers_brand_search_update();
+
+UPDATE sneakers_sneaker SET brand_id = brand_id;
+"""
+
+DROP_SEARCH_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS sneakers_brand_search_trigger ON sneakers_brand;
+DROP FUNCTION IF EXISTS sneakers_brand_search_update();
+DROP TRIGGER IF EXISTS sneakers_sneaker_search_trigger ON sneakers_sneaker;
+DROP FUNCTION IF EXISTS sneakers_sneaker_search_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sneakers', '0004_sneaker_created_by_sneaker_deleted_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='sneaker',
+            name='search_document',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='sneaker',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='sneaker_search_document_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='sneaker_search_text_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGERS_SQL, DROP_SEARCH_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sneakers', '0005_sneaker_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='brand',
+            index=models.Index(fields=['name', 'id'], name='brand_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(fields=['name', 'id'], name='sneaker_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(fields=['brand', 'name', 'id'], name='sneaker_brand_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(fields=['designer', 'name', 'id'], name='sneaker_designer_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(fields=['year_released', 'name', 'id'], name='sneaker_year_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(fields=['updated_at', 'name', 'id'], name='sneaker_updated_name_idx'),
+        ),
+    ]
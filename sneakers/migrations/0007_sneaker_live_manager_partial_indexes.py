@@ -0,0 +1,72 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:58
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sneakers', '0006_api_ordering_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='sneaker',
+            name='sneaker_search_document_gin',
+        ),
+        migrations.RemoveIndex(
+            model_name='sneaker',
+            name='sneaker_search_text_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='sneaker',
+            name='sneaker_name_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sneaker',
+            name='sneaker_brand_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sneaker',
+            name='sneaker_designer_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sneaker',
+            name='sneaker_year_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='sneaker',
+            name='sneaker_updated_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('deleted', False)), fields=['search_document'], name='sneaker_search_document_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('deleted', False)), fields=['search_text'], name='sneaker_search_text_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['name', 'id'], name='sneaker_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['brand', 'name', 'id'], name='sneaker_brand_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['designer', 'name', 'id'], name='sneaker_designer_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['year_released', 'name', 'id'], name='sneaker_year_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sneaker',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['updated_at', 'name', 'id'], name='sneaker_updated_name_idx'),
+        ),
+    ]
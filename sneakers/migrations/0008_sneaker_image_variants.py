@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sneakers', '0007_sneaker_live_manager_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sneaker',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
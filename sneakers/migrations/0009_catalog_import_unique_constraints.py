@@ -0,0 +1,67 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:21
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def dedupe_catalog(apps, schema_editor):
+    """
+    Makes existing rows satisfy the new constraints without losing any.
+    Brands sharing a name keep the oldest as is and number the others, e.g.
+    'Nike (2)'. Live sneakers sharing a brand and name keep the most
+    recently updated live, and the others are soft-deleted, so they can be
+    reviewed and restored under a new name. Sneakers without a brand are
+    left alone, as the constraint treats NULL brands as distinct. Every
+    rename and soft-delete is printed.
+    """
+
+    Brand = apps.get_model('sneakers', 'Brand')
+    Sneaker = apps.get_model('sneakers', 'Sneaker')
+    name_length = Brand._meta.get_field('name').max_length
+
+    duplicate_names = Brand.objects.values('name').annotate(count=Count('id')).filter(count__gt=1)
+    for row in duplicate_names:
+        brands = Brand.objects.filter(name=row['name']).order_by('created_at', 'id')
+        for number, brand in enumerate(brands[1:], start=2):
+            suffix = f' ({number})'
+            brand.name = f'{row["name"][:name_length - len(suffix)]}{suffix}'
+            brand.save(update_fields=['name'])
+            print(f'  Renamed brand {brand.pk} from {row["name"]!r} to {brand.name!r}.')
+
+    now = timezone.now()
+    duplicate_sneakers = Sneaker.objects.filter(
+        deleted=False,
+        brand_id__isnull=False,
+    ).values('brand_id', 'name').annotate(count=Count('id')).filter(count__gt=1)
+    for row in duplicate_sneakers:
+        sneakers = Sneaker.objects.filter(
+            deleted=False,
+            brand_id=row['brand_id'],
+            name=row['name'],
+        ).order_by('-updated_at', '-id')
+        kept, *duplicates = [sneaker.pk for sneaker in sneakers]
+        Sneaker.objects.filter(pk__in=duplicates).update(deleted=True, deleted_at=now, updated_at=now)
+        for pk in duplicates:
+            print(f'  Soft-deleted sneaker {pk}, a duplicate of {row["name"]!r} ({kept}).')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sneakers', '0008_sneaker_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_catalog, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='brand',
+            constraint=models.UniqueConstraint(fields=('name',), name='brand_name_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='sneaker',
+            constraint=models.UniqueConstraint(condition=models.Q(('deleted', False)), fields=('brand', 'name'), name='sneaker_brand_name_live_unique'),
+        ),
+    ]
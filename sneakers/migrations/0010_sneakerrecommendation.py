@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sneakers', '0009_catalog_import_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SneakerRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('curated', models.BooleanField(default=False)),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sneakers.sneaker')),
+                ('sneaker', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='sneakers.sneaker')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('sneaker', 'rank'), name='recommendation_sneaker_rank_unique')],
+            },
+        ),
+    ]
@@ -3,12 +3,16 @@ from typing import TYPE_CHECKING
 import logging
 
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
 
 from core.utils import get_current_year
+from sneakers.images import JPEG, WEBP, build_srcset
+from sneakers.managers import LiveSneakerManager
 from sneakers.validators import validate_filetype, validate_filesize
 
 
@@ -40,10 +44,25 @@ class Brand(models.Model):
     )
 
 
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name', 'id'], name='brand_name_id_idx'),
+        ]
+        # The conflict target of `import_catalog` upserts.
+        constraints = [
+            models.UniqueConstraint(fields=['name'], name='brand_name_unique'),
+        ]
+
+
     def __str__(self):
         return self.name
 
 
+# Partial index predicate, so indexes only cover rows that are not soft-deleted.
+LIVE = models.Q(deleted=False)
+
+
 class Sneaker(models.Model):
 
     def _generate_file_path(self, filename: str) -> str:
@@ -114,6 +133,12 @@ class Sneaker(models.Model):
         null=True,
         blank=True
     )
+    # Resized WebP and JPEG copies of primary_image, see sneakers/images.py.
+    image_variants = models.JSONField(default=list, blank=True, editable=False)
+    # Maintained by sneakers/signals.py as Likes are added and removed.
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by sneakers/signals.py as Comments are added and removed.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
@@ -125,14 +150,77 @@ class Sneaker(models.Model):
         related_name='sneakers_deleted'
     )    
 
+    # Maintained by database triggers from name, designer and brand name.
+    search_document = SearchVectorField(null=True, editable=False)
+    search_text = models.TextField(null=True, blank=True, editable=False)
+
+    objects = LiveSneakerManager()
+    all_with_deleted = models.Manager()
+
 
     class Meta:
         verbose_name = 'Sneaker'
         verbose_name_plural = 'Sneakers'
+        # Each index serves a filter followed by the (name, id) keyset order
+        # used by query_view, the API and the home page snapshot. Plans are
+        # checked by sneakers/tests/test_query_plans.py.
+        indexes = [
+            # ?search=
+            GinIndex(fields=['search_document'], name='sneaker_search_document_gin', condition=LIVE),
+            GinIndex(fields=['search_text'], opclasses=['gin_trgm_ops'], name='sneaker_search_text_trgm', condition=LIVE),
+            # No filter, ordered by name.
+            models.Index(fields=['name', 'id'], name='sneaker_name_id_idx', condition=LIVE),
+            # ?brand=, BrandViewSet.sneakers and the home page snapshot.
+            models.Index(fields=['brand', 'name', 'id'], name='sneaker_brand_name_idx', condition=LIVE),
+            # ?designer=
+            models.Index(fields=['designer', 'name', 'id'], name='sneaker_designer_name_idx', condition=LIVE),
+            # ?year_released= and API ?ordering=year_released.
+            models.Index(fields=['year_released', 'name', 'id'], name='sneaker_year_name_idx', condition=LIVE),
+            # API ?ordering=updated_at.
+            models.Index(fields=['updated_at', 'name', 'id'], name='sneaker_updated_name_idx', condition=LIVE),
+        ]
+        # The conflict target of `import_catalog` upserts.
+        constraints = [
+            models.UniqueConstraint(fields=['brand', 'name'], name='sneaker_brand_name_live_unique', condition=LIVE),
+        ]
+
+
+    _loaded_values = {}
 
 
     def __str__(self):
         return self.name
+
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Records the brand and image the Sneaker was loaded with, so a save
+        that moves it to another brand can invalidate both, and a save that
+        replaces its image can regenerate the variants.
+        """
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            'brand_id': instance.__dict__.get('brand_id'),
+            'primary_image': instance.__dict__.get('primary_image'),
+        }
+        return instance
+
+
+    @property
+    def image_url(self) -> str:
+        return self.primary_image.url if self.primary_image else ''
+
+
+    @property
+    def image_srcset(self) -> str:
+        return build_srcset(self.image_variants, JPEG, self.primary_image.storage)
+
+
+    @property
+    def image_webp_srcset(self) -> str:
+        return build_srcset(self.image_variants, WEBP, self.primary_image.storage)
     
 
     def soft_delete(self, deleted_by:'CustomUser') -> tuple[bool, str]:
@@ -150,3 +238,114 @@ class Sneaker(models.Model):
             logger.error(f"Error soft-deleting Sneaker {self.id}: {e}", exc_info=True)
             return (False, f'An unexpected error occurred when deleting {self.name}.')
 
+
+
+class SneakerRecommendation(models.Model):
+    """
+    A precomputed neighbour of a Sneaker, ranked from 0. Rewritten in bulk
+    by sneakers/recommendations.py, curated related_sneakers first.
+    """
+
+    # The unique (sneaker, rank) index serves lookups, so no separate index.
+    sneaker = models.ForeignKey(
+        Sneaker,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        db_index=False,
+    )
+    recommended = models.ForeignKey(
+        Sneaker,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    curated = models.BooleanField(default=False)
+
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['sneaker', 'rank'], name='recommendation_sneaker_rank_unique'),
+        ]
+
+
+    def __str__(self):
+        return f'{self.sneaker_id} #{self.rank}: {self.recommended_id}'
+
+
+class Like(models.Model):
+    """
+    A user's like of a Sneaker. Sneaker.like_count and the user's cached
+    liked set are kept up to date by sneakers/signals.py.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # The unique (user, sneaker) index serves a user's likes, so no separate index.
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name='likes',
+        db_index=False,
+    )
+    sneaker = models.ForeignKey(
+        Sneaker,
+        on_delete=models.CASCADE,
+        related_name='likes',
+    )
+
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'sneaker'], name='like_user_sneaker_unique'),
+        ]
+
+
+    def __str__(self):
+        return f'{self.user_id} likes {self.sneaker_id}'
+
+
+class Comment(models.Model):
+    """
+    A user's comment on a Sneaker, listed newest first. Sneaker.comment_count
+    and the sneaker's comment fragment version are kept up to date by
+    sneakers/signals.py.
+    """
+
+    id = models.UUIDField(
+        default=uuid.uuid4,
+        primary_key=True,
+        unique=True,
+        editable=False,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name='comments',
+    )
+    # The (sneaker, created_at, id) index serves lookups, so no separate index.
+    sneaker = models.ForeignKey(
+        Sneaker,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        db_index=False,
+    )
+    # Short enough for the covering index's tuple size limit.
+    body = models.TextField(max_length=500)
+
+
+    class Meta:
+        # Serves the keyset pages of a sneaker's comments, see
+        # sneakers/comments.py. Including the columns a page shows makes
+        # each page an index only scan, however many comments there are.
+        indexes = [
+            models.Index(
+                fields=['sneaker', '-created_at', '-id'],
+                include=['user', 'body'],
+                name='comment_sneaker_created_idx',
+            ),
+        ]
+
+
+    def __str__(self):
+        return f'{self.user_id} on {self.sneaker_id}'
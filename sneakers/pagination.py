@@ -0,0 +1,165 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q, QuerySet
+
+
+@dataclass
+class KeysetPage:
+    """
+    A page of results plus the cursor that resumes after its last item.
+    """
+
+    items: list
+    next_cursor: str | None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(values: list) -> str:
+    data = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def _is_scalar(value) -> bool:
+    return isinstance(value, (str, int, float, bool)) or value is None
+
+
+def decode_cursor(cursor: str) -> list | None:
+    """
+    Decodes a cursor, returning None if it has been tampered with.
+    """
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        return None
+
+    if not isinstance(values, list) or not all(_is_scalar(value) for value in values):
+        return None
+    return values
+
+
+def _nullable_fields(queryset: QuerySet, ordering: list[str]) -> set[str]:
+    """
+    Returns the ordering's model fields that allow NULL. Annotations, such
+    as a search rank, are never NULL.
+    """
+
+    nullable = set()
+    for field in ordering:
+        name = field.lstrip('-')
+        try:
+            if queryset.model._meta.get_field(name).null:
+                nullable.add(name)
+        except FieldDoesNotExist:
+            pass
+    return nullable
+
+
+def _order_by(ordering: list[str], nullable: set[str]) -> list:
+    """
+    Sorts NULLs last in either direction, so the keyset filter for a
+    nullable field is the same whichever way it is ordered.
+    """
+
+    expressions = []
+    for field in ordering:
+        name = field.lstrip('-')
+        if name not in nullable:
+            expressions.append(field)
+        elif field.startswith('-'):
+            expressions.append(F(name).desc(nulls_last=True))
+        else:
+            expressions.append(F(name).asc(nulls_last=True))
+    return expressions
+
+
+def _after_position(ordering: list[str], values: list, nullable: set[str] = frozenset()) -> Q:
+    """
+    Builds the lexicographic 'row comes after values' filter for an ordering,
+    e.g. for ('name', 'id'): name > a OR (name = a AND id > b). NULLs sort
+    last, so they come after any value of a nullable field, and nothing but
+    other NULLs comes after a NULL.
+    """
+
+    clauses = []
+    equal = Q()
+
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+
+        if value is not None:
+            after = Q(**{f'{name}__{lookup}': value})
+            if name in nullable:
+                after |= Q(**{f'{name}__isnull': True})
+            clauses.append(equal & after)
+
+        equal &= Q(**{name: value}) if value is not None else Q(**{f'{name}__isnull': True})
+
+    if not clauses:
+        # Every value NULL, which the unique last field rules out.
+        raise ValueError('A cursor needs a value for the last field.')
+    return reduce(or_, clauses)
+
+
+def _json_value(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def paginate_keyset(
+    queryset: QuerySet,
+    ordering: list[str],
+    cursor: str | None,
+    page_size: int,
+) -> KeysetPage:
+    """
+    Returns the page of `queryset` that follows `cursor`. The ordering must
+    end with a unique field so every row has a distinct position. Each page
+    is a single indexed range scan, however deep into the results it is.
+    """
+
+    nullable = _nullable_fields(queryset, ordering)
+    queryset = queryset.order_by(*_order_by(ordering, nullable))
+
+    values = decode_cursor(cursor) if cursor else None
+    if values is not None and len(values) == len(ordering):
+        try:
+            queryset = queryset.filter(_after_position(ordering, values, nullable))
+        except (ValidationError, ValueError, TypeError):
+            # Values of the wrong type for their fields, so a tampered
+            # cursor, which starts from the beginning like no cursor.
+            pass
+
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor([
+            _json_value(getattr(last, field.lstrip('-'))) for field in ordering
+        ])
+
+    return KeysetPage(items, next_cursor)
+
+
+def bounded_count(queryset: QuerySet, limit: int) -> tuple[int, bool]:
+    """
+    Counts at most `limit` rows, returning the count and whether it was
+    capped, so large result sets are never fully scanned for a total.
+    """
+
+    count = queryset.order_by()[:limit + 1].count()
+    return min(count, limit), count > limit
@@ -0,0 +1,213 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import transaction
+
+from sneakers.catalog import bump_catalog_version
+from sneakers.models import Sneaker, SneakerRecommendation
+
+
+TOP_K = 8
+BATCH_SIZE = 5000
+
+BRAND_WEIGHT = 3.0
+DESIGNER_WEIGHT = 2.0
+YEAR_WEIGHT = 1.0
+NAME_WEIGHT = 2.0
+# Release years further apart than this add nothing.
+YEAR_RANGE = 10
+
+# Candidates taken from the sneaker's brand, its designer and both, those
+# nearest in release year. Within each group a nearer year scores higher,
+# so few are needed.
+CANDIDATES_PER_KEY = 16
+# Name tokens shared by more sneakers than this are too common to find
+# candidates with, but still count towards the score.
+MAX_TOKEN_POSTINGS = 50
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(name: str) -> frozenset[str]:
+    return frozenset(TOKEN_RE.findall(name.lower()))
+
+
+class _Catalog:
+    """
+    Live sneakers as parallel lists, with postings from each brand,
+    designer and name token to positions in them.
+    """
+
+    def __init__(self, rows):
+        self.ids, self.brands, self.designers, self.years, self.tokens = [], [], [], [], []
+        for sneaker_id, brand_id, designer, year, name in rows:
+            self.ids.append(sneaker_id)
+            self.brands.append(brand_id)
+            self.designers.append(designer)
+            self.years.append(year)
+            self.tokens.append(tokenize(name))
+
+        self.positions = {sneaker_id: i for i, sneaker_id in enumerate(self.ids)}
+
+        # Brand and designer postings are sorted by year, so the nearest
+        # releases are found by bisecting.
+        by_key, by_token = defaultdict(list), defaultdict(list)
+        for i in sorted(range(len(self.ids)), key=self.years.__getitem__):
+            for key in self.keys(i):
+                by_key[key].append(i)
+            for token in self.tokens[i]:
+                by_token[token].append(i)
+
+        self.by_key = {key: (postings, [self.years[i] for i in postings]) for key, postings in by_key.items()}
+        self.by_token = {token: postings for token, postings in by_token.items() if len(postings) <= MAX_TOKEN_POSTINGS}
+
+        count = len(self.ids)
+        self.idf = {token: math.log(1 + count / len(postings)) for token, postings in by_token.items()}
+
+
+    def keys(self, i: int) -> list[tuple]:
+        brand, designer = self.brands[i], self.designers[i]
+        keys = []
+        if brand is not None:
+            keys.append(('brand', brand))
+        if designer:
+            keys.append(('designer', designer))
+        if brand is not None and designer:
+            keys.append(('brand_designer', brand, designer))
+        return keys
+
+
+    def nearest(self, keyed: tuple[list, list], year: int) -> list[int]:
+        postings, years = keyed
+        if len(postings) <= CANDIDATES_PER_KEY:
+            return postings
+        middle = bisect_left(years, year)
+        start = max(0, min(middle - CANDIDATES_PER_KEY // 2, len(postings) - CANDIDATES_PER_KEY))
+        return postings[start:start + CANDIDATES_PER_KEY]
+
+
+    def candidates(self, i: int) -> set[int]:
+        candidates = set()
+        for key in self.keys(i):
+            candidates.update(self.nearest(self.by_key[key], self.years[i]))
+        for token in self.tokens[i]:
+            candidates.update(self.by_token.get(token, ()))
+        candidates.discard(i)
+        return candidates
+
+
+    def score(self, i: int, j: int) -> float:
+        """
+        Scores how alike two sneakers are, from 0 to the sum of the weights.
+        """
+
+        return self.top_matches(i, [j], 1)[0][0]
+
+
+    def top_matches(self, i: int, candidates, k: int) -> list[tuple[float, int]]:
+        """
+        Returns the k best (score, position) pairs among the candidates.
+        The scoring is inlined over local variables, as it runs for every
+        candidate of every sneaker.
+        """
+
+        brands, designers, years, tokens, idf = self.brands, self.designers, self.years, self.tokens, self.idf
+        brand, designer, year, name_tokens = brands[i], designers[i], years[i], tokens[i]
+        name_weight = NAME_WEIGHT / (sum(idf[t] for t in name_tokens) or 1)
+        year_step = YEAR_WEIGHT / YEAR_RANGE
+
+        scored = []
+        for j in candidates:
+            score = 0.0
+            if brand is not None and brands[j] == brand:
+                score += BRAND_WEIGHT
+            if designer and designers[j] == designer:
+                score += DESIGNER_WEIGHT
+
+            years_apart = abs(year - years[j])
+            if years_apart < YEAR_RANGE:
+                score += YEAR_WEIGHT - years_apart * year_step
+
+            # The share of this sneaker's name weight, by IDF, found in the other.
+            if not name_tokens.isdisjoint(tokens[j]):
+                score += name_weight * sum(map(idf.__getitem__, name_tokens & tokens[j]))
+
+            scored.append((score, j))
+
+        return heapq.nlargest(k, scored)
+
+
+def compute_recommendations(top_k: int = TOP_K):
+    """
+    Yields (sneaker id, [(recommended id, score, curated), ...]) for every
+    live sneaker. Curated related_sneakers come first, then the best
+    scoring others.
+
+    Rather than scoring every pair, each sneaker is only scored against
+    candidates sharing its brand or designer, nearest in release year, or
+    a distinctive name token, which keeps a full run linear in the size of
+    the catalog.
+    """
+
+    rows = Sneaker.objects.order_by().values_list('id', 'brand_id', 'designer', 'year_released', 'name')
+    catalog = _Catalog(rows.iterator())
+
+    curated = defaultdict(list)
+    links = Sneaker.related_sneakers.through.objects.filter(
+        from_sneaker__deleted=False,
+        to_sneaker__deleted=False,
+    ).values_list('from_sneaker_id', 'to_sneaker_id')
+    for from_id, to_id in links.iterator():
+        curated[from_id].append(to_id)
+
+    for i, sneaker_id in enumerate(catalog.ids):
+        chosen = [
+            (related_id, round(catalog.score(i, catalog.positions[related_id]), 4), True)
+            for related_id in curated.get(sneaker_id, [])[:top_k]
+        ]
+
+        remaining = top_k - len(chosen)
+        if remaining > 0:
+            candidates = catalog.candidates(i) - {catalog.positions[related_id] for related_id, _, _ in chosen}
+            chosen += [
+                (catalog.ids[j], round(score, 4), False)
+                for score, j in catalog.top_matches(i, candidates, remaining)
+            ]
+
+        yield sneaker_id, chosen
+
+
+@transaction.atomic
+def rebuild_recommendations(top_k: int = TOP_K) -> int:
+    """
+    Replaces every SneakerRecommendation in one transaction, so the detail
+    page never sees a partial set, and returns the number written.
+    """
+
+    SneakerRecommendation.objects.all().delete()
+
+    batch = []
+    written = 0
+    for sneaker_id, chosen in compute_recommendations(top_k):
+        for rank, (recommended_id, score, curated) in enumerate(chosen):
+            batch.append(SneakerRecommendation(
+                sneaker_id=sneaker_id,
+                recommended_id=recommended_id,
+                rank=rank,
+                score=score,
+                curated=curated,
+            ))
+        if len(batch) >= BATCH_SIZE:
+            SneakerRecommendation.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+
+    SneakerRecommendation.objects.bulk_create(batch)
+    written += len(batch)
+
+    # Detail pages validate against the catalog version, see conditional.py.
+    transaction.on_commit(bump_catalog_version)
+    return written
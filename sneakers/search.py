@@ -0,0 +1,31 @@
+from django.db.models import F, Q, QuerySet
+from django.contrib.postgres.search import SearchQuery, SearchRank
+
+
+SEARCH_CONFIG = 'simple'
+SEARCH_ORDERING = ['-search_rank', 'name', 'id']
+
+
+def search_sneakers(queryset: QuerySet, value: str) -> QuerySet:
+    """
+    Filters sneakers by full-text match on the search document, or by
+    substring match on the search text for partial words, ranked by
+    relevance.
+
+    Both columns are denormalized onto the sneaker row by a trigger, so the
+    filter never joins to Brand and needs no DISTINCT. Full-text matches are
+    served by a GIN index, substring matches by a pg_trgm GIN index.
+    """
+
+    value = value.strip()
+    if not value:
+        return queryset
+
+    query = SearchQuery(value, config=SEARCH_CONFIG, search_type='websearch')
+
+    return queryset.filter(
+        Q(search_document=query) |
+        Q(search_text__contains=value.lower())
+    ).annotate(
+        search_rank=SearchRank(F('search_document'), query),
+    ).order_by(*SEARCH_ORDERING)
@@ -0,0 +1,119 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.utils import timezone
+from django.dispatch import receiver
+
+from sneakers.models import Brand, Comment, Like, Sneaker
+from sneakers.comments import bump_comment_version
+from sneakers.likes import invalidate_liked
+from sneakers.catalog import bump_catalog_version, bump_brand_version
+from sneakers.tasks import generate_image_variants
+
+
+@receiver([post_save, post_delete], sender=Brand)
+def invalidate_brand(sender, instance, **kwargs):
+    """
+    Bumps the catalog version and the written Brand's fragment version.
+    """
+
+    bump_catalog_version()
+    bump_brand_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Sneaker)
+def invalidate_sneaker(sender, instance, **kwargs):
+    """
+    Bumps the catalog version and the fragment version of the Sneaker's
+    brand, plus its previous brand if it has been moved. Soft-deletes save
+    the Sneaker, so they are covered here too.
+    """
+
+    bump_catalog_version()
+
+    brand_ids = {instance.brand_id, instance._loaded_values.get('brand_id')} - {None}
+    for brand_id in brand_ids:
+        bump_brand_version(brand_id)
+
+
+@receiver(post_save, sender=Sneaker)
+def update_image_variants(sender, instance, raw=False, **kwargs):
+    """
+    Queues image variant generation when a Sneaker is saved with a new
+    image, then records the saved values for the next save.
+    """
+
+    image_name = instance.primary_image.name or ''
+    if not raw and image_name != (instance._loaded_values.get('primary_image') or ''):
+        generate_image_variants.enqueue(sneaker_id=str(instance.pk))
+
+    instance._loaded_values = {
+        'brand_id': instance.brand_id,
+        'primary_image': instance.primary_image.name,
+    }
+
+
+@receiver(m2m_changed, sender=Sneaker.related_sneakers.through)
+def touch_related_sneakers(sender, instance, action, pk_set, **kwargs):
+    """
+    Changing related_sneakers does not save either Sneaker, so this sets
+    updated_at on both sides, keeping conditional request validators
+    correct, and invalidates the catalog.
+    """
+
+    if action == 'pre_clear':
+        instance._cleared_related_ids = set(instance.related_sneakers.values_list('pk', flat=True))
+        return
+
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_related_ids', set())
+    elif action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    Sneaker.all_with_deleted.filter(pk__in={instance.pk, *pk_set}).update(updated_at=timezone.now())
+    bump_catalog_version()
+
+
+def _count_like(like: Like, change: int):
+    """
+    Adjusts the Sneaker's like_count with a single atomic UPDATE, so
+    concurrent likes are never lost, and drops the user's cached liked set
+    once the change is committed. Counts are not part of the catalog, so
+    its version is left alone.
+    """
+
+    Sneaker.all_with_deleted.filter(pk=like.sneaker_id).update(like_count=F('like_count') + change)
+    transaction.on_commit(lambda: invalidate_liked(like.user_id))
+
+
+@receiver(post_save, sender=Like)
+def like_added(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _count_like(instance, 1)
+
+
+@receiver(post_delete, sender=Like)
+def like_removed(sender, instance, **kwargs):
+    _count_like(instance, -1)
+
+
+def _count_comment(comment: Comment, change: int):
+    """
+    Adjusts the Sneaker's comment_count with a single atomic UPDATE, and
+    bumps its comment version once the change is committed, so only that
+    sneaker's comment fragment is rendered again.
+    """
+
+    Sneaker.all_with_deleted.filter(pk=comment.sneaker_id).update(comment_count=F('comment_count') + change)
+    transaction.on_commit(lambda: bump_comment_version(comment.sneaker_id))
+
+
+@receiver(post_save, sender=Comment)
+def comment_added(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _count_comment(instance, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_removed(sender, instance, **kwargs):
+    _count_comment(instance, -1)
@@ -0,0 +1,273 @@
+import logging
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from django.urls import reverse
+from django.utils import timezone
+
+from sneakers.catalog import get_catalog_version
+from sneakers.models import Brand, Sneaker
+
+
+logger = logging.getLogger('general')
+
+BRAND = 'brand'
+DESIGNER = 'designer'
+SNEAKER = 'sneaker'
+# Brands and designers match fewer, broader results, so they are listed first.
+KIND_ORDER = {BRAND: 0, DESIGNER: 1, SNEAKER: 2}
+
+SUGGESTION_LIMIT = 8
+# An incremental refresh touching more rows than this rebuilds instead.
+MAX_REFRESH_ROWS = 5000
+# updated_at is set before a row commits, so a refresh also reads rows
+# updated this long before the last one, in case they committed after it.
+# Applying a row twice changes nothing.
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    kind: str
+    label: str
+    url: str
+
+
+def normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def get_prefix_keys(text: str) -> set[str]:
+    """
+    Returns the text from each word onwards, so 'Air Max 1' is found by
+    'air', 'max' and '1'.
+    """
+
+    words = normalize(text).split(' ')
+    return {' '.join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+class PrefixIndex:
+    """
+    A sorted array of (key, entry) pairs. Entries whose key starts with a
+    prefix are a contiguous run, found with one binary search.
+    """
+
+    def __init__(self, pairs=()):
+        self.pairs = sorted(pairs)
+
+
+    def add(self, entry: tuple, text: str):
+        for key in get_prefix_keys(text):
+            insort(self.pairs, (key, entry))
+
+
+    def remove(self, entry: tuple, text: str):
+        for key in get_prefix_keys(text):
+            i = bisect_left(self.pairs, (key, entry))
+            if i < len(self.pairs) and self.pairs[i] == (key, entry):
+                del self.pairs[i]
+
+
+    def search(self, prefix: str, limit: int) -> list[tuple]:
+        """
+        Returns up to `limit` distinct entries with a key starting with the
+        prefix, in key order.
+        """
+
+        prefix = normalize(prefix)
+        entries = {}
+        i = bisect_left(self.pairs, (prefix,))
+
+        while i < len(self.pairs) and len(entries) < limit:
+            key, entry = self.pairs[i]
+            if not key.startswith(prefix):
+                break
+            entries.setdefault(entry, None)
+            i += 1
+
+        return list(entries)
+
+
+class SuggestionIndex:
+    """
+    An in-process prefix index over brand names, designers and live sneaker
+    names, for search-as-you-type without database queries.
+
+    The index records the catalog version it was built at. When the version
+    moves on, the next lookup applies the sneakers updated since, which
+    includes soft-deletes, and reloads the brands. Other threads keep
+    reading the current index while one refreshes. Hard deleted sneakers
+    are caught by comparing the live sneaker count, and rebuild the index.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.built_at = None
+        self.brands = {}
+        self.sneakers = {}
+        self.designers = {}
+        self.index = PrefixIndex()
+
+
+    def build(self):
+        """
+        Loads the whole index, in two queries.
+        """
+
+        version = get_catalog_version()
+        built_at = timezone.now()
+
+        brands = dict(Brand.objects.values_list('id', 'name'))
+        sneakers = {
+            sneaker_id: (name, designer)
+            for sneaker_id, name, designer in Sneaker.objects.values_list('id', 'name', 'designer').iterator()
+        }
+
+        designers = {}
+        for _, designer in sneakers.values():
+            if designer:
+                designers[designer] = designers.get(designer, 0) + 1
+
+        pairs = []
+        for brand_id, name in brands.items():
+            pairs += [(key, (BRAND, brand_id)) for key in get_prefix_keys(name)]
+        for designer in designers:
+            pairs += [(key, (DESIGNER, designer)) for key in get_prefix_keys(designer)]
+        for sneaker_id, (name, _) in sneakers.items():
+            pairs += [(key, (SNEAKER, sneaker_id)) for key in get_prefix_keys(name)]
+
+        self.index = PrefixIndex(pairs)
+        self.brands, self.sneakers, self.designers = brands, sneakers, designers
+        self.version, self.built_at = version, built_at
+
+
+    def refresh(self):
+        """
+        Applies brand changes and the sneakers updated since the last build
+        or refresh. Changes are made to copies, which are swapped in at the
+        end, so concurrent lookups never see a half updated index.
+        """
+
+        version = get_catalog_version()
+        refreshed_at = timezone.now()
+
+        sneaker_rows = list(
+            Sneaker.all_with_deleted.filter(updated_at__gte=self.built_at - REFRESH_OVERLAP)
+            .values_list('id', 'name', 'designer', 'deleted')[:MAX_REFRESH_ROWS + 1]
+        )
+        if len(sneaker_rows) > MAX_REFRESH_ROWS:
+            self.build()
+            return
+
+        index = PrefixIndex()
+        index.pairs = list(self.index.pairs)
+        sneakers, designers = dict(self.sneakers), dict(self.designers)
+
+        # Brands are few, so all are reloaded, which also drops deleted ones.
+        brands = dict(Brand.objects.values_list('id', 'name'))
+        for brand_id, name in self.brands.items():
+            if brands.get(brand_id) != name:
+                index.remove((BRAND, brand_id), name)
+        for brand_id, name in brands.items():
+            if self.brands.get(brand_id) != name:
+                index.add((BRAND, brand_id), name)
+
+        def count_designer(designer, change):
+            if not designer:
+                return
+            count = designers.get(designer, 0) + change
+            if count <= 0:
+                designers.pop(designer, None)
+                index.remove((DESIGNER, designer), designer)
+            else:
+                if designer not in designers:
+                    index.add((DESIGNER, designer), designer)
+                designers[designer] = count
+
+        for sneaker_id, name, designer, deleted in sneaker_rows:
+            if sneaker_id in sneakers:
+                old_name, old_designer = sneakers.pop(sneaker_id)
+                index.remove((SNEAKER, sneaker_id), old_name)
+                count_designer(old_designer, -1)
+            if not deleted:
+                sneakers[sneaker_id] = (name, designer)
+                index.add((SNEAKER, sneaker_id), name)
+                count_designer(designer, 1)
+
+        if Sneaker.objects.count() != len(sneakers):
+            self.build()
+            return
+
+        self.index = index
+        self.brands, self.sneakers, self.designers = brands, sneakers, designers
+        self.version, self.built_at = version, refreshed_at
+
+
+    def ensure_current(self):
+        """
+        Builds or refreshes the index if the catalog version has moved on.
+        Only one thread updates it, the others carry on with the current
+        index unless there is none yet.
+        """
+
+        if self.version is not None and self.version == get_catalog_version():
+            return
+
+        blocking = self.version is None
+        if not self.lock.acquire(blocking=blocking):
+            return
+        try:
+            if self.version is None:
+                self.build()
+            elif self.version != get_catalog_version():
+                self.refresh()
+        finally:
+            self.lock.release()
+
+
+    def suggest(self, prefix: str, limit: int = SUGGESTION_LIMIT) -> list[Suggestion]:
+        """
+        Returns suggestions for a search prefix, brands and designers first.
+        """
+
+        if not prefix.strip():
+            return []
+
+        self.ensure_current()
+        index, brands, sneakers = self.index, self.brands, self.sneakers
+
+        query_url = reverse('query')
+        suggestions = []
+        # A few extra entries, so brands and designers sort ahead of sneakers.
+        for kind, key in index.search(prefix, limit * 2):
+            if kind == BRAND and key in brands:
+                url = f"{query_url}?{urlencode({'brand': key})}"
+                suggestions.append(Suggestion(kind, brands[key], url))
+            elif kind == DESIGNER:
+                url = f"{query_url}?{urlencode({'designer': key})}"
+                suggestions.append(Suggestion(kind, key, url))
+            elif kind == SNEAKER and key in sneakers:
+                url = reverse('detail', kwargs={'pk': key})
+                suggestions.append(Suggestion(kind, sneakers[key][0], url))
+
+        suggestions.sort(key=lambda suggestion: KIND_ORDER[suggestion.kind])
+        return suggestions[:limit]
+
+
+suggestion_index = SuggestionIndex()
+
+
+def warm_suggestion_index():
+    """
+    Builds the index as a worker starts, so the first search is fast.
+    """
+
+    try:
+        suggestion_index.ensure_current()
+    except Exception as e:
+        logger.warning(f'Could not build the suggestion index: {e}')
@@ -0,0 +1,100 @@
+import random
+
+from sneakers.models import Brand, Sneaker
+
+
+BRAND_WORDS = [
+    'Apex', 'Atlas', 'Bolt', 'Canyon', 'Crest', 'Drift', 'Echo', 'Ember',
+    'Falcon', 'Forge', 'Glide', 'Harbor', 'Ion', 'Juno', 'Kite', 'Lumen',
+    'Mesa', 'Nova', 'Onyx', 'Pulse', 'Quill', 'Ridge', 'Summit', 'Tempo',
+    'Umbra', 'Vector', 'Wren', 'Zephyr',
+]
+MODEL_WORDS = [
+    'Air', 'Max', 'Zoom', 'Runner', 'Classic', 'Boost', 'Gel', 'Court',
+    'Trail', 'Retro', 'Low', 'High', 'Mid', 'Racer', 'Force', 'Flex',
+    'Dunk', 'Wave', 'Glide', 'Phantom', 'Vapor', 'Cloud', 'Storm', 'Ultra',
+]
+FIRST_NAMES = [
+    'Tinker', 'Bruce', 'Peter', 'Sergio', 'Eric', 'Christian', 'Marc',
+    'Virgil', 'Jerry', 'Salehe', 'Aleali', 'Kerby', 'Ronnie', 'Hiroshi',
+]
+LAST_NAMES = [
+    'Hatfield', 'Kilgore', 'Moore', 'Lozano', 'Avar', 'Tresser', 'Dolce',
+    'Abloh', 'Lorenzo', 'Bembury', 'May', 'Fieg', 'Fujiwara', 'Parker',
+]
+
+BATCH_SIZE = 1000
+
+
+def generate_catalog(
+    brands: int = 50,
+    sneakers: int = 1000,
+    related: int = 3,
+    seed: int = 0,
+) -> tuple[list[Brand], list[Sneaker]]:
+    """
+    Bulk-creates a synthetic catalog of realistic looking brands and sneakers.
+    Sneakers are spread unevenly across brands, share a pool of designers and
+    are linked to up to `related` other sneakers, mostly of the same brand.
+    Sneaker names are unique within their brand.
+    """
+
+    rng = random.Random(seed)
+
+    brand_objects = Brand.objects.bulk_create(
+        [
+            Brand(
+                name=f'{rng.choice(BRAND_WORDS)} {i}',
+                description=f'Synthetic brand number {i}.',
+                year_founded=rng.randint(1900, 2020),
+            )
+            for i in range(brands)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    designers = [
+        f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES
+    ]
+
+    # A skewed brand distribution, so a few brands dominate the catalog.
+    weights = [1 / (rank + 1) for rank in range(len(brand_objects))]
+    sneaker_objects = []
+
+    for i in range(sneakers):
+        words = ' '.join(rng.sample(MODEL_WORDS, rng.randint(1, 3)))
+        sneaker_objects.append(
+            Sneaker(
+                brand=rng.choices(brand_objects, weights)[0],
+                name=f'{words} {i}',
+                summary=f'Synthetic sneaker number {i}.',
+                designer=rng.choice(designers) if rng.random() > 0.1 else None,
+                year_released=rng.randint(1970, 2024),
+            )
+        )
+
+    sneaker_objects = Sneaker.objects.bulk_create(sneaker_objects, batch_size=BATCH_SIZE)
+
+    if related:
+        by_brand = {}
+        for sneaker in sneaker_objects:
+            by_brand.setdefault(sneaker.brand_id, []).append(sneaker)
+
+        Through = Sneaker.related_sneakers.through
+        links = set()
+
+        for sneaker in sneaker_objects:
+            siblings = by_brand[sneaker.brand_id]
+            for _ in range(rng.randint(0, related)):
+                pool = siblings if rng.random() < 0.8 else sneaker_objects
+                other = rng.choice(pool)
+                if other.pk != sneaker.pk:
+                    links.add((sneaker.pk, other.pk))
+                    links.add((other.pk, sneaker.pk))
+
+        Through.objects.bulk_create(
+            [Through(from_sneaker_id=a, to_sneaker_id=b) for a, b in links],
+            batch_size=BATCH_SIZE,
+        )
+
+    return brand_objects, sneaker_objects
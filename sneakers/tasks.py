@@ -0,0 +1,58 @@
+from django.utils import timezone
+
+from jobs.registry import job
+from sneakers.models import Sneaker
+from sneakers.images import render_variants
+from sneakers.recommendations import TOP_K, rebuild_recommendations
+from sneakers.catalog import bump_catalog_version, bump_brand_version
+
+
+def refresh_image_variants(sneaker: Sneaker) -> list[dict]:
+    """
+    Regenerates the resized variants of a Sneaker's primary_image, stores
+    their metadata and invalidates the cached catalog so cards pick up the
+    new srcset. The previous variants are then deleted from storage.
+    """
+
+    storage = sneaker.primary_image.storage
+    previous = {variant['name'] for variant in sneaker.image_variants}
+
+    variants = []
+    if sneaker.primary_image:
+        variants = render_variants(sneaker.primary_image, storage)
+
+    # updated_at is set too, as it validates conditional requests.
+    updated_at = timezone.now()
+    Sneaker.all_with_deleted.filter(pk=sneaker.pk).update(image_variants=variants, updated_at=updated_at)
+    sneaker.image_variants = variants
+    sneaker.updated_at = updated_at
+
+    bump_catalog_version()
+    if sneaker.brand_id:
+        bump_brand_version(sneaker.brand_id)
+
+    for name in previous - {variant['name'] for variant in variants}:
+        storage.delete(name)
+
+    return variants
+
+
+@job
+def generate_image_variants(sneaker_id: str):
+    """
+    Background job enqueued when a Sneaker is saved with a new image.
+    """
+
+    sneaker = Sneaker.all_with_deleted.filter(pk=sneaker_id).first()
+    if sneaker is not None:
+        refresh_image_variants(sneaker)
+
+
+@job(max_attempts=1)
+def recompute_recommendations(top_k: int = TOP_K):
+    """
+    Background job rewriting every sneaker's recommendations, e.g. after
+    an import.
+    """
+
+    rebuild_recommendations(top_k)
@@ -0,0 +1,204 @@
+from django.test import TestCase
+from django.core.cache import cache, caches
+from django.urls import reverse
+
+from sneakers.models import Sneaker, Brand
+from sneakers.catalog import (
+    CATALOG_VERSION_KEY,
+    build_catalog_snapshot,
+    get_catalog_snapshot,
+    get_catalog_version,
+    get_brand_versions,
+)
+
+
+class CatalogSnapshotTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.empty_brand = Brand.objects.create(
+            name = 'Empty Brand',
+            description = 'A brand whose only sneaker is deleted.',
+        )
+
+        cls.sneaker_b = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'B Sneaker',
+            year_released = 2025,
+            primary_image = 'test_image.jpg',
+        )
+        cls.sneaker_a = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'A Sneaker',
+            year_released = 2024,
+        )
+        cls.deleted_sneaker = Sneaker.objects.create(
+            brand = cls.empty_brand,
+            name = 'Deleted Sneaker',
+            year_released = 2024,
+            deleted = True,
+        )
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def test_snapshot_contents(self):
+        """
+        Asserts the snapshot holds live sneakers, ordered by name, and skips
+        brands with no live sneakers.
+        """
+
+        with self.assertNumQueries(1):
+            snapshot = build_catalog_snapshot()
+
+        self.assertEqual([brand.name for brand in snapshot], ['Test Brand'])
+        self.assertEqual(
+            [sneaker.name for sneaker in snapshot[0].sneakers],
+            ['A Sneaker', 'B Sneaker'],
+        )
+        self.assertEqual(snapshot[0].sneakers[0].image_url, '')
+        self.assertTrue(snapshot[0].sneakers[1].image_url.endswith('test_image.jpg'))
+
+
+    def test_write_bumps_version(self):
+        """
+        Asserts saving a sneaker bumps the version and rebuilds the snapshot.
+        """
+
+        get_catalog_snapshot()
+        version = get_catalog_version()
+
+        self.sneaker_a.name = 'Renamed Sneaker'
+        self.sneaker_a.save()
+
+        self.assertGreater(get_catalog_version(), version)
+        names = [sneaker.name for sneaker in get_catalog_snapshot()[0].sneakers]
+        self.assertIn('Renamed Sneaker', names)
+
+
+    def test_version_bumped_by_another_process(self):
+        """
+        Asserts a version bumped through a second cache client, as another
+        web process or the worker would, invalidates this one's snapshot.
+        """
+
+        get_catalog_snapshot()
+        version = get_catalog_version()
+
+        other_cache = caches.create_connection('default')
+        Sneaker.all_with_deleted.filter(pk=self.sneaker_a.pk).update(name='Renamed Sneaker')
+        other_cache.incr(CATALOG_VERSION_KEY)
+
+        self.assertEqual(get_catalog_version(), version + 1)
+        names = [sneaker.name for sneaker in get_catalog_snapshot()[0].sneakers]
+        self.assertIn('Renamed Sneaker', names)
+
+
+    def test_soft_delete_bumps_version(self):
+        """
+        Asserts soft-deleting a sneaker removes it from the next snapshot.
+        """
+
+        get_catalog_snapshot()
+        self.sneaker_b.soft_delete(None)
+
+        names = [sneaker.name for sneaker in get_catalog_snapshot()[0].sneakers]
+        self.assertNotIn('B Sneaker', names)
+
+
+    def test_warm_home_page_makes_no_queries(self):
+        """
+        Asserts a home page served from a warm snapshot makes no DB queries.
+        """
+
+        self.client.get(reverse('home'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+
+        self.assertContains(response, 'A Sneaker')
+        self.assertNotContains(response, 'Empty Brand')
+
+
+class BrandFragmentTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand_a = Brand.objects.create(
+            name = 'Brand A',
+            description = 'First brand.',
+        )
+        cls.brand_b = Brand.objects.create(
+            name = 'Brand B',
+            description = 'Second brand.',
+        )
+
+        cls.sneaker = Sneaker.objects.create(
+            brand = cls.brand_a,
+            name = 'Sneaker A',
+            year_released = 2024,
+        )
+        Sneaker.objects.create(
+            brand = cls.brand_b,
+            name = 'Sneaker B',
+            year_released = 2024,
+        )
+
+
+    def setUp(self):
+        cache.clear()
+        self.brand_ids = [str(self.brand_a.id), str(self.brand_b.id)]
+
+
+    def test_sneaker_write_invalidates_only_its_brand(self):
+        """
+        Asserts saving a sneaker bumps only its own brand's version.
+        """
+
+        before = get_brand_versions(self.brand_ids)
+
+        sneaker = Sneaker.objects.get(id=self.sneaker.id)
+        sneaker.name = 'Renamed Sneaker'
+        sneaker.save()
+
+        after = get_brand_versions(self.brand_ids)
+        self.assertNotEqual(before[str(self.brand_a.id)], after[str(self.brand_a.id)])
+        self.assertEqual(before[str(self.brand_b.id)], after[str(self.brand_b.id)])
+
+
+    def test_moving_sneaker_invalidates_both_brands(self):
+        """
+        Asserts moving a sneaker to another brand bumps both brands.
+        """
+
+        before = get_brand_versions(self.brand_ids)
+
+        sneaker = Sneaker.objects.get(id=self.sneaker.id)
+        sneaker.brand = self.brand_b
+        sneaker.save()
+
+        after = get_brand_versions(self.brand_ids)
+        for brand_id in self.brand_ids:
+            self.assertNotEqual(before[brand_id], after[brand_id])
+
+
+    def test_home_page_renders_edit(self):
+        """
+        Asserts the home page re-renders an edited brand's fragment.
+        """
+
+        self.client.get(reverse('home'))
+
+        sneaker = Sneaker.objects.get(id=self.sneaker.id)
+        sneaker.name = 'Renamed Sneaker'
+        sneaker.save()
+
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'Renamed Sneaker')
+        self.assertContains(response, 'Sneaker B')
@@ -0,0 +1,178 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from sneakers.comments import COMMENT_PAGE_SIZE, get_comment_page, get_comment_version
+from sneakers.models import Brand, Comment, Sneaker
+from sneakers.pagination import encode_cursor
+
+
+class CommentTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email = 'testuser@email.com',
+            first_name = 'Test',
+            last_name = 'User',
+            password = 'testpass123',
+        )
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.sneaker = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Test Sneaker',
+            summary = 'A useful summary of sneaker.',
+            year_released = 2020,
+        )
+        cls.other_sneaker = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Other Sneaker',
+            summary = 'Another summary.',
+            year_released = 2021,
+        )
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def comment(self, sneaker, body='A comment.'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Comment.objects.create(user=self.user, sneaker=sneaker, body=body)
+
+
+    def get_comment_queries(self, url) -> list[str]:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return [query['sql'] for query in context.captured_queries if 'sneakers_comment' in query['sql']]
+
+
+    def test_comment_count(self):
+        """
+        Ensure comment_count follows comments being added and removed, and
+        only the commented sneaker's comment version changes.
+        """
+
+        version = get_comment_version(self.sneaker.pk)
+        other_version = get_comment_version(self.other_sneaker.pk)
+
+        comment = self.comment(self.sneaker)
+        self.comment(self.sneaker)
+        self.sneaker.refresh_from_db()
+        self.assertEqual(self.sneaker.comment_count, 2)
+        self.assertNotEqual(get_comment_version(self.sneaker.pk), version)
+        self.assertEqual(get_comment_version(self.other_sneaker.pk), other_version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.delete()
+        self.sneaker.refresh_from_db()
+        self.assertEqual(self.sneaker.comment_count, 1)
+
+
+    def test_comment_pages(self):
+        """
+        Ensure following the cursors lists every comment once, newest first.
+        """
+
+        for i in range(COMMENT_PAGE_SIZE * 2 + 5):
+            Comment.objects.create(user=self.user, sneaker=self.sneaker, body=f'Comment {i}')
+        self.comment(self.other_sneaker)
+
+        comments, cursor = [], None
+        while True:
+            page = get_comment_page(self.sneaker.pk, cursor)
+            comments += page.items
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        expected = list(Comment.objects.filter(sneaker=self.sneaker).order_by('-created_at', '-id'))
+        self.assertEqual(comments, expected)
+
+
+    def test_detail_view_caches_comments(self):
+        """
+        Ensure the detail page only loads comments when a new one has
+        invalidated its fragment, and then shows it.
+        """
+
+        self.comment(self.sneaker, 'First comment.')
+        url = reverse('detail', kwargs={'pk': self.sneaker.pk})
+
+        response = self.client.get(url)
+        self.assertContains(response, 'First comment.')
+        self.assertContains(response, 'Comments (1)')
+        self.assertEqual(self.get_comment_queries(url), [])
+
+        self.comment(self.sneaker, 'Second comment.')
+        self.assertEqual(len(self.get_comment_queries(url)), 1)
+        self.assertContains(self.client.get(url), 'Second comment.')
+
+
+    def test_comment_view_logged_out(self):
+        """
+        Tests redirect to login when commenting while logged out.
+        """
+
+        url = reverse('comment', kwargs={'pk': self.sneaker.pk})
+        response = self.client.post(url, {'body': 'A comment.'})
+
+        self.assertRedirects(response, f"{reverse('account_login')}?next={url}")
+        self.assertFalse(Comment.objects.exists())
+
+
+    def test_comment_view(self):
+        """
+        Tests POST adds the comment and renders the updated section, and an
+        empty comment renders the form's errors.
+        """
+
+        self.client.force_login(self.user)
+        url = reverse('comment', kwargs={'pk': self.sneaker.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {'body': 'A new comment.'})
+
+        self.assertTemplateUsed(response, 'sneakers/partials/comments.html')
+        self.assertContains(response, 'A new comment.')
+        self.assertContains(response, 'Comments (1)')
+        self.assertEqual(Comment.objects.get().user, self.user)
+
+        response = self.client.post(url, {'body': ''})
+        self.assertTrue(response.context['comment_form'].errors)
+        self.assertEqual(Comment.objects.count(), 1)
+
+
+    def test_comments_more_view(self):
+        """
+        Tests the load more view renders the page following the cursor.
+        """
+
+        for i in range(COMMENT_PAGE_SIZE + 1):
+            Comment.objects.create(user=self.user, sneaker=self.sneaker, body=f'Comment {i}')
+
+        first_page = get_comment_page(self.sneaker.pk)
+        url = reverse('comments_more', kwargs={'pk': self.sneaker.pk})
+        response = self.client.get(url, {'after': first_page.next_cursor})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['comment_page'].items), 1)
+        self.assertNotContains(response, 'id="load-more-comments"')
+
+
+    def test_comments_more_view_tampered_cursor(self):
+        """
+        Tests a cursor whose date is not a date renders the first page.
+        """
+
+        self.comment(self.sneaker, 'First comment.')
+        cursor = encode_cursor(['not-a-date', str(self.sneaker.pk)])
+
+        response = self.client.get(reverse('comments_more', kwargs={'pk': self.sneaker.pk}), {'after': cursor})
+        self.assertContains(response, 'First comment.')
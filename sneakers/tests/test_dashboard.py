@@ -0,0 +1,207 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from sneakers.catalog import get_brand_versions, get_catalog_version
+from sneakers.dashboard import DASHBOARD_PAGE_SIZE
+from sneakers.models import Brand, Sneaker
+
+
+class DashboardTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email = 'testuser@email.com',
+            first_name = 'Test',
+            last_name = 'User',
+            password = 'testpass123',
+        )
+        cls.user.user_permissions.add(
+            Permission.objects.get(codename='change_sneaker'),
+            Permission.objects.get(codename='delete_sneaker'),
+        )
+
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.other_brand = Brand.objects.create(
+            name = 'Other Brand',
+            description = 'Another brand.',
+        )
+        Sneaker.objects.bulk_create(
+            Sneaker(
+                brand = cls.brand if i % 2 else cls.other_brand,
+                name = f'Sneaker {i:03}',
+                summary = 'A useful summary of sneaker.',
+                year_released = 2000 + i % 20,
+            )
+            for i in range(DASHBOARD_PAGE_SIZE + 50)
+        )
+
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('manage_sneakers')
+
+
+    def post(self, data, querystring=''):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(f'{self.url}?{querystring}', data)
+        updates = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+        return response, updates
+
+
+    def test_dashboard_permissions(self):
+        """
+        Tests redirect to login while logged out, and 403 without the change
+        permission.
+        """
+
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertRedirects(response, f"{reverse('account_login')}?next={self.url}")
+
+        user = get_user_model().objects.create_user(
+            email = 'otheruser@email.com',
+            first_name = 'Other',
+            last_name = 'User',
+            password = 'testpass123',
+        )
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+    def test_manage_link_follows_permission(self):
+        """
+        Ensure the nav links to the dashboard for users with the change
+        permission, whether or not they are staff.
+        """
+
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, f'href="{self.url}"')
+
+        user = get_user_model().objects.create_user(
+            email = 'staffuser@email.com',
+            first_name = 'Staff',
+            last_name = 'User',
+            password = 'testpass123',
+            is_staff = True,
+        )
+        self.client.force_login(user)
+        response = self.client.get(reverse('home'))
+        self.assertNotContains(response, f'href="{self.url}"')
+
+
+    def test_dashboard_pages_and_sorts(self):
+        """
+        Ensure following the next page lists every live sneaker once, in the
+        chosen order.
+        """
+
+        for sort, ordering in (('name', ['name', 'id']), ('-year_released', ['-year_released', '-name', '-id'])):
+            with self.subTest(sort=sort):
+                names, querystring = [], f'sort={sort}'
+                while querystring:
+                    response = self.client.get(f'{self.url}?{querystring}')
+                    names += [sneaker.name for sneaker in response.context['sneakers']]
+                    querystring = response.context['next_querystring']
+
+                expected = list(Sneaker.objects.order_by(*ordering).values_list('name', flat=True))
+                self.assertEqual(names, expected)
+
+
+    def test_dashboard_filters(self):
+        """
+        Ensure filters apply, and soft-deleted sneakers are only listed when
+        asked for.
+        """
+
+        sneaker = Sneaker.objects.get(name='Sneaker 001')
+        sneaker.soft_delete(None)
+
+        response = self.client.get(self.url, {'brand': self.brand.pk, 'name': '00'})
+        self.assertEqual([s.name for s in response.context['sneakers']], ['Sneaker 003', 'Sneaker 005', 'Sneaker 007', 'Sneaker 009'])
+
+        response = self.client.get(self.url, {'status': 'deleted'})
+        self.assertEqual([s.pk for s in response.context['sneakers']], [sneaker.pk])
+
+
+    def test_bulk_delete_and_restore(self):
+        """
+        Ensure ticked sneakers are soft-deleted and restored with one UPDATE
+        each, invalidating the catalog and their brands.
+        """
+
+        sneakers = list(Sneaker.objects.filter(brand=self.brand).order_by('name')[:3])
+        ids = [sneaker.pk for sneaker in sneakers]
+        catalog_version = get_catalog_version()
+        brand_version = get_brand_versions([self.brand.pk])[self.brand.pk]
+        other_brand_version = get_brand_versions([self.other_brand.pk])[self.other_brand.pk]
+
+        response, updates = self.post({'action': 'delete', 'ids': ids})
+        self.assertRedirects(response, self.url)
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Sneaker.all_with_deleted.filter(pk__in=ids, deleted=True, deleted_by=self.user).count(), 3)
+        self.assertNotEqual(get_catalog_version(), catalog_version)
+        self.assertNotEqual(get_brand_versions([self.brand.pk])[self.brand.pk], brand_version)
+        self.assertEqual(get_brand_versions([self.other_brand.pk])[self.other_brand.pk], other_brand_version)
+
+        response, updates = self.post({'action': 'restore', 'ids': ids})
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Sneaker.objects.filter(pk__in=ids).count(), 3)
+
+
+    def test_bulk_reassign_all_matching(self):
+        """
+        Ensure every sneaker matching the filters is moved to a brand with
+        one UPDATE.
+        """
+
+        response, updates = self.post(
+            {'action': 'reassign', 'select_all': 'on', 'brand': self.brand.pk},
+            f'brand={self.other_brand.pk}&year_released=2000',
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(Sneaker.objects.filter(brand=self.other_brand, year_released=2000).exists())
+        self.assertEqual(Sneaker.objects.filter(brand=self.other_brand).count(), 67)
+
+
+    def test_bulk_action_errors(self):
+        """
+        Ensure nothing changes without a selection, or when a restore would
+        duplicate a live sneaker's brand and name.
+        """
+
+        response, updates = self.post({'action': 'delete'})
+        self.assertTrue(response.context['form'].non_field_errors())
+        self.assertEqual(updates, [])
+
+        sneaker = Sneaker.objects.get(name='Sneaker 001')
+        sneaker.soft_delete(None)
+        Sneaker.objects.create(brand=self.brand, name='Sneaker 001', summary='A replacement.', year_released=2001)
+
+        response, _ = self.post({'action': 'restore', 'ids': [sneaker.pk]})
+        self.assertTrue(response.context['form'].non_field_errors())
+        self.assertTrue(Sneaker.all_with_deleted.get(pk=sneaker.pk).deleted)
+
+
+    def test_bulk_delete_requires_permission(self):
+        """
+        Tests 403 when deleting without the delete permission.
+        """
+
+        self.user.user_permissions.remove(Permission.objects.get(codename='delete_sneaker'))
+        sneaker = Sneaker.objects.first()
+
+        response, updates = self.post({'action': 'delete', 'ids': [sneaker.pk]})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(updates, [])
@@ -0,0 +1,62 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from sneakers.models import Brand, Sneaker
+
+
+class ExportCatalogCommandTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+        )
+        cls.sneaker = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Test Sneaker',
+            year_released = 2024,
+        )
+
+
+    def test_export_to_stdout(self):
+        """
+        Tests brands are written to stdout as NDJSON by default.
+        """
+
+        out = StringIO()
+        call_command('export_catalog', '--resource', 'brands', stdout=out)
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Test Brand'])
+
+
+    def test_export_gzipped_file(self):
+        """
+        Tests sneakers are written to a gzipped CSV file with a header row.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sneakers.csv.gz')
+            call_command('export_catalog', '--format', 'csv', '--output', path, '--gzip', stderr=StringIO())
+
+            with gzip.open(path, 'rt') as f:
+                lines = f.read().splitlines()
+
+        self.assertTrue(lines[0].startswith('id,brand_id,name'))
+        self.assertIn('Test Sneaker', lines[1])
+
+
+    def test_invalid_updated_since(self):
+        """
+        Tests an updated_since that is not an ISO date is rejected.
+        """
+
+        with self.assertRaises(CommandError):
+            call_command('export_catalog', '--updated-since', 'yesterday', stdout=StringIO())
@@ -0,0 +1,113 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+
+from sneakers.facets import _grouped_counts, _grouping_sets_counts, get_facets
+from sneakers.filters import SneakerFilter
+from sneakers.models import Sneaker, Brand
+
+
+class FacetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.other_brand = Brand.objects.create(
+            name = 'Other Brand',
+            description = 'Another brand.',
+        )
+
+        for name, brand, designer, year in [
+            ('A Sneaker', cls.brand, 'Designer One', 2020),
+            ('B Sneaker', cls.brand, 'Designer One', 2021),
+            ('C Sneaker', cls.brand, None, 2021),
+            ('D Sneaker', cls.other_brand, 'Designer Two', 2021),
+        ]:
+            Sneaker.objects.create(brand=brand, name=name, summary='Summary.', designer=designer, year_released=year)
+
+        deleted = Sneaker.objects.create(brand=cls.other_brand, name='Deleted Sneaker', summary='Summary.', year_released=2000)
+        deleted.soft_delete(None)
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def get_facets(self, querystring=''):
+        params = QueryDict(querystring)
+        return {
+            facet.name: facet
+            for facet in get_facets(SneakerFilter(params, queryset=Sneaker.objects.all()), params)
+        }
+
+
+    def test_counts(self):
+        """
+        Ensure each value is counted across live sneakers, most common first.
+        """
+
+        facets = self.get_facets()
+        self.assertEqual(
+            [(item.label, item.count) for item in facets['brand'].values],
+            [('Test Brand', 3), ('Other Brand', 1)],
+        )
+        self.assertEqual(
+            [(item.label, item.count) for item in facets['designer'].values],
+            [('Designer One', 2), ('Designer Two', 1)],
+        )
+        self.assertEqual(
+            [(item.value, item.count) for item in facets['year_released'].values],
+            [('2021', 3), ('2020', 1)],
+        )
+
+
+    def test_counts_follow_filters(self):
+        """
+        Ensure counts are for the current filters, and values link to them.
+        """
+
+        facets = self.get_facets('year_released=2021&after=cursor')
+        self.assertEqual(
+            [(item.label, item.count) for item in facets['brand'].values],
+            [('Test Brand', 2), ('Other Brand', 1)],
+        )
+
+        item = facets['designer'].values[0]
+        self.assertEqual(QueryDict(item.querystring).dict(), {'year_released': '2021', 'after': 'cursor', 'designer': item.value})
+
+
+    def test_counts_cached_until_catalog_write(self):
+        """
+        Ensure repeated filters are served from the cache, and a write
+        invalidates them.
+        """
+
+        self.get_facets('designer=Designer One')
+        with self.assertNumQueries(0):
+            self.get_facets('designer=Designer One')
+
+        Sneaker.objects.create(brand=self.brand, name='E Sneaker', summary='Summary.', designer='Designer One', year_released=2020)
+        facets = self.get_facets('designer=Designer One')
+        self.assertEqual(facets['brand'].values[0].count, 3)
+
+
+    def test_query_view_shows_facets(self):
+        response = self.client.get(reverse('query'), {'after': 'cursor'})
+        self.assertContains(response, 'Designer One (2)')
+        self.assertNotContains(response, 'after=cursor')
+
+
+    @skipUnless(connection.vendor == 'postgresql', 'GROUPING SETS are used on PostgreSQL.')
+    def test_grouping_sets_match_grouped_counts(self):
+        queryset = Sneaker.objects.all()
+        self.assertEqual(
+            {name: sorted(rows, key=str) for name, rows in _grouping_sets_counts(queryset).items()},
+            {name: sorted(rows, key=str) for name, rows in _grouped_counts(queryset).items()},
+        )
@@ -0,0 +1,134 @@
+import io
+import shutil
+import tempfile
+
+from PIL import Image
+
+from django.test import TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from jobs.worker import run_pending_jobs
+from sneakers.models import Sneaker, Brand
+from sneakers.images import VARIANT_WIDTHS
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageVariantTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+
+    def make_image(self, width, height, name='test_image.png'):
+        buffer = io.BytesIO()
+        Image.new('RGBA', (width, height), (200, 30, 30, 128)).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+    def test_variants_generated_on_save(self):
+        """
+        Asserts WebP and JPEG variants are written for each width narrower
+        than the original.
+        """
+
+        sneaker = Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Test Sneaker',
+            year_released = 2025,
+            primary_image = self.make_image(800, 400),
+        )
+
+        run_pending_jobs()
+        sneaker.refresh_from_db()
+        widths = [width for width in VARIANT_WIDTHS if width < 800]
+
+        self.assertEqual(len(sneaker.image_variants), len(widths) * 2)
+        for variant in sneaker.image_variants:
+            self.assertIn(variant['width'], widths)
+            self.assertEqual(variant['height'], variant['width'] // 2)
+            self.assertTrue(sneaker.primary_image.storage.exists(variant['name']))
+
+        self.assertIn('320w', sneaker.image_webp_srcset)
+        self.assertIn('.jpeg 640w', sneaker.image_srcset)
+
+
+    def test_variants_regenerated_on_new_image(self):
+        """
+        Asserts replacing the image regenerates the variants and deletes
+        the old ones, and other saves leave them alone.
+        """
+
+        sneaker = Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Test Sneaker',
+            year_released = 2025,
+            primary_image = self.make_image(400, 400),
+        )
+        run_pending_jobs()
+        sneaker = Sneaker.objects.get(id=sneaker.id)
+        self.assertEqual(len(sneaker.image_variants), 2)
+        old_variants = [variant['name'] for variant in sneaker.image_variants]
+
+        sneaker.name = 'Renamed Sneaker'
+        with self.assertNumQueries(1):
+            sneaker.save()
+
+        sneaker.primary_image = self.make_image(1200, 600)
+        sneaker.save()
+        run_pending_jobs()
+        sneaker.refresh_from_db()
+        self.assertEqual(len(sneaker.image_variants), len(VARIANT_WIDTHS) * 2)
+        for name in old_variants:
+            self.assertFalse(sneaker.primary_image.storage.exists(name))
+
+
+    def test_unreadable_image_has_no_variants(self):
+        """
+        Asserts a file that is not an image is saved without variants.
+        """
+
+        sneaker = Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Test Sneaker',
+            year_released = 2025,
+            primary_image = SimpleUploadedFile('test_image.jpg', b'not an image', 'image/jpeg'),
+        )
+
+        run_pending_jobs()
+        sneaker.refresh_from_db()
+        self.assertEqual(sneaker.image_variants, [])
+        self.assertEqual(sneaker.image_srcset, '')
+
+
+    def test_cards_render_srcset(self):
+        """
+        Asserts home and detail pages offer the variants through srcset.
+        """
+
+        sneaker = Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Test Sneaker',
+            year_released = 2025,
+            primary_image = self.make_image(800, 400),
+        )
+        run_pending_jobs()
+
+        for url in (reverse('home'), reverse('detail', kwargs={'pk': sneaker.id})):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'type="image/webp"')
+                self.assertContains(response, '-320w.webp 320w')
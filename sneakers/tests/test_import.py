@@ -0,0 +1,143 @@
+import io
+from unittest import skipUnless
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from sneakers.importer import clean_row, import_catalog, read_rows
+from sneakers.models import Brand, Sneaker
+
+
+class ReadRowsTests(SimpleTestCase):
+
+    def test_read_ndjson(self):
+        """
+        Ensure NDJSON rows are read with their line numbers, skipping blank lines.
+        """
+
+        f = io.StringIO('{"name": "A"}\n\n{"name": "B"}\n')
+        self.assertEqual(list(read_rows(f, 'ndjson')), [(1, {'name': 'A'}), (3, {'name': 'B'})])
+
+
+    def test_read_csv(self):
+        """
+        Ensure CSV rows are read from line 2, with related sneaker names split
+        and empty cells as None.
+        """
+
+        f = io.StringIO('brand,name,designer,related_sneakers\nNike,Air Max 1,,Air Max 90|Air Max 95\n')
+        self.assertEqual(list(read_rows(f, 'csv')), [(2, {
+            'brand': 'Nike',
+            'name': 'Air Max 1',
+            'designer': None,
+            'related_sneakers': ['Air Max 90', 'Air Max 95'],
+        })])
+
+
+class CleanRowTests(SimpleTestCase):
+
+    def test_valid_row(self):
+        """
+        Ensure a valid row is cleaned, with empty optional columns as None.
+        """
+
+        cleaned = clean_row('sneakers', {
+            'brand': 'Nike',
+            'name': 'Air Max 1',
+            'summary': 'A classic.',
+            'year_released': '1987',
+            'primary_image': 'sneakers/air-max-1.jpg',
+        })
+        self.assertEqual(cleaned['year_released'], 1987)
+        self.assertIsNone(cleaned['designer'])
+        self.assertIsNone(cleaned['related_sneakers'])
+
+
+    def test_invalid_row(self):
+        """
+        Ensure every invalid column is reported, using the model fields' rules.
+        """
+
+        with self.assertRaises(ValidationError) as context:
+            clean_row('sneakers', {
+                'name': 'Air Max 1',
+                'summary': 'A classic.',
+                'year_released': 1800,
+                'primary_image': 'sneakers/air-max-1.gif',
+            })
+        self.assertEqual(set(context.exception.message_dict), {'brand', 'year_released', 'primary_image'})
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Imports COPY into PostgreSQL.')
+class ImportCatalogTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.sneaker = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Existing Sneaker',
+            summary = 'Before the import.',
+            year_released = 2020,
+        )
+
+
+    def test_import_brands(self):
+        """
+        Ensure brands are matched by name, updating existing ones and
+        inserting the rest.
+        """
+
+        result = import_catalog('brands', [
+            (1, {'name': 'Test Brand', 'description': 'Updated.'}),
+            (2, {'name': 'New Brand', 'description': 'Imported.', 'year_founded': 1990}),
+        ])
+
+        self.assertEqual((result.inserted, result.updated, result.errors), (1, 1, []))
+        self.assertEqual(Brand.objects.get(pk=self.brand.pk).description, 'Updated.')
+        self.assertEqual(Brand.objects.get(name='New Brand').year_founded, 1990)
+
+
+    def test_import_sneakers(self):
+        """
+        Ensure sneakers are upserted by brand and name, related sneakers are
+        linked both ways, and invalid rows and unknown brands are reported.
+        """
+
+        result = import_catalog('sneakers', [
+            (1, {'brand': 'Test Brand', 'name': 'Existing Sneaker', 'summary': 'After the import.', 'year_released': 2020}),
+            (2, {'brand': 'Test Brand', 'name': 'New Sneaker', 'summary': 'Imported.', 'year_released': 2024,
+                 'related_sneakers': ['Existing Sneaker', 'Missing Sneaker']}),
+            (3, {'brand': 'Missing Brand', 'name': 'Orphan', 'summary': 'Imported.', 'year_released': 2024}),
+            (4, {'brand': 'Test Brand', 'name': 'Invalid', 'summary': 'Imported.', 'year_released': 1800}),
+        ])
+
+        self.assertEqual((result.rows, result.inserted, result.updated), (4, 1, 1))
+        self.assertEqual([line for line, _ in result.errors], [3, 4])
+
+        self.sneaker.refresh_from_db()
+        self.assertEqual(self.sneaker.summary, 'After the import.')
+
+        new_sneaker = Sneaker.objects.get(name='New Sneaker')
+        self.assertEqual(new_sneaker.image_variants, [])
+        self.assertEqual(list(new_sneaker.related_sneakers.all()), [self.sneaker])
+        self.assertEqual(list(self.sneaker.related_sneakers.all()), [new_sneaker])
+
+
+    def test_unchanged_rows_not_updated(self):
+        """
+        Ensure rows matching the stored values leave updated_at alone.
+        """
+
+        updated_at = self.sneaker.updated_at
+        result = import_catalog('sneakers', [
+            (1, {'brand': 'Test Brand', 'name': 'Existing Sneaker', 'summary': 'Before the import.', 'year_released': 2020}),
+        ])
+
+        self.assertEqual((result.inserted, result.updated), (0, 0))
+        self.sneaker.refresh_from_db()
+        self.assertEqual(self.sneaker.updated_at, updated_at)
@@ -0,0 +1,179 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from sneakers.filters import SneakerFilter
+from sneakers.likes import get_liked_ids, get_liked_version, toggle_like
+from sneakers.models import Brand, Like, Sneaker
+
+
+class LikeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email = 'testuser@email.com',
+            first_name = 'Test',
+            last_name = 'User',
+            password = 'testpass123',
+        )
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.sneaker = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Test Sneaker',
+            summary = 'A useful summary of sneaker.',
+            year_released = 2020,
+        )
+        cls.other_sneaker = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Other Sneaker',
+            summary = 'Another summary.',
+            year_released = 2021,
+        )
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def get_user(self):
+        # A fresh instance, as the liked set is memoized on the user.
+        return get_user_model().objects.get(pk=self.user.pk)
+
+
+    def test_toggle_like_counts(self):
+        """
+        Ensure toggling a like adds and removes it, keeping like_count in step.
+        """
+
+        self.assertTrue(toggle_like(self.user, self.sneaker))
+        self.sneaker.refresh_from_db()
+        self.assertEqual(self.sneaker.like_count, 1)
+        self.assertTrue(Like.objects.filter(user=self.user, sneaker=self.sneaker).exists())
+
+        self.assertFalse(toggle_like(self.user, self.sneaker))
+        self.sneaker.refresh_from_db()
+        self.assertEqual(self.sneaker.like_count, 0)
+        self.assertFalse(Like.objects.exists())
+
+
+    def test_liked_set_cached(self):
+        """
+        Ensure the liked set is loaded once, then read from the cache, and
+        a like changes its version.
+        """
+
+        Like.objects.create(user=self.user, sneaker=self.sneaker)
+
+        user = self.get_user()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_liked_ids(user), {str(self.sneaker.pk)})
+
+        user = self.get_user()
+        with self.assertNumQueries(0):
+            version = get_liked_version(user)
+            get_liked_ids(user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_like(self.user, self.other_sneaker)
+
+        user = self.get_user()
+        self.assertEqual(get_liked_ids(user), {str(self.sneaker.pk), str(self.other_sneaker.pk)})
+        self.assertNotEqual(get_liked_version(user), version)
+
+
+    def test_liked_filter(self):
+        """
+        Ensure the liked filter narrows to the user's likes, and to nothing
+        for anonymous users.
+        """
+
+        Like.objects.create(user=self.user, sneaker=self.sneaker)
+        request = self.client.get('/').wsgi_request
+
+        request.user = self.user
+        sneaker_filter = SneakerFilter({'liked': 'true'}, queryset=Sneaker.objects.all(), request=request)
+        self.assertEqual(list(sneaker_filter.qs), [self.sneaker])
+
+        self.client.logout()
+        request = self.client.get('/').wsgi_request
+        sneaker_filter = SneakerFilter({'liked': 'true'}, queryset=Sneaker.objects.all(), request=request)
+        self.assertFalse(sneaker_filter.qs.exists())
+
+
+    def test_like_view_logged_out(self):
+        """
+        Tests redirect to login when liking while logged out.
+        """
+
+        url = reverse('like', kwargs={'pk': self.sneaker.pk})
+        response = self.client.post(url)
+
+        self.assertRedirects(response, f"{reverse('account_login')}?next={url}")
+        self.assertFalse(Like.objects.exists())
+
+
+    def test_like_view(self):
+        """
+        Tests POST toggles the like and renders the updated button, and GET
+        is not allowed.
+        """
+
+        self.client.force_login(self.user)
+        url = reverse('like', kwargs={'pk': self.sneaker.pk})
+
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'sneakers/partials/like_button.html')
+        self.assertContains(response, 'aria-pressed="true"')
+        self.assertEqual(response.context['sneaker'].like_count, 1)
+
+        response = self.client.post(url)
+        self.assertContains(response, 'aria-pressed="false"')
+        self.assertEqual(response.context['sneaker'].like_count, 0)
+
+
+    def test_pages_mark_liked_sneakers(self):
+        """
+        Ensure pages list the user's likes for the hearts in the grid, and
+        the home page costs no more queries once the liked set is cached.
+        """
+
+        Like.objects.create(user=self.user, sneaker=self.sneaker)
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['liked_ids'], [str(self.sneaker.pk)])
+        self.assertContains(response, 'id="liked-sneaker-ids"')
+
+        # Session, user and the nav's permission check, the grid and liked
+        # set are cached.
+        with self.assertNumQueries(4):
+            self.client.get(reverse('home'))
+
+
+    def test_detail_view_etag_varies_by_liked_set(self):
+        """
+        Ensure liking another sneaker invalidates a detail page, as its
+        recommendation cards mark the user's likes.
+        """
+
+        self.client.force_login(self.user)
+        url = reverse('detail', kwargs={'pk': self.sneaker.pk})
+        # The first page sets the CSRF cookie its ETag depends on.
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_like(self.user, self.other_sneaker)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['liked_ids'], [str(self.other_sneaker.pk)])
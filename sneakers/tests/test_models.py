@@ -65,4 +65,22 @@ class SneakerModelTests(TestCase):
         Tests sneaker str method.
         """
         
-        self.assertEqual(str(self.sneaker), 'Test Sneaker')        
\ No newline at end of file
+        self.assertEqual(str(self.sneaker), 'Test Sneaker')
+
+
+    def test_default_manager_excludes_soft_deleted(self):
+        """
+        Asserts the default manager hides soft-deleted sneakers, and the
+        all_with_deleted manager does not.
+        """
+
+        deleted_sneaker = Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Deleted Sneaker',
+            year_released = 2025,
+        )
+        deleted_sneaker.soft_delete(None)
+
+        self.assertQuerySetEqual(Sneaker.objects.all(), [self.sneaker])
+        self.assertQuerySetEqual(self.brand.sneaker_set.all(), [self.sneaker])
+        self.assertIn(deleted_sneaker, Sneaker.all_with_deleted.all())
@@ -0,0 +1,230 @@
+import json
+from urllib.parse import urlencode
+from unittest import skipUnless
+
+from django.test import TestCase, SimpleTestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from sneakers.comments import get_comment_page
+from sneakers.models import Comment, Sneaker
+from sneakers.synthetic import generate_catalog
+
+
+# Nodes that must read all of their input before returning a row. A
+# sequential scan beneath one of these reads the whole table.
+BLOCKING_NODES = {'Sort', 'Incremental Sort', 'Hash', 'Aggregate', 'Materialize', 'Unique'}
+
+
+def find_unbounded_seq_scans(plan: dict, relation: str, bounded: bool = False) -> list[dict]:
+    """
+    Returns the sequential scans on `relation` that are not cut short by a
+    Limit. A Seq Scan directly under a Limit stops early, anything else
+    reads the whole table.
+    """
+
+    node_type = plan['Node Type']
+
+    if node_type == 'Limit':
+        bounded = True
+    elif node_type in BLOCKING_NODES:
+        bounded = False
+
+    found = []
+    if node_type == 'Seq Scan' and plan.get('Relation Name') == relation and not bounded:
+        found.append(plan)
+
+    for child in plan.get('Plans', []):
+        found.extend(find_unbounded_seq_scans(child, relation, bounded))
+
+    return found
+
+
+class FindUnboundedSeqScansTests(SimpleTestCase):
+
+    def test_limit_bounds_scan(self):
+        """
+        Asserts a Seq Scan directly under a Limit is allowed.
+        """
+
+        plan = {'Node Type': 'Limit', 'Plans': [
+            {'Node Type': 'Seq Scan', 'Relation Name': 'sneakers_sneaker'},
+        ]}
+        self.assertEqual(find_unbounded_seq_scans(plan, 'sneakers_sneaker'), [])
+
+
+    def test_sort_unbounds_scan(self):
+        """
+        Asserts a Seq Scan feeding a Sort is reported, even under a Limit.
+        """
+
+        scan = {'Node Type': 'Seq Scan', 'Relation Name': 'sneakers_sneaker'}
+        plan = {'Node Type': 'Limit', 'Plans': [
+            {'Node Type': 'Sort', 'Plans': [scan]},
+        ]}
+        self.assertEqual(find_unbounded_seq_scans(plan, 'sneakers_sneaker'), [scan])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plans are checked against PostgreSQL.')
+class CatalogQueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN on every query the catalog views and endpoints make against
+    a large seeded catalog, and fails if any of them scans the whole
+    sneakers table. The home page snapshot and the unfiltered facet counts
+    read every live sneaker by design, once per catalog version, so they
+    are cached before checking.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        brands, sneakers = generate_catalog(brands=200, sneakers=20000, related=3, seed=1)
+        cls.brand = brands[0]
+        cls.sneaker = sneakers[0]
+        cls.designer = next(sneaker.designer for sneaker in sneakers if sneaker.designer)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE sneakers_brand')
+            cursor.execute('ANALYZE sneakers_sneaker')
+            cursor.execute('ANALYZE sneakers_sneaker_related_sneakers')
+
+
+    def setUp(self):
+        cache.clear()
+
+
+    def assertNoSequentialScans(self, url, relation=Sneaker._meta.db_table):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+        for query in context.captured_queries:
+            sql = query['sql']
+            if relation not in sql:
+                continue
+
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                plan = cursor.fetchone()[0]
+
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            scans = find_unbounded_seq_scans(plan[0]['Plan'], relation)
+            self.assertEqual(scans, [], f'Sequential scan for {url}:\n{sql}')
+
+        return response
+
+
+    def test_query_view_plans(self):
+        """
+        Asserts query_view filters and pages use indexes.
+        """
+
+        query_url = reverse('query')
+        # Counts the unfiltered facets, once per catalog version.
+        self.client.get(query_url)
+
+        urls = [
+            query_url,
+            f'{query_url}?brand={self.brand.id}',
+            f'{query_url}?{urlencode({"designer": self.designer})}',
+            f'{query_url}?year_released=2000',
+            f'{query_url}?search=12345',
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNoSequentialScans(url)
+
+        next_querystring = self.assertNoSequentialScans(query_url).context['next_querystring']
+        self.assertNoSequentialScans(f"{reverse('query_more')}?{next_querystring}")
+
+
+    def test_detail_view_plan(self):
+        """
+        Asserts detail_view uses the primary key.
+        """
+
+        self.assertNoSequentialScans(reverse('detail', kwargs={'pk': self.sneaker.id}))
+
+
+    def test_comment_plans(self):
+        """
+        Asserts a sneaker's comment pages use the (sneaker, created_at, id)
+        index, on the detail page and when loading more.
+        """
+
+        user = get_user_model().objects.create_user(
+            email = 'testuser@email.com',
+            first_name = 'Test',
+            last_name = 'User',
+            password = 'testpass123',
+        )
+        # A popular sneaker among many others with a few comments each.
+        sneaker_ids = [self.sneaker.id] * 1000 + list(Sneaker.objects.values_list('id', flat=True)[:2000]) * 10
+        Comment.objects.bulk_create(
+            Comment(user=user, sneaker_id=sneaker_id, body=f'Comment {i}')
+            for i, sneaker_id in enumerate(sneaker_ids)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE sneakers_comment')
+
+        self.assertNoSequentialScans(reverse('detail', kwargs={'pk': self.sneaker.id}), Comment._meta.db_table)
+
+        more_url = reverse('comments_more', kwargs={'pk': self.sneaker.id})
+        cursor = get_comment_page(self.sneaker.id).next_cursor
+        self.assertNoSequentialScans(f'{more_url}?{urlencode({"after": cursor or ""})}', Comment._meta.db_table)
+
+
+    def test_dashboard_plans(self):
+        """
+        Asserts the management dashboard's sorts and filters page through
+        indexes.
+        """
+
+        self.client.force_login(get_user_model().objects.create_superuser(
+            email = 'adminuser@email.com',
+            first_name = 'Admin',
+            last_name = 'User',
+            password = 'testpass123',
+        ))
+
+        manage_url = reverse('manage_sneakers')
+        urls = [
+            manage_url,
+            f'{manage_url}?sort=-updated_at',
+            f'{manage_url}?sort=year_released',
+            f'{manage_url}?brand={self.brand.id}',
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNoSequentialScans(url)
+
+        next_querystring = self.assertNoSequentialScans(manage_url).context['next_querystring']
+        self.assertNoSequentialScans(f'{manage_url}?{next_querystring}')
+
+
+    def test_api_plans(self):
+        """
+        Asserts API filters, orderings and expansions use indexes.
+        """
+
+        list_url = reverse('sneakers-list')
+        urls = [
+            list_url,
+            f'{list_url}?ordering=-year_released',
+            f'{list_url}?ordering=updated_at',
+            f'{list_url}?brand={self.brand.id}',
+            f'{list_url}?expand=brand,related_sneakers',
+            reverse('sneakers-detail', kwargs={'pk': self.sneaker.id}),
+            reverse('brands-sneakers', kwargs={'pk': self.brand.id}),
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNoSequentialScans(url)
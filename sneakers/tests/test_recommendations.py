@@ -0,0 +1,90 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from sneakers.models import Sneaker, Brand, SneakerRecommendation
+from sneakers.recommendations import compute_recommendations, rebuild_recommendations
+from sneakers.synthetic import generate_catalog
+
+
+class RecommendationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.other_brand = Brand.objects.create(
+            name = 'Other Brand',
+            description = 'Another brand.',
+        )
+
+        def create(name, brand, designer, year):
+            return Sneaker.objects.create(brand=brand, name=name, summary='Summary.', designer=designer, year_released=year)
+
+        cls.sneaker = create('Air Runner', cls.brand, 'Designer One', 2020)
+        cls.same_designer = create('Court Classic', cls.brand, 'Designer One', 1990)
+        cls.same_brand = create('Trail Boost', cls.brand, 'Designer Two', 2020)
+        cls.same_name = create('Air Runner Mid', cls.other_brand, 'Designer Three', 2000)
+        cls.unrelated = create('Wave Glide', cls.other_brand, 'Designer Two', 1975)
+        cls.curated = create('Storm Racer', cls.other_brand, None, 1980)
+        cls.sneaker.related_sneakers.add(cls.curated)
+
+        cls.deleted = create('Air Runner Low', cls.brand, 'Designer One', 2020)
+        cls.deleted.soft_delete(None)
+
+
+    def get_recommendations(self, top_k=5):
+        return {sneaker_id: chosen for sneaker_id, chosen in compute_recommendations(top_k)}
+
+
+    def test_curated_first_then_by_score(self):
+        """
+        Ensure curated related sneakers lead, followed by the most similar
+        live sneakers. Sneakers sharing no brand, designer or name token are
+        never candidates.
+        """
+
+        chosen = self.get_recommendations()[self.sneaker.pk]
+
+        self.assertEqual(
+            [(recommended_id, curated) for recommended_id, _, curated in chosen],
+            [
+                (self.curated.pk, True),
+                (self.same_designer.pk, False),
+                (self.same_brand.pk, False),
+                (self.same_name.pk, False),
+            ],
+        )
+        self.assertNotIn(self.deleted.pk, self.get_recommendations())
+
+
+    def test_rebuild_and_detail_view(self):
+        """
+        Ensure recommendations are written ranked, replacing earlier ones,
+        and shown on the detail page.
+        """
+
+        rebuild_recommendations(top_k=2)
+        written = rebuild_recommendations(top_k=3)
+        self.assertEqual(written, SneakerRecommendation.objects.count())
+
+        ranked = SneakerRecommendation.objects.filter(sneaker=self.sneaker).order_by('rank')
+        self.assertEqual(
+            [recommendation.recommended_id for recommendation in ranked],
+            [self.curated.pk, self.same_designer.pk, self.same_brand.pk],
+        )
+
+        response = self.client.get(reverse('detail', kwargs={'pk': self.sneaker.pk}))
+        self.assertContains(response, 'Related sneakers')
+        self.assertContains(response, 'Court Classic')
+        self.assertNotContains(response, 'Wave Glide')
+
+
+    def test_command(self):
+        generate_catalog(brands=5, sneakers=200, related=2, seed=1)
+        call_command('compute_recommendations', '--top-k', '4', stdout=open('/dev/null', 'w'))
+
+        live = Sneaker.objects.count()
+        self.assertEqual(SneakerRecommendation.objects.count(), live * 4)
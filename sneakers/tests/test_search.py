@@ -0,0 +1,110 @@
+from unittest import skipUnless
+
+from django.test import TestCase
+from django.db import connection
+
+from sneakers.models import Sneaker, Brand
+from sneakers.search import search_sneakers, SEARCH_ORDERING
+from sneakers.pagination import paginate_keyset
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Full-text search requires PostgreSQL.')
+class SneakerSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Jordan',
+            description = 'An interesting description of the brand.',
+        )
+
+        cls.air_max = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Air Max 1',
+            designer = 'Tinker Hatfield',
+            year_released = 1987,
+        )
+        cls.retro = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Retro High',
+            designer = 'Peter Moore',
+            year_released = 1985,
+        )
+
+
+    def search(self, value):
+        return list(search_sneakers(Sneaker.objects.all(), value))
+
+
+    def test_search_document_is_maintained(self):
+        """
+        Asserts the trigger populates the search columns on insert.
+        """
+
+        sneaker = Sneaker.objects.get(id=self.air_max.id)
+        self.assertIsNotNone(sneaker.search_document)
+        self.assertEqual(sneaker.search_text, 'air max 1 tinker hatfield jordan')
+
+
+    def test_full_word_matches(self):
+        """
+        Asserts name, designer and brand name words all match.
+        """
+
+        self.assertEqual(self.search('max'), [self.air_max])
+        self.assertEqual(self.search('hatfield'), [self.air_max])
+        self.assertEqual(len(self.search('jordan')), 2)
+
+
+    def test_partial_word_matches(self):
+        """
+        Asserts substrings match through the trigram index.
+        """
+
+        self.assertEqual(self.search('hatf'), [self.air_max])
+        self.assertEqual(self.search('etro'), [self.retro])
+
+
+    def test_results_are_ranked(self):
+        """
+        Asserts name matches rank above designer matches.
+        """
+
+        designer_match = Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Court Low',
+            designer = 'Retro Studio',
+            year_released = 1990,
+        )
+
+        self.assertEqual(self.search('retro'), [self.retro, designer_match])
+
+
+    def test_brand_rename_updates_search(self):
+        """
+        Asserts renaming a brand refreshes its sneakers' search documents.
+        """
+
+        self.brand.name = 'Renamed'
+        self.brand.save()
+
+        self.assertEqual(len(self.search('renamed')), 2)
+        self.assertEqual(self.search('jordan'), [])
+
+
+    def test_ranked_results_paginate(self):
+        """
+        Asserts keyset pagination walks ranked results without gaps.
+        """
+
+        queryset = search_sneakers(Sneaker.objects.all(), 'jordan')
+
+        first = paginate_keyset(queryset, SEARCH_ORDERING, None, 1)
+        second = paginate_keyset(queryset, SEARCH_ORDERING, first.next_cursor, 1)
+
+        self.assertTrue(first.has_next)
+        self.assertFalse(second.has_next)
+        self.assertEqual(
+            {sneaker.id for sneaker in first.items + second.items},
+            {self.air_max.id, self.retro.id},
+        )
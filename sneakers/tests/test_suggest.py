@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from sneakers.catalog import bump_catalog_version
+from sneakers.models import Sneaker, Brand
+from sneakers.suggest import PrefixIndex, SuggestionIndex
+
+
+class PrefixIndexTests(SimpleTestCase):
+
+    def test_search_matches_word_prefixes(self):
+        index = PrefixIndex()
+        index.add(('sneaker', 1), 'Air Max 1')
+        index.add(('sneaker', 2), 'Air Force 1')
+        index.add(('sneaker', 3), 'Maxima')
+
+        self.assertEqual(index.search('air', 10), [('sneaker', 2), ('sneaker', 1)])
+        self.assertEqual(index.search('MAX', 10), [('sneaker', 1), ('sneaker', 3)])
+        self.assertEqual(index.search('air  max', 10), [('sneaker', 1)])
+        self.assertEqual(index.search('max', 1), [('sneaker', 1)])
+
+        index.remove(('sneaker', 1), 'Air Max 1')
+        self.assertEqual(index.search('max', 10), [('sneaker', 3)])
+
+
+class SuggestionIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.brand = Brand.objects.create(
+            name = 'Test Brand',
+            description = 'An interesting description of the brand.',
+        )
+        cls.sneaker = Sneaker.objects.create(
+            brand = cls.brand,
+            name = 'Test Sneaker',
+            summary = 'A useful summary of sneaker.',
+            designer = 'Tinker Hatfield',
+            year_released = 2025,
+        )
+
+
+    def setUp(self):
+        cache.clear()
+        self.index = SuggestionIndex()
+
+
+    def labels(self, prefix):
+        return [(suggestion.kind, suggestion.label) for suggestion in self.index.suggest(prefix)]
+
+
+    def test_suggest(self):
+        """
+        Ensure brands and designers are suggested ahead of sneakers, without
+        queries once the index is built.
+        """
+
+        self.assertEqual(self.labels('test'), [('brand', 'Test Brand'), ('sneaker', 'Test Sneaker')])
+
+        with self.assertNumQueries(0):
+            suggestions = self.index.suggest('hat')
+        self.assertEqual([suggestion.label for suggestion in suggestions], ['Tinker Hatfield'])
+        self.assertEqual(suggestions[0].url, reverse('query') + '?designer=Tinker+Hatfield')
+
+
+    def test_refresh_on_catalog_write(self):
+        """
+        Ensure edits, soft-deletes and hard deletes are picked up once the
+        catalog version changes.
+        """
+
+        self.index.suggest('test')
+
+        self.sneaker.name = 'Renamed Sneaker'
+        self.sneaker.designer = 'Other Designer'
+        self.sneaker.save()
+        self.assertEqual(self.labels('test'), [('brand', 'Test Brand')])
+        self.assertEqual(self.labels('renamed'), [('sneaker', 'Renamed Sneaker')])
+        self.assertEqual(self.labels('tinker'), [])
+        self.assertEqual(self.labels('other'), [('designer', 'Other Designer')])
+
+        new_sneaker = Sneaker.objects.create(brand=self.brand, name='New Sneaker', summary='Summary.', year_released=2024)
+        self.assertEqual(self.labels('new'), [('sneaker', 'New Sneaker')])
+
+        new_sneaker.soft_delete(None)
+        self.assertEqual(self.labels('new'), [])
+
+        self.sneaker.delete()
+        self.assertEqual(self.labels('renamed'), [])
+
+
+    def test_refresh_reads_rows_committed_late(self):
+        """
+        Ensure a rename whose updated_at precedes the last refresh, as when
+        it commits after the refresh has run, is still applied.
+        """
+
+        self.index.suggest('test')
+
+        Sneaker.all_with_deleted.filter(pk=self.sneaker.pk).update(
+            name='Renamed Sneaker',
+            updated_at=self.index.built_at - timedelta(seconds=5),
+        )
+        bump_catalog_version()
+
+        self.assertEqual(self.labels('renamed'), [('sneaker', 'Renamed Sneaker')])
+
+
+    def test_suggest_view(self):
+        response = self.client.get(reverse('suggest'), {'q': 'test s'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'suggestions': [{
+            'kind': 'sneaker',
+            'label': 'Test Sneaker',
+            'url': reverse('detail', kwargs={'pk': self.sneaker.pk}),
+        }]})
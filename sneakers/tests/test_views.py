@@ -1,5 +1,8 @@
+import base64
 import tempfile
+from unittest import mock
 
+from django.conf import settings
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -71,6 +74,71 @@ class SneakerViewTests(TestCase):
         self.assertContains(response, 'Test Sneaker')         
 
 
+    def test_query_view_paginates(self):
+        """
+        Tests query view renders one page and links to the next.
+        """
+
+        Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Another Sneaker',
+            year_released = 2024,
+            primary_image = 'test_image.jpg',
+        )
+
+        with mock.patch('sneakers.views.QUERY_PAGE_SIZE', 1):
+            response = self.client.get(reverse('query'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Displaying 2 results')
+        self.assertContains(response, 'Another Sneaker')
+        self.assertNotContains(response, 'Test Sneaker')
+        self.assertContains(response, 'Load more')
+
+        next_querystring = response.context['next_querystring']
+
+        with mock.patch('sneakers.views.QUERY_PAGE_SIZE', 1):
+            response = self.client.get(f"{reverse('query_more')}?{next_querystring}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'sneakers/partials/query_page.html')
+        self.assertTemplateNotUsed(response, '_base.html')
+        self.assertContains(response, 'Test Sneaker')
+        self.assertNotContains(response, 'Another Sneaker')
+        self.assertNotContains(response, 'Load more')
+
+
+    def test_query_more_view_tampered_cursor(self):
+        """
+        Tests a cursor with values of the wrong type for its fields starts
+        from the first page instead of failing.
+        """
+
+        for values in ('["a","not-a-uuid"]', '[null,null]', '[["a"],{"b":1}]', '{}'):
+            cursor = base64.urlsafe_b64encode(values.encode()).decode().rstrip('=')
+            with self.subTest(values=values):
+                response = self.client.get(reverse('query_more'), {'after': cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Test Sneaker')
+
+
+    def test_query_view_caps_count(self):
+        """
+        Tests query view stops counting results at the count limit.
+        """
+
+        Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Another Sneaker',
+            year_released = 2024,
+        )
+
+        with mock.patch('sneakers.views.QUERY_COUNT_LIMIT', 1):
+            response = self.client.get(reverse('query'))
+
+        self.assertContains(response, 'Displaying 1+ result')
+
+
     def test_detail_view(self):
         """
         Tests detail view functionality.
@@ -82,6 +150,72 @@ class SneakerViewTests(TestCase):
         self.assertContains(response, 'Test Sneaker')
 
 
+    def test_detail_view_conditional_get(self):
+        """
+        Tests detail view answers a matching ETag with a 304, until the
+        sneaker or its brand change. The page also shows comments, likes and
+        recommendations, which the sneaker's updated_at does not cover, so it
+        is not validated by If-Modified-Since.
+        """
+
+        url = reverse('detail', kwargs={'pk': self.sneaker.id})
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+        self.brand.description = 'A new description.'
+        self.brand.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'A new description.')
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        self.sneaker.related_sneakers.add(Sneaker.objects.create(
+            brand = self.brand,
+            name = 'Related Sneaker',
+            year_released = 2024,
+        ))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+    def test_detail_view_etag_varies_by_user(self):
+        """
+        Tests a page cached while logged out is not reused after logging in.
+        """
+
+        url = reverse('detail', kwargs={'pk': self.sneaker.id})
+        etag = self.client.get(url)['ETag']
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+    def test_detail_view_etag_varies_by_csrf_cookie(self):
+        """
+        Tests a page is not reused once the CSRF secret rotates, e.g. after
+        logging in again, as its forms would post a stale token.
+        """
+
+        url = reverse('detail', kwargs={'pk': self.sneaker.id})
+        self.client.force_login(self.user)
+        # The first page sets the CSRF cookie its ETag depends on.
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = 'x' * 32
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
 class SneakerManageViewTests(TestCase):
     
     @classmethod
@@ -251,6 +385,36 @@ class SneakerManageViewTests(TestCase):
         self.assertEqual(self.sneaker.summary, 'Updated summary.')
 
 
+    def test_update_sneaker_view_duplicate_name(self):
+        """
+        Tests renaming a sneaker to the name of a live sneaker of the same
+        brand shows a form error instead of failing.
+        """
+
+        Sneaker.objects.create(
+            brand=self.brand,
+            name='Sibling Sneaker',
+            summary='Another summary.',
+            year_released=2024,
+        )
+
+        self.user.user_permissions.add(self.change_sneaker)
+        self.client.login(email="testuser@email.com", password="testpass123")
+        url = reverse('update_sneaker', kwargs={'pk': self.sneaker.id})
+
+        data = {
+            'name': 'Sibling Sneaker',
+            'summary': 'Updated summary.',
+            'year_released': 2024,
+        }
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('name', response.context['form'].errors)
+        self.sneaker.refresh_from_db()
+        self.assertEqual(self.sneaker.name, 'Test Sneaker')
+
+
     # DELETE
     def test_delete_sneaker_view_logged_out(self):
         """
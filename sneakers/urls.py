@@ -6,8 +6,14 @@ from sneakers import views
 urlpatterns = [
     path('', views.home_page_view, name='home'),
     path('query/', views.query_view, name='query'),
+    path('query/more/', views.query_more_view, name='query_more'),
+    path('query/suggest/', views.suggest_view, name='suggest'),
     path('sneaker/<str:pk>/', views.detail_view, name='detail'),
+    path('sneaker/<str:pk>/like/', views.like_view, name='like'),
+    path('sneaker/<str:pk>/comment/', views.comment_view, name='comment'),
+    path('sneaker/<str:pk>/comments/', views.comments_more_view, name='comments_more'),
     
+    path('manage/', views.manage_sneakers_view, name='manage_sneakers'),
     path('manage/create-sneaker/', views.create_sneaker_view, name='create_sneaker'),
     path('manage/update-sneaker/<str:pk>/', views.update_sneaker_view, name='update_sneaker'),
     path('manage/delete-sneaker/<str:pk>/', views.delete_sneaker_view, name='delete_sneaker'),
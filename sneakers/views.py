@@ -1,83 +1,279 @@
+from dataclasses import asdict
+
 from django.shortcuts import render, get_object_or_404, redirect
-from django.db.models import Prefetch
-from django.core.cache import cache
+from django.http import JsonResponse
+from django.db import IntegrityError
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
+from django.core.exceptions import PermissionDenied
+from django.template.defaultfilters import pluralize
+from django.views.decorators.http import condition, require_POST
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
-from sneakers.models import Brand, Sneaker
-from sneakers.filters import SneakerFilter
-from sneakers.forms import CreateSneakerForm, UpdateSneakerForm, DeleteSneakerForm
+from sneakers.models import Sneaker, SneakerRecommendation
+from sneakers.catalog import FRAGMENT_TIMEOUT, get_catalog_snapshot, get_brand_versions
+from sneakers.comments import get_comment_page, get_comment_version
+from sneakers.dashboard import (
+    DASHBOARD_PAGE_SIZE, DEFAULT_SORT, DELETE, RESTORE, SORTS, bulk_update_sneakers, get_dashboard_queryset,
+)
+from sneakers.conditional import sneaker_page_etag
+from sneakers.facets import get_facets
+from sneakers.likes import get_liked_ids, toggle_like
+from sneakers.filters import DashboardFilter, SneakerFilter
+from sneakers.forms import BulkSneakerForm, CommentForm, CreateSneakerForm, UpdateSneakerForm, DeleteSneakerForm
+from sneakers.pagination import paginate_keyset, bounded_count
+from sneakers.suggest import suggestion_index
 from sneakers.utils import get_active_filters
+from core.query_budget import query_budget
 from core.utils import get_safe_next_url
 
 
+QUERY_PAGE_SIZE = 48
+QUERY_COUNT_LIMIT = 1000
+QUERY_ORDERING = ['name', 'id']
+
+
+@query_budget(6)
 def home_page_view(request):
     """
-    Fetches brands and their associated sneakers, grouped and sorted.
+    Renders brands and their live sneakers from the cached catalog snapshot.
+    Each brand's block is cached as a fragment keyed on its content version,
+    so the user's likes are marked client side from their cached liked set.
     """
 
-    brands_with_sneakers = cache.get('brands_with_sneakers')
-    
-    if not brands_with_sneakers:
-        brands_with_sneakers = Brand.objects.filter(
-            sneaker__isnull=False
-        ).distinct().order_by('name')
-
-        brands_with_sneakers = brands_with_sneakers.prefetch_related(
-            Prefetch(
-                'sneaker_set',
-                queryset=Sneaker.objects.filter(deleted=False).order_by('name'),
-                to_attr='sneakers',
-            )
-        )
-        timeout_period = 60*60
-        cache.set('brands_with_sneakers', brands_with_sneakers, timeout=timeout_period)    
+    brands = get_catalog_snapshot()
+    versions = get_brand_versions([brand.id for brand in brands])
 
     context = {
-        'brands': brands_with_sneakers,
+        'brands': [(brand, versions[brand.id]) for brand in brands],
+        'fragment_timeout': FRAGMENT_TIMEOUT,
+        'liked_ids': sorted(get_liked_ids(request.user)),
     }
 
     return render(request, 'sneakers/home.html', context)
 
 
+def _get_query_page(request):
+    """
+    Filters live sneakers from the request's GET parameters and returns the
+    filter, the filtered queryset and the page following the 'after' cursor.
+    """
+
+    sneaker_filter = SneakerFilter(request.GET, queryset=Sneaker.objects.all(), request=request)
+    filtered_qs = sneaker_filter.qs.select_related('brand')
+
+    # Searches arrive ranked by relevance; everything else is ordered by name.
+    ordering = list(filtered_qs.query.order_by) or QUERY_ORDERING
+
+    page = paginate_keyset(
+        filtered_qs,
+        ordering,
+        request.GET.get('after'),
+        QUERY_PAGE_SIZE,
+    )
+
+    return sneaker_filter, filtered_qs, page
+
+
+def _get_next_querystring(request, page) -> str:
+    """
+    Returns the current querystring with 'after' set to the next cursor.
+    """
+
+    if not page.has_next:
+        return ''
+
+    params = request.GET.copy()
+    params['after'] = page.next_cursor
+    return params.urlencode()
+
+
+@query_budget(8)
 def query_view(request):
     """
-    Queries sneakers and displays results, based off user input.
+    Queries sneakers and displays the first page of results, based off user
+    input, with the result count of each brand, designer and year.
     """
     
-    base_qs = Sneaker.objects.filter(deleted=False)
-    sneaker_filter = SneakerFilter(request.GET, queryset=base_qs)
-    filtered_qs = sneaker_filter.qs.select_related('brand').order_by('name')
+    sneaker_filter, filtered_qs, page = _get_query_page(request)
+    total, total_capped = bounded_count(filtered_qs, QUERY_COUNT_LIMIT)
 
     active_filters = get_active_filters(sneaker_filter.form)
 
+    # Facet links start a new listing, so drop the cursor.
+    params = request.GET.copy()
+    params.pop('after', None)
+    facets = get_facets(sneaker_filter, params)
+
     context = {
-        'sneakers': filtered_qs,
+        'sneakers': page.items,
+        'next_querystring': _get_next_querystring(request, page),
+        'total': total,
+        'total_capped': total_capped,
         'sneaker_filter': sneaker_filter,
         'active_filters': active_filters,
+        'facets': facets,
+        'liked_ids': sorted(get_liked_ids(request.user)),
     }
 
     return render(request, 'sneakers/query.html', context)
 
 
+@query_budget(3)
+def query_more_view(request):
+    """
+    Renders only the next page of result cards, for the 'load more' button.
+    """
+
+    _, _, page = _get_query_page(request)
+
+    context = {
+        'sneakers': page.items,
+        'next_querystring': _get_next_querystring(request, page),
+    }
+
+    return render(request, 'sneakers/partials/query_page.html', context)
+
+
+# A refresh that finds hard deletes rebuilds, the worst case.
+@query_budget(5)
+def suggest_view(request):
+    """
+    Returns search-as-you-type suggestions for the 'q' prefix as JSON, from
+    the in-process index. Queries are only made when the catalog changes.
+    """
+
+    suggestions = suggestion_index.suggest(request.GET.get('q', '')[:100])
+    return JsonResponse({'suggestions': [asdict(suggestion) for suggestion in suggestions]})
+
+
+def _get_comments_context(sneaker) -> dict:
+    """
+    Returns the context of a sneaker's comment section. The first page is
+    cached as a fragment under the sneaker's comment version, so it is only
+    loaded, lazily, when a new comment has invalidated the fragment.
+    """
+
+    return {
+        'comment_version': get_comment_version(sneaker.pk),
+        'comment_page': SimpleLazyObject(lambda: get_comment_page(sneaker.pk)),
+        'fragment_timeout': FRAGMENT_TIMEOUT,
+    }
+
+
+@query_budget(9)
+@condition(etag_func=sneaker_page_etag)
 def detail_view(request, pk):
     """
-    Fetches specific sneaker and renders detail page.
+    Fetches specific sneaker and renders detail page, with its precomputed
+    recommendations and latest comments. Unchanged pages are answered with
+    a 304.
     """
     
     sneaker = get_object_or_404(
         Sneaker.objects.select_related('brand'), 
         id=pk, 
-        deleted=False,
     )
 
+    # One query on the (sneaker, rank) index, see sneakers/recommendations.py.
+    recommendations = SneakerRecommendation.objects.filter(
+        sneaker=sneaker,
+        recommended__deleted=False,
+    ).select_related(
+        'recommended__brand',
+    ).only(
+        'recommended__name',
+        'recommended__primary_image',
+        'recommended__image_variants',
+        'recommended__brand__name',
+    ).order_by('rank')
+
+    liked_ids = get_liked_ids(request.user)
+
     context = {
         'sneaker': sneaker,
+        'recommendations': [recommendation.recommended for recommendation in recommendations],
+        'liked': str(sneaker.pk) in liked_ids,
+        'liked_ids': sorted(liked_ids),
+        'comment_form': CommentForm(),
+        **_get_comments_context(sneaker),
     }
 
     return render(request, 'sneakers/detail.html', context)
 
 
+# A new like inserts in a savepoint and updates the sneaker's like_count.
+@query_budget(9)
+@require_POST
+@login_required
+def like_view(request, pk):
+    """
+    Likes or unlikes a sneaker and renders the updated like button.
+    """
+
+    sneaker = get_object_or_404(Sneaker.objects.only('id'), id=pk)
+    liked = toggle_like(request.user, sneaker)
+    sneaker.refresh_from_db(fields=['like_count'])
+
+    context = {
+        'sneaker': sneaker,
+        'liked': liked,
+    }
+
+    return render(request, 'sneakers/partials/like_button.html', context)
+
+
+# A new comment inserts, updates the sneaker's comment_count and reloads it,
+# then renders the first page again.
+@query_budget(7)
+@require_POST
+@login_required
+def comment_view(request, pk):
+    """
+    Adds a comment to a sneaker and renders the updated comment section, or
+    the section with the form's errors.
+    """
+
+    sneaker = get_object_or_404(Sneaker.objects.only('id', 'comment_count'), id=pk)
+    form = CommentForm(request.POST)
+
+    if form.is_valid():
+        comment = form.save(commit=False)
+        comment.user = request.user
+        comment.sneaker = sneaker
+        comment.save()
+        sneaker.refresh_from_db(fields=['comment_count'])
+        form = CommentForm()
+
+    context = {
+        'sneaker': sneaker,
+        'comment_form': form,
+        **_get_comments_context(sneaker),
+    }
+
+    return render(request, 'sneakers/partials/comments.html', context)
+
+
+@query_budget(4)
+def comments_more_view(request, pk):
+    """
+    Renders only the next page of a sneaker's comments, for the 'load more'
+    button.
+    """
+
+    sneaker = get_object_or_404(Sneaker.objects.only('id'), id=pk)
+    page = get_comment_page(sneaker.pk, request.GET.get('after'))
+
+    context = {
+        'sneaker': sneaker,
+        'comment_page': page,
+    }
+
+    return render(request, 'sneakers/partials/comment_page.html', context)
+
+
+@query_budget(5)
 @login_required
 @permission_required('sneakers.add_sneaker', raise_exception=True)
 def create_sneaker_view(request):
@@ -104,6 +300,7 @@ def create_sneaker_view(request):
     return render(request, 'sneakers/manage/create_sneaker.html', context)
 
 
+@query_budget(9)
 @login_required
 @permission_required('sneakers.change_sneaker', raise_exception=True)
 def update_sneaker_view(request, pk):
@@ -132,6 +329,7 @@ def update_sneaker_view(request, pk):
     return render(request, 'sneakers/manage/update_sneaker.html', context)
 
 
+@query_budget(6)
 @login_required
 @permission_required('sneakers.delete_sneaker', raise_exception=True)
 def delete_sneaker_view(request, pk):
@@ -156,4 +354,89 @@ def delete_sneaker_view(request, pk):
         'form': form,
     }
 
-    return render(request, 'sneakers/manage/delete_sneaker.html', context)
\ No newline at end of file
+    return render(request, 'sneakers/manage/delete_sneaker.html', context)
+
+
+def _get_sort_querystrings(request, sort: str) -> dict[str, str]:
+    """
+    Returns the querystring each sortable column header links to, which
+    reverses the current sort if it is already that column's.
+    """
+
+    querystrings = {}
+    for column in SORTS:
+        if column.startswith('-'):
+            continue
+        params = request.GET.copy()
+        params.pop('after', None)
+        params['sort'] = f'-{column}' if sort == column else column
+        querystrings[column] = params.urlencode()
+    return querystrings
+
+
+# Checking permissions loads the user's and their groups', and the brand
+# selects are each loaded. A bulk action the database rejects then renders
+# the page again, the worst case.
+@query_budget(13)
+@login_required
+@permission_required('sneakers.change_sneaker', raise_exception=True)
+def manage_sneakers_view(request):
+    """
+    Renders the management dashboard, a sortable and filterable table of
+    every sneaker paged by keyset, and applies bulk actions on POST to the
+    ticked sneakers or to all that match the filters.
+    """
+
+    sneaker_filter = DashboardFilter(request.GET, queryset=Sneaker.all_with_deleted.all())
+    form = BulkSneakerForm()
+
+    if request.method == 'POST':
+        form = BulkSneakerForm(request.POST)
+        if form.is_valid():
+            action = form.cleaned_data['action']
+            if action in (DELETE, RESTORE) and not request.user.has_perm('sneakers.delete_sneaker'):
+                raise PermissionDenied
+
+            if not form.cleaned_data['select_all']:
+                queryset = Sneaker.all_with_deleted.filter(id__in=form.cleaned_data['ids'])
+            elif sneaker_filter.is_valid():
+                queryset = sneaker_filter.qs
+            else:
+                # Invalid filters are dropped, which would widen the selection.
+                queryset = None
+                form.add_error(None, 'Correct the filters before applying to all matching sneakers.')
+
+            if queryset is not None:
+                try:
+                    updated = bulk_update_sneakers(queryset, action, request.user, form.cleaned_data['brand'])
+                except IntegrityError:
+                    form.add_error(None, 'A live sneaker of the same brand already has that name.')
+                else:
+                    messages.success(request, f'{updated} sneaker{pluralize(updated)} updated.')
+                    return redirect(request.get_full_path())
+
+    sort = request.GET.get('sort')
+    if sort not in SORTS:
+        sort = DEFAULT_SORT
+
+    filtered_qs = sneaker_filter.qs
+    total, total_capped = bounded_count(filtered_qs, QUERY_COUNT_LIMIT)
+    page = paginate_keyset(
+        get_dashboard_queryset(filtered_qs),
+        SORTS[sort],
+        request.GET.get('after'),
+        DASHBOARD_PAGE_SIZE,
+    )
+
+    context = {
+        'sneakers': page.items,
+        'next_querystring': _get_next_querystring(request, page),
+        'total': total,
+        'total_capped': total_capped,
+        'sort': sort,
+        'sort_querystrings': _get_sort_querystrings(request, sort),
+        'sneaker_filter': sneaker_filter,
+        'form': form,
+    }
+
+    return render(request, 'sneakers/manage/dashboard.html', context)